@@ -1,22 +1,41 @@
 import django_filters
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+
 from audit_log.models import AuditLog
 
 
+def content_type_ids(model_name: str):
+    """Ids of the content types named model_name (ContentType cache, no join)."""
+    name = model_name.lower()
+    models = [m for m in apps.get_models() if m._meta.model_name == name]
+    if not models:
+        return []
+    return [
+        ct.id
+        for ct in ContentType.objects.get_for_models(*models, for_concrete_models=False).values()
+    ]
+
+
 class AuditLogFilter(django_filters.FilterSet):
     user = django_filters.NumberFilter(field_name="user__id")
 
     action = django_filters.CharFilter(method="filter_action")
 
-    content_type = django_filters.CharFilter(
-        field_name="content_type__model",
-        lookup_expr="iexact",
-    )
+    # model name → content_type_id in memory: hits the (content_type,
+    # object_id, timestamp) index instead of joining django_content_type
+    content_type = django_filters.CharFilter(method="filter_content_type")
 
     object_id = django_filters.CharFilter(
         field_name="object_id",
         lookup_expr="exact",
     )
 
+    correlation_id = django_filters.CharFilter(
+        field_name="correlation_id",
+        lookup_expr="exact",
+    )
+
     # ✅ API created_at → DB timestamp
     created_at__gte = django_filters.DateTimeFilter(
         field_name="timestamp",
@@ -35,6 +54,7 @@ class AuditLogFilter(django_filters.FilterSet):
             "action",
             "content_type",
             "object_id",
+            "correlation_id",
             "created_at__gte",
             "created_at__lte",
         ]
@@ -54,3 +74,13 @@ class AuditLogFilter(django_filters.FilterSet):
             return queryset.none()
 
         return queryset.filter(action=normalized)
+
+    def filter_content_type(self, queryset, name, value):
+        if not value:
+            return queryset
+
+        ids = content_type_ids(value)
+        if not ids:
+            return queryset.none()
+
+        return queryset.filter(content_type_id__in=ids)
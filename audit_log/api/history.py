@@ -0,0 +1,78 @@
+# audit_log/api/history.py
+
+"""
+/api/<resource>/{pk}/history/ for any audited model, and
+/api/<resource>/{pk}/history/state/?at=<datetime> for its field values
+at a point in time (audit_log.history.state_at).
+
+The content type id comes from memory (audit_log.registry), so one
+object's history is a single range scan of auditlog_object_ts_idx
+(content_type_id, object_id, timestamp) with no join on
+django_content_type, paged by keyset on (timestamp, id).
+"""
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+
+from audit_log.api.pagination import AuditLogCursorPagination
+from audit_log.api.serializers import AuditLogSerializer
+from audit_log.history import state_at
+from audit_log.models import AuditLog
+from audit_log.registry import content_type_id_for
+
+
+class AuditHistoryMixin:
+    """
+    Add history actions to a model viewset.
+
+    The object is resolved with get_object(), so the viewset's object
+    permissions decide who may read its history. Non-staff users only
+    see their own events, as on /api/audit-logs/.
+    """
+
+    history_serializer_class = AuditLogSerializer
+    history_pagination_class = AuditLogCursorPagination
+
+    def get_history_queryset(self, obj):
+        qs = AuditLog.objects.select_related("user", "content_type").filter(
+            content_type_id=content_type_id_for(type(obj)),
+            object_id=str(obj.pk),
+        )
+
+        user = self.request.user
+        if not user.is_staff:
+            qs = qs.filter(user=user)
+
+        return qs.order_by("-timestamp")
+
+    @action(detail=True, methods=["get"], url_path="history")
+    def history(self, request, *args, **kwargs):
+        obj = self.get_object()
+
+        paginator = self.history_pagination_class()
+        page = paginator.paginate_queryset(self.get_history_queryset(obj), request, view=self)
+        serializer = self.history_serializer_class(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["get"], url_path="history/state")
+    def history_state(self, request, *args, **kwargs):
+        obj = self.get_object()
+
+        at = request.query_params.get("at")
+        if at:
+            timestamp = parse_datetime(at)
+            if timestamp is None:
+                raise ValidationError({"at": "Use an ISO 8601 datetime."})
+            if timezone.is_naive(timestamp):
+                timestamp = timezone.make_aware(timestamp)
+        else:
+            timestamp = timezone.now()
+
+        state = state_at(obj, timestamp=timestamp)
+        if state is None:
+            raise NotFound("The object did not exist at that time.")
+
+        return Response({"at": timestamp, "state": state})
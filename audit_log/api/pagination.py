@@ -0,0 +1,159 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class AuditLogCursorPagination(BasePagination):
+    """
+    Keyset pagination on (timestamp, id).
+
+    Every page is an index range scan starting right after the previous
+    page's last row, so latency does not grow with depth. The direction
+    follows AuditLogOrderingFilter (created_at / -created_at).
+
+    No COUNT(*) is run unless the client asks for it with ?count=true;
+    otherwise "count" is null.
+    """
+
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    page_size_query_param = "page_size"
+    page_size = api_settings.PAGE_SIZE or 10
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    # -----------------------------------------
+    # 🔑 cursor encoding
+    # -----------------------------------------
+    def encode_cursor(self, row, reverse):
+        payload = {
+            "t": row.timestamp.isoformat(),
+            "i": row.pk,
+            "o": "asc" if self.ascending else "desc",
+        }
+        if reverse:
+            payload["r"] = 1
+
+        token = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        ).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            timestamp = parse_datetime(payload["t"])
+            pk = int(payload["i"])
+            order = payload["o"]
+            reverse = bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        # a cursor is only meaningful for the ordering it was issued for
+        if timestamp is None or order != ("asc" if self.ascending else "desc"):
+            raise NotFound(self.invalid_cursor_message)
+
+        return timestamp, pk, reverse
+
+    # -----------------------------------------
+    # 📄 paging
+    # -----------------------------------------
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    @staticmethod
+    def _is_ascending(queryset):
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return bool(ordering) and ordering[0] == "timestamp"
+
+    @staticmethod
+    def _beyond(timestamp, pk, forwards):
+        if forwards:
+            return Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=pk)
+        return Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ascending = self._is_ascending(queryset)
+        self.page_size = self.get_page_size(request)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, "").lower() in ("1", "true", "yes"):
+            self.count = queryset.count()
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor[2])
+
+        # walking backwards (previous link) flips the scan direction
+        forwards = self.ascending != reverse
+        prefix = "" if forwards else "-"
+        queryset = queryset.order_by(f"{prefix}timestamp", f"{prefix}id")
+
+        if cursor:
+            queryset = queryset.filter(self._beyond(cursor[0], cursor[1], forwards))
+
+        # one extra row tells us whether there is anything beyond this page
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("count", self.count),
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "nullable": True},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -1,9 +1,11 @@
 from typing import Optional, Any
 from django.contrib.contenttypes.models import ContentType
+from audit_log.metrics import audit_log_dropped_events_total
 from audit_log.models import AuditLog
+from audit_log.writer import write
 from audit_log.context import (
     is_audit_logging_disabled,
-    get_current_user,
+    get_current_user_id,
 )
 
 def log(
@@ -16,12 +18,15 @@ def log(
     description: Optional[str] = None,
     changes: Optional[dict] = None,
     source: str = "api",
+    correlation_id: Optional[str] = None,
 ):
     if is_audit_logging_disabled():
         return None
 
     try:
-        user = user or get_current_user()
+        # an explicit user is used as given; otherwise the request's
+        # (verified, cached) user gives the id
+        user_id = user.pk if user is not None else get_current_user_id()
 
         content_type = None
         object_id = None
@@ -31,8 +36,9 @@ def log(
             object_id = str(instance.pk)
             resource = resource or instance.__class__.__name__
 
-        return AuditLog.objects.create(
-            user=user,
+        # sync → saved now, buffered → queued for bulk_create
+        return write(AuditLog(
+            user_id=user_id,
             action=(action or "unknown").lower(),  # ✅ normalize
             resource=resource or "Unknown",
             status=status or "INFO",
@@ -41,6 +47,8 @@ def log(
             content_type=content_type,
             object_id=object_id,
             changes=changes,
-        )
+            correlation_id=correlation_id,  # None → the request's id
+        ), path="public")
     except Exception:
+        audit_log_dropped_events_total.labels(reason="error").inc()
         return None  # ✅ hard fail‑safe
@@ -0,0 +1,30 @@
+from rest_framework.filters import SearchFilter
+
+from audit_log.search import FTS_COLUMNS, match_ids
+
+
+class AuditLogSearchFilter(SearchFilter):
+    """
+    SearchFilter backed by the full-text index (audit_log.search).
+
+    Each search word is a prefix match against the indexed columns, so
+    no LIKE '%term%' scan is needed. Views searching anything outside
+    the index (lookups, related fields) use the stock behaviour.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        # ✅ only plain indexed columns can be answered by the index
+        if not all(field in FTS_COLUMNS for field in search_fields):
+            return super().filter_queryset(request, queryset, view)
+
+        ids = match_ids(" ".join(search_terms), search_fields, using=queryset.db)
+        if ids is None:
+            return super().filter_queryset(request, queryset, view)
+
+        return queryset.filter(id__in=ids)
@@ -24,6 +24,8 @@ class ContentTypeReadOnlySerializer(serializers.ModelSerializer):
 class AuditLogSerializer(serializers.ModelSerializer):
     user = UserReadOnlySerializer(read_only=True)
     content_type = ContentTypeReadOnlySerializer(read_only=True)
+    # compact bulk payloads stay encoded (size of the runs, not the rows);
+    # decoded rows are paged by /api/audit-logs/<id>/rows/
 
     class Meta:
         model = AuditLog
@@ -35,9 +37,51 @@ class AuditLogSerializer(serializers.ModelSerializer):
             "status",
             "description",
             "source",
+            "correlation_id",
             "content_type",
             "object_id",
             "changes",
             "timestamp",  # ✅ only real DB field
         )
         read_only_fields = fields
+
+
+class AuditLogRowsQuerySerializer(serializers.Serializer):
+    """Query parameters of /api/audit-logs/<id>/rows/."""
+
+    MAX_LIMIT = 1000
+
+    offset = serializers.IntegerField(required=False, default=0, min_value=0)
+    limit = serializers.IntegerField(
+        required=False, default=100, min_value=1, max_value=MAX_LIMIT
+    )
+
+
+class AuditLogStatsQuerySerializer(serializers.Serializer):
+    """Query parameters of /api/audit-logs/stats/."""
+
+    GROUP_BY_CHOICES = ("hour", "day", "resource", "action", "status")
+
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+    resource = serializers.CharField(required=False)
+    action = serializers.CharField(required=False)
+    status = serializers.CharField(required=False)
+    group_by = serializers.CharField(required=False, default="hour")
+
+    def validate_group_by(self, value):
+        fields = [field.strip() for field in value.split(",") if field.strip()]
+        unknown = set(fields) - set(self.GROUP_BY_CHOICES)
+        if not fields or unknown:
+            raise serializers.ValidationError(
+                f"Choose from: {', '.join(self.GROUP_BY_CHOICES)}"
+            )
+        if "hour" in fields and "day" in fields:
+            raise serializers.ValidationError("Use either hour or day, not both")
+        return fields
+
+    def validate(self, attrs):
+        since, until = attrs.get("since"), attrs.get("until")
+        if since and until and since >= until:
+            raise serializers.ValidationError("since must be before until")
+        return attrs
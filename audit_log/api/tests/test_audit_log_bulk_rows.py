@@ -0,0 +1,65 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from audit_log.admin import AuditLogAdmin
+from audit_log.encoding import ColumnarEncoder
+from audit_log.models import AuditLog
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestAuditLogBulkRows:
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.staff = User.objects.create_user(username="staff", password="pass123", is_staff=True)
+        self.client.force_authenticate(user=self.staff)
+
+        snapshot = ColumnarEncoder(["stock"])
+        for pk in range(1, 10_001):
+            snapshot.add(pk, [1 if pk <= 6_000 else 2])
+        self.changes = {
+            "format": "columnar",
+            "ids": snapshot.ids.result(),
+            "count": snapshot.count,
+            "before": snapshot.columns(),
+            "after": {"stock": 0},
+        }
+        self.event = AuditLog.objects.create(
+            action="bulk_update", resource="Product", changes=self.changes
+        )
+        self.plain = AuditLog.objects.create(
+            action="update", resource="Product", changes={"stock": {"before": 1, "after": 2}}
+        )
+
+    def test_list_returns_the_encoded_form(self):
+        response = self.client.get("/api/audit-logs/")
+
+        event = next(e for e in response.json()["results"] if e["id"] == self.event.pk)
+        assert event["changes"] == self.changes
+
+    def test_rows_are_decoded_one_page_at_a_time(self):
+        response = self.client.get(f"/api/audit-logs/{self.event.pk}/rows/?offset=5999&limit=2")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 10_000
+        assert data["results"] == [{"id": 6000, "stock": 1}, {"id": 6001, "stock": 2}]
+
+    def test_rows_limit_is_bounded(self):
+        response = self.client.get(f"/api/audit-logs/{self.event.pk}/rows/?limit=100000")
+
+        assert response.status_code == 400
+
+    def test_plain_event_has_no_rows(self):
+        response = self.client.get(f"/api/audit-logs/{self.plain.pk}/rows/")
+
+        assert response.status_code == 404
+
+    def test_admin_shows_a_bounded_preview(self):
+        html = AuditLogAdmin(AuditLog, None).changes_formatted(self.event)
+
+        assert "&quot;count&quot;: 10000" in html
+        assert html.count("&quot;stock&quot;:") == AuditLogAdmin.CHANGES_PREVIEW_ROWS + 1  # rows + after
@@ -0,0 +1,86 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from audit_log.models import AuditLog
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestAuditLogExport:
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="user1", password="pass123")
+        self.other = User.objects.create_user(username="user2", password="pass123")
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("audit-log-export")
+
+        for i in range(5):
+            AuditLog.objects.create(
+                user=self.user, action="update", resource="Product",
+                changes={"price": {"before": i, "after": i + 1}},
+            )
+        AuditLog.objects.create(user=self.user, action="delete", resource="Product")
+        AuditLog.objects.create(user=self.other, action="update", resource="Product")
+
+    def body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_streams_ndjson_with_list_filters(self):
+        response = self.client.get(self.url, {"action": "update"})
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+
+        rows = [json.loads(line) for line in self.body(response).splitlines()]
+        # same visibility rules as the list: only the caller's own logs
+        assert len(rows) == 5
+        assert {row["username"] for row in rows} == {"user1"}
+        assert rows[0]["changes"]["price"]["after"] == 5  # newest first
+
+    def test_streams_csv(self):
+        response = self.client.get(self.url, {"export_format": "csv"})
+
+        assert response["Content-Type"] == "text/csv"
+        assert "attachment" in response["Content-Disposition"]
+
+        rows = list(csv.DictReader(io.StringIO(self.body(response).decode())))
+        assert len(rows) == 6
+        assert json.loads(rows[1]["changes"])["price"]["before"] == 4
+
+    def test_gzip_on_the_fly_when_accepted(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+
+        assert response["Content-Encoding"] == "gzip"
+        lines = gzip.decompress(self.body(response)).splitlines()
+        assert len(lines) == 6
+
+    @pytest.mark.parametrize(
+        "header, gzipped",
+        [
+            ("gzip;q=0", False),
+            ("br, gzip; q=0.0, *", False),
+            ("identity", False),
+            ("gzip;q=0.5", True),
+            ("br, *;q=0.1", True),
+        ],
+    )
+    def test_gzip_honours_q_values(self, header, gzipped):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING=header)
+
+        assert response.has_header("Content-Encoding") is gzipped
+        assert "Accept-Encoding" in response["Vary"]
+
+    def test_rejects_unknown_format(self):
+        response = self.client.get(self.url, {"export_format": "xml"})
+
+        assert response.status_code == 400
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from audit_log.models import AuditLog
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestAuditLogCursorPagination:
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.staff = User.objects.create_user(
+            username="staff", password="pass123", is_staff=True
+        )
+        self.client.force_authenticate(user=self.staff)
+        self.url = reverse("audit-log-list")
+
+        now = timezone.now()
+        # pairs share a timestamp so the id tie-breaker matters
+        AuditLog.objects.bulk_create([
+            AuditLog(action="update", resource="Thing", timestamp=now - timedelta(minutes=i // 2))
+            for i in range(7)
+        ])
+
+    def walk(self, params):
+        ids, pages = [], 0
+        response = self.client.get(self.url, params)
+        while True:
+            pages += 1
+            ids += [row["id"] for row in response.data["results"]]
+            if not response.data["next"]:
+                return ids, pages, response
+            response = self.client.get(response.data["next"])
+
+    def expected(self, *ordering):
+        return list(AuditLog.objects.order_by(*ordering).values_list("id", flat=True))
+
+    def test_walks_every_row_once_newest_first(self):
+        ids, pages, _ = self.walk({"page_size": 3})
+
+        assert ids == self.expected("-timestamp", "-id")
+        assert pages == 3
+
+    def test_follows_created_at_ordering(self):
+        ids, _, _ = self.walk({"page_size": 3, "ordering": "created_at"})
+
+        assert ids == self.expected("timestamp", "id")
+
+    def test_previous_link_returns_the_prior_page(self):
+        first = self.client.get(self.url, {"page_size": 3})
+        assert first.data["previous"] is None
+
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+
+        assert [r["id"] for r in back.data["results"]] == [r["id"] for r in first.data["results"]]
+        assert back.data["previous"] is None
+
+    def test_no_count_query_unless_requested(self, django_assert_num_queries):
+        first = self.client.get(self.url, {"page_size": 3})
+        assert first.data["count"] is None
+
+        # a deep page is a single keyset SELECT: no COUNT, no OFFSET
+        with django_assert_num_queries(1):
+            self.client.get(first.data["next"])
+
+        counted = self.client.get(self.url, {"page_size": 3, "count": "true"})
+        assert counted.data["count"] == 7
+
+    def test_invalid_or_mismatched_cursor_is_rejected(self):
+        assert self.client.get(self.url, {"cursor": "garbage"}).status_code == 404
+
+        desc_next = self.client.get(self.url, {"page_size": 3}).data["next"]
+        response = self.client.get(desc_next + "&ordering=created_at")
+        assert response.status_code == 404
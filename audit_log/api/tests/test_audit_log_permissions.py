@@ -48,7 +48,7 @@ class TestAuditLogPermissions:
         self.client.force_authenticate(user=self.user1)
 
         url = reverse("audit-log-list")
-        response = self.client.get(url)
+        response = self.client.get(url, {"count": "true"})
 
         assert response.status_code == 200
         assert response.data["count"] == 1
@@ -66,7 +66,7 @@ class TestAuditLogPermissions:
         self.client.force_authenticate(user=self.staff)
 
         url = reverse("audit-log-list")
-        response = self.client.get(url)
+        response = self.client.get(url, {"count": "true"})
 
         assert response.status_code == 200
         assert response.data["count"] == 2
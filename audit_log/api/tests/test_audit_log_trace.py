@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from audit_log.models import AuditLog
+
+User = get_user_model()
+
+
+def trace_url(correlation_id):
+    return reverse("audit-log-trace", kwargs={"correlation_id": correlation_id})
+
+
+@pytest.mark.django_db
+class TestAuditLogTrace:
+
+    def setup_method(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="user1", password="pass123")
+        self.staff = User.objects.create_user(username="staff", password="pass123", is_staff=True)
+
+        done = timezone.now() - timedelta(minutes=10)
+        for offset, action in enumerate(["create", "update", "delete"]):
+            AuditLog.objects.create(
+                user=self.user, action=action, resource="Product",
+                correlation_id="req-1", timestamp=done + timedelta(milliseconds=offset * 50),
+            )
+        AuditLog.objects.create(
+            user=self.staff, action="update", resource="Category",
+            correlation_id="req-1", timestamp=done + timedelta(milliseconds=75),
+        )
+        AuditLog.objects.create(user=self.user, action="update", resource="Product", correlation_id="req-2")
+
+    def teardown_method(self):
+        cache.clear()
+
+    def test_staff_gets_the_ordered_timeline(self):
+        self.client.force_authenticate(user=self.staff)
+
+        response = self.client.get(trace_url("req-1"))
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [(e["resource"], e["action"]) for e in data["events"]] == [
+            ("Product", "create"),
+            ("Product", "update"),
+            ("Category", "update"),
+            ("Product", "delete"),
+        ]
+        assert data["count"] == 4
+        assert data["duration_ms"] == 100
+        assert data["complete"] is True
+        assert data["truncated"] is False
+        assert {e["correlation_id"] for e in data["events"]} == {"req-1"}
+
+    def test_users_see_only_their_own_events(self):
+        self.client.force_authenticate(user=self.user)
+
+        data = self.client.get(trace_url("req-1")).json()
+
+        assert data["count"] == 3
+        assert {e["user"]["username"] for e in data["events"]} == {"user1"}
+
+    def test_unknown_trace_is_404(self):
+        self.client.force_authenticate(user=self.staff)
+
+        assert self.client.get(trace_url("nope")).status_code == 404
+
+    def test_completed_trace_is_cached(self, django_assert_num_queries):
+        self.client.force_authenticate(user=self.staff)
+        self.client.get(trace_url("req-1"))
+
+        AuditLog.objects.filter(correlation_id="req-1").delete()
+
+        with django_assert_num_queries(0):
+            response = self.client.get(trace_url("req-1"))
+        assert response.json()["count"] == 4
+
+    def test_trace_still_receiving_events_is_not_cached(self):
+        self.client.force_authenticate(user=self.staff)
+
+        assert self.client.get(trace_url("req-2")).json()["complete"] is False
+        AuditLog.objects.create(user=self.user, action="delete", resource="Product", correlation_id="req-2")
+
+        assert self.client.get(trace_url("req-2")).json()["count"] == 2
+
+    @override_settings(AUDIT_LOG_TRACE_MAX_EVENTS=2)
+    def test_long_traces_are_truncated(self):
+        self.client.force_authenticate(user=self.staff)
+
+        data = self.client.get(trace_url("req-1")).json()
+
+        assert (data["count"], data["truncated"]) == (2, True)
+
+    def test_trace_is_an_indexed_lookup(self):
+        plan = (
+            AuditLog.objects.filter(correlation_id="req-1")
+            .order_by("timestamp", "id")
+            .explain()
+        )
+        assert "correlation_id" in plan and "INDEX" in plan.upper()
@@ -0,0 +1,78 @@
+# audit_log/api/trace.py
+
+"""
+Event timeline of one request: every audit row sharing a correlation_id,
+in write order, read through the correlation_id index.
+
+A trace whose newest event is older than AUDIT_LOG_TRACE_SETTLE_SECONDS
+is treated as complete (buffered and on-commit writes have landed) and
+cached for AUDIT_LOG_TRACE_CACHE_TIMEOUT seconds. Traces still receiving
+events are never cached.
+"""
+
+import hashlib
+from datetime import timedelta
+from typing import Callable, Optional
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from audit_log.conf import get_setting
+
+CACHE_PREFIX = "audit_log:trace"
+
+# same alphabet AuditLogContextMiddleware accepts from clients
+CORRELATION_ID_PATTERN = r"[A-Za-z0-9._:-]{1,64}"
+
+
+def cache_key(correlation_id: str, user) -> str:
+    # staff and each user see different rows of the same trace
+    scope = "staff" if user.is_staff else f"user:{user.pk}"
+    digest = hashlib.sha1(f"{scope}:{correlation_id}".encode()).hexdigest()
+    return f"{CACHE_PREFIX}:{digest}"
+
+
+def is_complete(last_event) -> bool:
+    settle = timedelta(seconds=get_setting("TRACE_SETTLE_SECONDS"))
+    return timezone.now() - last_event.timestamp >= settle
+
+
+def assemble(queryset, correlation_id: str, serialize: Callable) -> Optional[dict]:
+    """Timeline payload, or None when no visible event has this id."""
+    limit = get_setting("TRACE_MAX_EVENTS")
+
+    events = list(
+        queryset
+        .filter(correlation_id=correlation_id)
+        .order_by("timestamp", "id")[:limit + 1]
+    )
+    if not events:
+        return None
+
+    truncated = len(events) > limit
+    events = events[:limit]
+    started, ended = events[0].timestamp, events[-1].timestamp
+
+    return {
+        "correlation_id": correlation_id,
+        "count": len(events),
+        "truncated": truncated,
+        "complete": is_complete(events[-1]),
+        "started_at": started,
+        "ended_at": ended,
+        "duration_ms": round((ended - started).total_seconds() * 1000, 3),
+        "events": list(serialize(events)),
+    }
+
+
+def get_trace(queryset, correlation_id: str, user, serialize: Callable) -> Optional[dict]:
+    key = cache_key(correlation_id, user)
+
+    trace = cache.get(key)
+    if trace is not None:
+        return trace
+
+    trace = assemble(queryset, correlation_id, serialize)
+    if trace is not None and trace["complete"]:
+        cache.set(key, trace, get_setting("TRACE_CACHE_TIMEOUT"))
+    return trace
@@ -1,13 +1,32 @@
+import time
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db.models import Sum
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.viewsets import ReadOnlyModelViewSet
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter
 
-from audit_log.models import AuditLog
-from audit_log.api.serializers import AuditLogSerializer
+from audit_log.models import AuditLog, AuditLogHourlyStat
+from audit_log.api.serializers import (
+    AuditLogRowsQuerySerializer,
+    AuditLogSerializer,
+    AuditLogStatsQuerySerializer,
+)
 from audit_log.api.authentication import BasicAuth401
 from audit_log.api.filters import AuditLogFilter
 from audit_log.api.ordering import AuditLogOrderingFilter
+from audit_log.api.search import AuditLogSearchFilter
+from audit_log.api.pagination import AuditLogCursorPagination
+from audit_log.api.export import FORMATS, accepts_gzip, export_response
+from audit_log.api.trace import CORRELATION_ID_PATTERN, get_trace
+from audit_log.encoding import decode_rows, is_columnar
+from audit_log.metrics import audit_log_api_query_seconds
+from audit_log.stats import hour_of
 
 
 class AuditLogViewSet(ReadOnlyModelViewSet):
@@ -15,10 +34,13 @@ class AuditLogViewSet(ReadOnlyModelViewSet):
     authentication_classes = [BasicAuth401]
     permission_classes = [IsAuthenticated]
 
+    # ✅ keyset paging on (timestamp, id): no OFFSET, no COUNT(*) by default
+    pagination_class = AuditLogCursorPagination
+
     # ❗ OrderingFilter پیش‌فرض DRF عمداً حذف شده
     filter_backends = [
         DjangoFilterBackend,
-        SearchFilter,
+        AuditLogSearchFilter,      # ✅ full-text index, not LIKE scans
         AuditLogOrderingFilter,   # ✅ ONLY custom ordering
     ]
 
@@ -28,6 +50,15 @@ class AuditLogViewSet(ReadOnlyModelViewSet):
     # ✅ ORM FIELD — نه API alias
     ordering = ["-timestamp"]
 
+    def dispatch(self, request, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            audit_log_api_query_seconds.labels(
+                endpoint=getattr(self, "action", None) or "unknown"
+            ).observe(time.perf_counter() - started)
+
     def get_queryset(self):
         user = self.request.user
 
@@ -47,3 +78,107 @@ class AuditLogViewSet(ReadOnlyModelViewSet):
             qs = qs.filter(user=user)
 
         return qs
+
+    # -----------------------------------------
+    # 📤 bulk export (same filters as the list)
+    # -----------------------------------------
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        # not "format": DRF reserves it for renderer negotiation
+        export_format = request.query_params.get("export_format", "ndjson").lower()
+        if export_format not in FORMATS:
+            raise ValidationError(
+                {"export_format": f"Choose one of: {', '.join(FORMATS)}"}
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # id tie-breaker in the same direction → a stable, resumable order
+        ordering = queryset.query.order_by or ("-timestamp",)
+        tie_breaker = "-id" if ordering[0].startswith("-") else "id"
+        queryset = queryset.order_by(*ordering, tie_breaker)
+
+        return export_response(
+            queryset,
+            export_format=export_format,
+            gzip=accepts_gzip(request),
+        )
+
+    # -----------------------------------------
+    # 📊 rollup stats (AuditLogHourlyStat, never the raw table)
+    # -----------------------------------------
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="stats",
+        permission_classes=[IsAuthenticated, IsAdminUser],
+    )
+    def stats(self, request):
+        params = AuditLogStatsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        until = data.get("until") or timezone.now()
+        # buckets are whole hours: include the one since falls into
+        since = hour_of(data.get("since") or until - timedelta(hours=24))
+        group_by = data["group_by"]
+
+        qs = AuditLogHourlyStat.objects.filter(hour__gte=since, hour__lt=until)
+        for dimension in ("resource", "action", "status"):
+            if dimension in data:
+                qs = qs.filter(**{dimension: data[dimension]})
+
+        if "day" in group_by:
+            qs = qs.annotate(day=TruncDay("hour", tzinfo=dt_timezone.utc))
+
+        rows = (
+            qs.values(*group_by)
+            .annotate(count=Sum("count"))
+            .order_by(*group_by)
+        )
+
+        return Response({
+            "since": since,
+            "until": until,
+            "group_by": group_by,
+            "results": list(rows),
+        })
+
+    # -----------------------------------------
+    # 🗜 rows of one bulk event, decoded a page at a time
+    # -----------------------------------------
+    @action(detail=True, methods=["get"], url_path="rows")
+    def rows(self, request, pk=None):
+        params = AuditLogRowsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        offset, limit = params.validated_data["offset"], params.validated_data["limit"]
+
+        event = self.get_object()
+        if not is_columnar(event.changes):
+            raise NotFound("This event has no bulk row snapshot.")
+
+        return Response({
+            "count": event.changes.get("count"),
+            "offset": offset,
+            "limit": limit,
+            "after": event.changes.get("after"),
+            "results": list(decode_rows(event.changes, offset, limit)),
+        })
+
+    # -----------------------------------------
+    # 🔗 one request's timeline (correlation_id index)
+    # -----------------------------------------
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=rf"trace/(?P<correlation_id>{CORRELATION_ID_PATTERN})",
+    )
+    def trace(self, request, correlation_id=None):
+        trace = get_trace(
+            self.get_queryset(),
+            correlation_id,
+            request.user,
+            serialize=lambda events: self.get_serializer(events, many=True).data,
+        )
+        if trace is None:
+            raise NotFound("No audit events for this correlation id.")
+        return Response(trace)
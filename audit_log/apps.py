@@ -18,4 +18,8 @@ class AuditLogConfig(AppConfig):
         )):
             return
 
+        from .registry import registry
         from . import signals  # ✅ ONLY place signals are imported
+
+        registry.build()
+        signals.connect_signals()
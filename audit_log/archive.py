@@ -0,0 +1,240 @@
+# audit_log/archive.py
+
+"""
+Append-only, compressed segment files for archived audit logs.
+
+One segment per day (audit-YYYY-MM-DD.seg):
+
+    [header]  fixed HEADER_SIZE bytes: MAGIC + JSON index, space padded
+    [block]*  4-byte big-endian length + zlib-compressed NDJSON rows
+
+The header holds the time range, row count, min/max id, the
+(timestamp, id) key of the last archived row and the number of valid
+data bytes, so a segment can be inspected without reading it and
+streamed one block at a time. A block torn by a crash lies past the
+recorded size and is discarded on the next append; rows at or before
+the last key are skipped, so a batch archived again after a crash is
+not stored twice.
+"""
+
+import json
+import os
+import struct
+import zlib
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+MAGIC = b"AUDITSEG1\n"
+HEADER_SIZE = 512
+_LENGTH = struct.Struct(">I")
+
+# columns written for every archived row
+ARCHIVE_FIELDS = (
+    "id",
+    "timestamp",
+    "user_id",
+    "action",
+    "resource",
+    "status",
+    "description",
+    "source",
+    "correlation_id",
+    "content_type_id",
+    "object_id",
+    "changes",
+)
+
+
+def segment_path(directory, day: date) -> Path:
+    return Path(directory) / f"audit-{day:%Y-%m-%d}.seg"
+
+
+def _empty_header(day: date) -> dict:
+    return {
+        "version": 1,
+        "day": day.isoformat(),
+        "rows": 0,
+        "blocks": 0,
+        "size": HEADER_SIZE,
+        "min_timestamp": None,
+        "max_timestamp": None,
+        "min_id": None,
+        "max_id": None,
+        "last_key": None,
+    }
+
+
+def _encode_header(header: dict) -> bytes:
+    payload = MAGIC + json.dumps(header, separators=(",", ":")).encode()
+    if len(payload) >= HEADER_SIZE:
+        raise ValueError("segment header too large")
+    return payload.ljust(HEADER_SIZE - 1, b" ") + b"\n"
+
+
+def read_header(path) -> dict:
+    """Read a segment's index without touching its data blocks."""
+    with open(path, "rb") as fh:
+        raw = fh.read(HEADER_SIZE)
+
+    if not raw.startswith(MAGIC):
+        raise ValueError(f"{path} is not an audit log segment")
+    return json.loads(raw[len(MAGIC):].strip())
+
+
+def iter_segment(path) -> Iterator[dict]:
+    """Stream the rows of a segment, one decompressed block at a time."""
+    header = read_header(path)
+
+    with open(path, "rb") as fh:
+        fh.seek(HEADER_SIZE)
+        while fh.tell() < header["size"]:
+            (length,) = _LENGTH.unpack(fh.read(_LENGTH.size))
+            block = zlib.decompress(fh.read(length))
+            for line in block.splitlines():
+                yield json.loads(line)
+
+
+class SegmentWriter:
+    """Appends blocks to one day's segment and keeps its header current."""
+
+    def __init__(self, directory, day: date):
+        self.path = segment_path(directory, day)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.path.exists():
+            self.header = read_header(self.path)
+            self._fh = open(self.path, "r+b")
+            # drop anything past the last recorded block (torn write)
+            self._fh.truncate(self.header["size"])
+        else:
+            self.header = _empty_header(day)
+            self._fh = open(self.path, "w+b")
+            self._fh.write(_encode_header(self.header))
+
+    def _last_key(self):
+        last = self.header.get("last_key")
+        if last is None:
+            return None
+        return (datetime.fromisoformat(last[0]), last[1])
+
+    def append(self, rows: list) -> int:
+        """Append rows (in (timestamp, id) order) past the last archived key."""
+        last = self._last_key()
+        if last is not None:
+            rows = [row for row in rows if (row["timestamp"], row["id"]) > last]
+        if not rows:
+            return 0
+
+        data = zlib.compress(
+            b"\n".join(
+                json.dumps(row, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+                for row in rows
+            )
+        )
+
+        self._fh.seek(self.header["size"])
+        self._fh.write(_LENGTH.pack(len(data)))
+        self._fh.write(data)
+
+        header = self.header
+        header["size"] += _LENGTH.size + len(data)
+        header["rows"] += len(rows)
+        header["blocks"] += 1
+
+        ids = [row["id"] for row in rows]
+        stamps = [_iso(row["timestamp"]) for row in rows]
+        _widen(header, "id", min(ids), max(ids))
+        _widen(header, "timestamp", min(stamps), max(stamps))
+        header["last_key"] = [_iso(rows[-1]["timestamp"]), rows[-1]["id"]]
+        return len(rows)
+
+    def sync(self) -> None:
+        # data first, then the header that makes it visible
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.seek(0)
+        self._fh.write(_encode_header(self.header))
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        self.sync()
+        self._fh.close()
+
+
+def _iso(value) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _widen(header: dict, key: str, low, high) -> None:
+    current_low, current_high = header[f"min_{key}"], header[f"max_{key}"]
+    header[f"min_{key}"] = low if current_low is None else min(current_low, low)
+    header[f"max_{key}"] = high if current_high is None else max(current_high, high)
+
+
+class SegmentArchive:
+    """
+    Route a stream of rows (dicts of ARCHIVE_FIELDS) to per-day segments.
+
+    Rows arrive in (timestamp, id) order, so only the current day's
+    segment is open: it is closed as soon as the stream moves to another
+    day. Rows are buffered up to block_rows per block, so memory stays
+    constant regardless of how many rows are archived.
+    """
+
+    def __init__(self, directory, block_rows: int = 1000):
+        self.directory = Path(directory)
+        self.block_rows = max(1, block_rows)
+        self.rows_written = 0
+        self._day = None
+        self._writer = None
+        self._pending = []
+
+    def _flush(self) -> None:
+        if self._pending:
+            if self._writer is None:
+                self._writer = SegmentWriter(self.directory, self._day)
+            self.rows_written += self._writer.append(self._pending)
+            self._pending = []
+
+    def _switch(self, day: date) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._day = day
+
+    def write_rows(self, rows: Iterable[dict]) -> int:
+        count = 0
+        for row in rows:
+            day = row["timestamp"].date()
+            if day != self._day:
+                self._switch(day)
+
+            self._pending.append(row)
+            count += 1
+
+            if len(self._pending) >= self.block_rows:
+                self._flush()
+
+        return count
+
+    def sync(self) -> None:
+        """Persist everything written so far (call before deleting rows)."""
+        self._flush()
+        if self._writer is not None:
+            self._writer.sync()
+
+    def close(self) -> None:
+        self._switch(None)
+
+
+def find_segments(directory, start: Optional[date] = None, end: Optional[date] = None):
+    """Segment paths for the days in [start, end] (inclusive), oldest first."""
+    for path in sorted(Path(directory).glob("audit-*.seg")):
+        day = date.fromisoformat(path.stem[len("audit-"):])
+        if (start is None or day >= start) and (end is None or day <= end):
+            yield path
@@ -0,0 +1,195 @@
+# audit_log/buffer.py
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import List, Optional
+
+from django.db import connections
+
+from audit_log.conf import get_setting
+from audit_log.metrics import (
+    audit_log_buffer_queue_depth,
+    audit_log_dropped_events_total,
+    audit_log_flush_latency_seconds,
+)
+from audit_log.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogBuffer:
+    """
+    Bounded in-process queue of unsaved AuditLog instances.
+
+    - Flushed with a single bulk_create per batch
+    - Flushes when batch_size is reached or every flush_interval seconds
+    - When the queue is full the caller flushes inline (backpressure),
+      so events are never silently dropped
+    """
+
+    def __init__(self, *, max_size: int, batch_size: int, flush_interval: float):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+
+        self._queue: "queue.Queue[AuditLog]" = queue.Queue(maxsize=max(1, max_size))
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    # -----------------------------------------
+    # 📥 enqueue
+    # -----------------------------------------
+    def put(self, entry: AuditLog) -> None:
+        self._ensure_worker()
+
+        while True:
+            try:
+                self._queue.put_nowait(entry)
+                break
+            except queue.Full:
+                # ⛔ never drop: write a batch ourselves, then retry
+                self.flush(max_batches=1)
+
+        audit_log_buffer_queue_depth.inc()
+
+        if self._queue.qsize() >= self.batch_size:
+            if self._thread is not None:
+                self._wakeup.set()
+            else:
+                self.flush(max_batches=1)
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    # -----------------------------------------
+    # 📤 flush
+    # -----------------------------------------
+    def flush(self, max_batches: Optional[int] = None) -> int:
+        """
+        Write queued events. Returns the number of rows written.
+        """
+        written = 0
+        batches = 0
+
+        with self._flush_lock:
+            while max_batches is None or batches < max_batches:
+                batch = self._drain()
+                if not batch:
+                    break
+
+                audit_log_buffer_queue_depth.dec(len(batch))
+                started = time.perf_counter()
+                written += self._write(batch)
+                audit_log_flush_latency_seconds.labels(mode="buffered").observe(
+                    time.perf_counter() - started
+                )
+                batches += 1
+
+        return written
+
+    def _drain(self) -> List[AuditLog]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[AuditLog]) -> int:
+        try:
+            AuditLog.objects.bulk_create(batch)
+            return len(batch)
+        except Exception:
+            # ✅ fail-safe: audit writes must never break the caller
+            logger.exception("Failed to flush %d audit log entries", len(batch))
+            audit_log_dropped_events_total.labels(reason="write_error").inc(len(batch))
+            return 0
+
+    # -----------------------------------------
+    # 🧵 background flusher
+    # -----------------------------------------
+    def _ensure_worker(self) -> None:
+        if self.flush_interval <= 0 or self._thread is not None:
+            return
+
+        with self._thread_lock:
+            if self._thread is None:
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="audit-log-flusher",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                self.flush()
+        finally:
+            # worker thread owns its own DB connection
+            connections.close_all()
+
+    def shutdown(self) -> None:
+        """
+        Stop the flusher thread and write everything still queued.
+        """
+        thread = self._thread
+        if thread is not None:
+            self._stopped.set()
+            self._wakeup.set()
+            thread.join(timeout=max(self.flush_interval, 1) * 2)
+            self._thread = None
+
+        self.flush()
+
+
+_buffer: Optional[AuditLogBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer() -> AuditLogBuffer:
+    """Return the process-wide buffer, creating it from settings on first use."""
+    global _buffer
+
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = AuditLogBuffer(
+                    max_size=get_setting("BUFFER_MAX_SIZE"),
+                    batch_size=get_setting("BUFFER_BATCH_SIZE"),
+                    flush_interval=get_setting("BUFFER_FLUSH_INTERVAL"),
+                )
+    return _buffer
+
+
+def flush_buffer() -> int:
+    """Flush the process-wide buffer if it was ever created."""
+    if _buffer is None:
+        return 0
+    return _buffer.flush()
+
+
+def shutdown_buffer() -> None:
+    """Clean shutdown: stop the flusher and drain the queue."""
+    global _buffer
+
+    if _buffer is None:
+        return
+
+    with _buffer_lock:
+        buffer, _buffer = _buffer, None
+
+    if buffer is not None:
+        buffer.shutdown()
+
+
+atexit.register(shutdown_buffer)
@@ -0,0 +1,139 @@
+# audit_log/bulk.py
+
+from typing import Callable, Iterable, Optional
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, transaction
+
+from audit_log.context import get_current_user_id, is_audit_logging_disabled
+from audit_log.encoding import ColumnarEncoder
+from audit_log.models import AuditLog
+from audit_log.registry import registry, to_json_value
+from audit_log.writer import write
+
+# snapshot rows are streamed from the DB in chunks of this size
+ID_CHUNK_SIZE = 2000
+
+
+def describe_values(model, values: dict) -> dict:
+    """JSON-safe view of the columns set by an UPDATE (expressions as text)."""
+    return {
+        name: str(value)
+        if hasattr(value, "resolve_expression")
+        else to_json_value(value, model._meta.get_field(name))
+        for name, value in values.items()
+    }
+
+
+def log_bulk_change(
+    *,
+    model,
+    action: str,
+    snapshot: ColumnarEncoder,
+    after: Optional[dict] = None,
+    computed: Iterable[str] = (),
+    soft: Optional[bool] = None,
+    user=None,
+    source: str = "bulk",
+) -> Optional[AuditLog]:
+    """
+    Record one compact audit event for a bulk statement.
+
+    changes = {
+        "format": "columnar",
+        "ids": encode_ids() payload,
+        "count": n,
+        "before": {field: [[value, run], ...]},
+        "after": {field: value},
+        "computed": [field, ...],  # "after" is an expression's text
+    }
+    Use audit_log.encoding.decode_changes() to get the plain form back.
+    """
+    if is_audit_logging_disabled():
+        return None
+
+    changes = {
+        "format": "columnar",
+        "ids": snapshot.ids.result(),
+        "count": snapshot.count,
+        "before": snapshot.columns(),
+    }
+    if after is not None:
+        changes["after"] = after
+    computed = list(computed)
+    if computed:
+        changes["computed"] = computed
+    if soft is not None:
+        changes["soft"] = soft
+
+    return write(AuditLog(
+        user_id=user.pk if user is not None else get_current_user_id(),
+        action=action,
+        resource=model.__name__,
+        content_type=ContentType.objects.get_for_model(model),
+        object_id=None,
+        source=source,
+        changes=changes,
+    ), path="bulk")
+
+
+def run_audited(
+    queryset,
+    *,
+    action: str,
+    statement: Callable[[], object],
+    values: Optional[dict] = None,
+    soft: Optional[bool] = None,
+    user=None,
+    source: str = "bulk",
+):
+    """
+    Run a bulk UPDATE / DELETE and log it as a single audit event.
+
+    Affected ids and the previous values of the updated columns are
+    streamed into a columnar snapshot in the same transaction as the
+    statement, so 100k rows cost one compact audit row. The snapshot
+    rows are locked (SELECT ... FOR UPDATE) until the statement has run,
+    so a concurrent writer cannot change a "before" value in between.
+    A hard delete snapshots every tracked field, so the object's history
+    can still be replayed (audit_log.history).
+    """
+    columns = list(values or ())
+    meta = registry.get(queryset.model)
+    if soft is False and values is None and meta is not None:
+        columns = [field.name for field in meta.tracked_fields]
+    features = connections[queryset.db].features
+    # only the audited table: joined (possibly nullable) rows stay unlocked
+    lock_of = ("self",) if features.has_select_for_update_of else ()
+
+    with transaction.atomic(using=queryset.db):
+        snapshot = ColumnarEncoder(columns)
+        rows = (
+            queryset
+            .select_for_update(of=lock_of)
+            .order_by("pk")
+            .values_list("pk", *columns)
+            .iterator(chunk_size=ID_CHUNK_SIZE)
+        )
+        fields = [queryset.model._meta.get_field(name) for name in columns]
+        for pk, *row in rows:
+            snapshot.add(pk, [to_json_value(value, field) for value, field in zip(row, fields)])
+
+        result = statement()
+
+        if snapshot.count:
+            log_bulk_change(
+                model=queryset.model,
+                action=action,
+                snapshot=snapshot,
+                after=describe_values(queryset.model, values) if values is not None else None,
+                computed=[
+                    name for name, value in (values or {}).items()
+                    if hasattr(value, "resolve_expression")
+                ],
+                soft=soft,
+                user=user,
+                source=source,
+            )
+
+    return result
@@ -0,0 +1,171 @@
+# audit_log/coalesce.py
+
+"""
+Per-request coalescing of repeated signal events.
+
+Inside a request (AuditLogContextMiddleware) post_save events are not
+written one by one: events with the same (content_type, object_id,
+action) merge into one row holding each field's first "before" and last
+"after", written when the request ends.
+
+    product.restore()   # deleted_at: 2024-… → None
+    product.save()      # nothing changed
+    → one "update" row: {"deleted_at": {"before": "2024-…", "after": None}}
+
+Events saved inside atomic() leave an on_commit marker; if their
+(savepoint) level rolls back, Django drops the marker (and with it the
+only strong reference) and the event is skipped at flush, so rolled-back
+saves still leave no row.
+
+A request holds at most AUDIT_LOG_COALESCE_MAX_EVENTS events: past that
+they are merged and written early (inside a still open transaction the
+rows then commit or roll back with it), and later saves start new rows.
+All merged rows of a flush go out as one bulk write.
+"""
+
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+
+from audit_log.conf import get_setting
+from audit_log.metrics import audit_log_dropped_events_total
+from audit_log.models import AuditLog
+
+Key = Tuple[Optional[int], Optional[str], str]
+
+_coalescer: ContextVar[Optional["Coalescer"]] = ContextVar("audit_log_coalescer", default=None)
+
+
+def merge_changes(first: Optional[dict], later: Optional[dict]) -> Optional[dict]:
+    """Field diffs of two consecutive saves as one (None = nothing changed)."""
+    merged = dict(first or {})
+    for field, change in (later or {}).items():
+        if field in merged:
+            change = {"before": merged[field]["before"], "after": change["after"]}
+        merged[field] = change
+    return merged or None
+
+
+class _Commit:
+    """
+    on_commit marker for one event saved inside atomic().
+
+    Django's on_commit queue holds the only strong reference, so the weak
+    reference kept by the coalescer dies if the event's (savepoint) level
+    rolls back; running sets committed.
+    """
+
+    def __init__(self):
+        self.state = {"committed": False}
+
+    def __call__(self):
+        self.state["committed"] = True
+
+
+Marker = Tuple[weakref.ref, dict]
+
+
+def _survived(marker: Optional[Marker]) -> bool:
+    # outside atomic(), committed, or still pending (not rolled back)
+    if marker is None:
+        return True
+    pending, state = marker
+    return state["committed"] or pending() is not None
+
+
+class Coalescer:
+    """
+    Signal events of one request, merged when flushed.
+
+    diffed tells whether an entry's changes are a real diff (None = no
+    change) or unknown (no snapshot to diff against); the two kinds
+    never merge, so no row claims to know more than its events did.
+    """
+
+    def __init__(self):
+        self.events: List[Tuple[AuditLog, bool, Optional[Marker]]] = []
+        self.closed = False
+
+    def add(self, entry: AuditLog, *, diffed: bool, using: str) -> None:
+        marker = None
+        if transaction.get_connection(using).in_atomic_block:
+            commit = _Commit()
+            marker = (weakref.ref(commit), commit.state)
+            transaction.on_commit(commit, using=using)
+        self.events.append((entry, diffed, marker))
+
+        if len(self.events) >= get_setting("COALESCE_MAX_EVENTS"):
+            self._write_merged()
+
+    def merged(self) -> List[AuditLog]:
+        """Surviving events, one entry per key run, in first-seen order."""
+        entries: List[AuditLog] = []
+        open_entries: Dict[Key, Tuple[AuditLog, bool]] = {}
+
+        for entry, diffed, marker in self.events:
+            if not _survived(marker):
+                continue
+
+            key = (entry.content_type_id, entry.object_id, entry.action)
+            current = open_entries.get(key)
+
+            if current is not None and current[1] == diffed:
+                first = current[0]
+                if diffed:
+                    first.changes = merge_changes(first.changes, entry.changes)
+                # the row describes the state after the last save
+                first.timestamp = entry.timestamp
+                continue
+
+            open_entries[key] = (entry, diffed)
+            entries.append(entry)
+        return entries
+
+    def _write_merged(self) -> None:
+        entries = self.merged()
+        self.events = []
+        if entries:
+            _write(entries)
+
+    def flush(self) -> None:
+        self._write_merged()
+        self.closed = True
+
+
+def _write(entries: List[AuditLog]) -> None:
+    from audit_log.writer import write_batch
+
+    try:
+        write_batch(entries, path="signal")
+    except Exception:
+        # ✅ fail-safe: the response has been produced already
+        audit_log_dropped_events_total.labels(reason="error").inc(len(entries))
+
+
+@contextmanager
+def coalescing():
+    """Collect signal events until exit; the caller flushes the result."""
+    coalescer = Coalescer()
+    token = _coalescer.set(coalescer)
+    try:
+        yield coalescer
+    finally:
+        _coalescer.reset(token)
+
+
+def coalesce(entry: AuditLog, *, diffed: bool, using: str) -> bool:
+    """
+    Hand a signal event to the current request's coalescer.
+
+    Returns False outside a request (or with AUDIT_LOG_COALESCE_EVENTS
+    off); the caller then writes the entry itself.
+    """
+    coalescer = _coalescer.get()
+    if coalescer is None or coalescer.closed or not get_setting("COALESCE_EVENTS"):
+        return False
+
+    coalescer.add(entry, diffed=diffed, using=using)
+    return True
@@ -0,0 +1,77 @@
+# audit_log/collector.py
+
+import weakref
+from threading import local
+from typing import List, Optional, Tuple
+
+from django.db import router, transaction
+
+from audit_log.models import AuditLog
+
+# DB connections are per-thread, so is the pending state that follows them
+_state = local()
+
+
+class PendingBatch:
+    """
+    Audit entries collected at one savepoint level of a transaction.
+
+    Registered once with transaction.on_commit; Django discards the
+    callback (and therefore the entries) if that level is rolled back.
+
+    Django's on_commit queue holds the only strong reference: collect()
+    looks batches up weakly, so a batch that has run or whose level was
+    rolled back is simply gone and never reused by a later transaction
+    with the same savepoint ids.
+    """
+
+    def __init__(self, using: str, savepoint_ids: Tuple[str, ...], persist):
+        self.using = using
+        self.savepoint_ids = savepoint_ids
+        self.entries: List[AuditLog] = []
+        self._persist = persist
+
+    def __call__(self):
+        _batches(self.using).pop(self.savepoint_ids, None)
+        if self.entries:
+            self._persist(self.entries)
+
+
+def _batches(using: str) -> "weakref.WeakValueDictionary[Tuple[str, ...], PendingBatch]":
+    if not hasattr(_state, "batches"):
+        _state.batches = {}
+    return _state.batches.setdefault(using, weakref.WeakValueDictionary())
+
+
+def collect(entry: AuditLog, persist, using: Optional[str] = None) -> bool:
+    """
+    Queue entry until the surrounding transaction commits.
+
+    Returns False when no transaction is open; the caller then writes
+    the entry itself.
+    """
+    using = using or router.db_for_write(AuditLog)
+    connection = transaction.get_connection(using)
+    batches = _batches(using)
+
+    if not connection.in_atomic_block:
+        batches.clear()
+        return False
+
+    savepoint_ids = tuple(connection.savepoint_ids)
+    batch = batches.get(savepoint_ids)
+
+    if batch is None:
+        batch = PendingBatch(using, savepoint_ids, persist)
+        batches[savepoint_ids] = batch
+        # robust: a failed audit write must not break the committed work
+        transaction.on_commit(batch, using=using, robust=True)
+
+    batch.entries.append(entry)
+    return True
+
+
+def pending_count(using: Optional[str] = None) -> int:
+    """Number of entries waiting for commit on this thread's connection."""
+    using = using or router.db_for_write(AuditLog)
+    return sum(len(batch.entries) for batch in _batches(using).values())
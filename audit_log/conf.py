@@ -0,0 +1,17 @@
+# audit_log/conf.py
+
+from django.conf import settings
+
+from audit_log import constants
+
+
+def get_setting(name: str):
+    """
+    Return an audit log setting.
+
+    Project settings (settings.AUDIT_LOG_*) win over the defaults
+    declared in audit_log.constants. Resolved on every call so
+    override_settings() works in tests.
+    """
+    key = f"AUDIT_LOG_{name}"
+    return getattr(settings, key, getattr(constants, key))
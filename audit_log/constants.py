@@ -20,4 +20,160 @@ IGNORED_FIELDS = {
 }
 
 # Number of days to keep audit logs before cleanup
-AUDIT_LOG_RETENTION_DAYS = 180
\ No newline at end of file
+AUDIT_LOG_RETENTION_DAYS = 180
+
+# =========================
+# Write pipeline
+# =========================
+
+# "sync"     → one INSERT per audit event (default)
+# "buffered" → events are queued in-process and flushed with bulk_create
+WRITE_MODE_SYNC = "sync"
+WRITE_MODE_BUFFERED = "buffered"
+
+AUDIT_LOG_WRITE_MODE = WRITE_MODE_SYNC
+
+# Maximum number of queued events before callers flush inline (backpressure)
+AUDIT_LOG_BUFFER_MAX_SIZE = 10000
+
+# Number of events written per bulk_create
+AUDIT_LOG_BUFFER_BATCH_SIZE = 500
+
+# Seconds between background flushes (0 disables the flusher thread)
+AUDIT_LOG_BUFFER_FLUSH_INTERVAL = 2.0
+
+# Defer audit writes made inside atomic() to transaction.on_commit and
+# write them with one bulk_create; rolled-back work drops its events
+AUDIT_LOG_DEFER_UNTIL_COMMIT = False
+
+
+# Merge repeated post_save events of one object within a request into
+# one row (first "before", last "after"), see audit_log/coalesce.py
+AUDIT_LOG_COALESCE_EVENTS = True
+# Events a request may hold before they are merged and written early
+# (bounds memory of bulk loops; later saves start a new row)
+AUDIT_LOG_COALESCE_MAX_EVENTS = 1000
+
+# Write-side sampling / rate limiting / dropping of noisy events, see
+# audit_log/policy.py. First matching rule wins. Empty on purpose: an
+# audit trail keeps everything unless a project opts in per source.
+# Model create / update / delete events are never suppressed (history).
+#   {"resource": "Report", "action": "export", "source": "api",
+#    "policy": "sample", "every": 10}
+#   {"action": "view", "policy": "rate_limit", "rate": 5, "burst": 20}
+AUDIT_LOG_POLICIES = []
+
+# Security-relevant actions no policy may suppress
+AUDIT_LOG_POLICY_ALWAYS_KEEP_ACTIONS = [
+    "delete",
+    "bulk_delete",
+    "hard_delete",
+    "login",
+    "logout",
+]
+
+
+# =========================
+# Audited models (registry)
+# =========================
+
+# "app_label" or "app_label.ModelName" entries.
+# None → every installed model that is not excluded
+AUDIT_LOG_INCLUDE_MODELS = None
+
+# Never audited: framework bookkeeping and the audit log itself
+AUDIT_LOG_EXCLUDE_MODELS = [
+    "admin",
+    "contenttypes",
+    "sessions",
+    "authtoken",
+    "audit_log",
+]
+
+
+# =========================
+# Partitioning
+# =========================
+
+# Monthly partitions of the audit table (see audit_log/partitions.py),
+# PostgreSQL only. Retention then drops whole months instead of deleting rows.
+AUDIT_LOG_PARTITIONING = False
+
+# Months created ahead of the current one by setup and every retention
+# run (cleanup_audit_logs); later rows land in the DEFAULT partition
+AUDIT_LOG_PARTITION_MONTHS_AHEAD = 2
+
+
+# =========================
+# Rollups
+# =========================
+
+# Maintain AuditLogHourlyStat (events per hour/resource/action/status):
+# committed with every audit insert, decremented by retention cleanup
+AUDIT_LOG_HOURLY_STATS = True
+
+
+# =========================
+# Attribution
+# =========================
+
+# Seconds a verified session auth hash is trusted without loading the
+# user (dropped on user save/delete; a queryset .update() of is_active
+# takes effect after this)
+AUDIT_LOG_SESSION_USER_CACHE_TIMEOUT = 300
+
+
+# =========================
+# Metrics
+# =========================
+
+# Shared directory for Prometheus multiprocess mode (one mmap file per
+# worker, aggregated by /metrics/). None → per-process registry.
+# The PROMETHEUS_MULTIPROC_DIR environment variable takes precedence.
+AUDIT_LOG_PROMETHEUS_MULTIPROC_DIR = None
+
+
+# =========================
+# Admin
+# =========================
+
+# Changelist counts up to this many rows are exact; above it they come
+# from planner statistics, the hourly rollup or a cached COUNT(*)
+AUDIT_LOG_ADMIN_EXACT_COUNT_THRESHOLD = 10_000
+
+# Seconds a COUNT(*) without a cheaper estimate is reused
+AUDIT_LOG_ADMIN_COUNT_CACHE_TIMEOUT = 300
+
+
+# =========================
+# Traces
+# =========================
+
+# /api/audit-logs/trace/<correlation_id>/: a trace is complete (and
+# cached) once its newest event is this old
+AUDIT_LOG_TRACE_SETTLE_SECONDS = 60
+AUDIT_LOG_TRACE_CACHE_TIMEOUT = 300
+# events returned per trace ("truncated" is set beyond it)
+AUDIT_LOG_TRACE_MAX_EVENTS = 1000
+
+
+# =========================
+# History
+# =========================
+
+# audit_log.history.state_at(): one full-state checkpoint per this many
+# events of an object (bounds the deltas replayed per reconstruction)
+AUDIT_LOG_CHECKPOINT_INTERVAL = 100
+
+
+# =========================
+# Integrity
+# =========================
+
+# Rows per AuditLogBlock (one Merkle root each)
+AUDIT_LOG_INTEGRITY_BLOCK_SIZE = 1000
+
+# Ids are sealed once a seal run saw them at least this long ago (lets
+# in-flight transactions with lower ids commit first), i.e. a run seals
+# what an earlier run saw
+AUDIT_LOG_INTEGRITY_SETTLE_SECONDS = 60
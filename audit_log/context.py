@@ -1,14 +1,22 @@
 from contextlib import contextmanager
-from threading import local
 from contextvars import ContextVar
 from typing import Optional
 
+from django.utils.functional import LazyObject, empty
+
 # -----------------------------------------
-# 🧠 Internal thread / async context state
+# 🧠 Context state (ContextVar: per thread *and* per asyncio task)
 # -----------------------------------------
-_state = local()
+# Every value lives in the caller's context: concurrent requests on one
+# event loop never see each other's user, and sync_to_async() carries
+# the context into the worker thread running ORM code.
+
+_current_user: ContextVar = ContextVar("audit_log_user", default=None)
+
+_current_request: ContextVar = ContextVar("audit_log_request", default=None)
+
+_audit_disabled: ContextVar[bool] = ContextVar("audit_log_disabled", default=False)
 
-# Async + thread-safe correlation id
 _correlation_id: ContextVar[Optional[str]] = ContextVar(
     "correlation_id",
     default=None,
@@ -18,23 +26,139 @@ _correlation_id: ContextVar[Optional[str]] = ContextVar(
 # 👤 user / request
 # -----------------------------------------
 def set_current_user(user):
-    """Store the currently authenticated user in thread-local state."""
-    _state.user = user
+    """Store the currently authenticated user in the current context."""
+    _current_user.set(user)
 
 
 def get_current_user():
-    """Return the current user if available, else None."""
-    return getattr(_state, "user", None)
+    """
+    Return the current user if available, else None.
+
+    Falls back to request.user, so a user set later by DRF authentication
+    (JWT / Basic) is seen. Touching the result evaluates a lazy user.
+    """
+    user = _current_user.get()
+    if user is None:
+        user = getattr(_current_request.get(), "user", None)
+    return user
+
+
+SESSION_USER_CACHE_PREFIX = "audit_log:session_user"
+
+
+def _session_user_cache_key(user_id) -> str:
+    return f"{SESSION_USER_CACHE_PREFIX}:{user_id}"
+
+
+def _session_auth(request):
+    # (raw user id, session auth hash) of a session login, else None
+    from django.conf import settings
+    from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+
+    session = getattr(request, "session", None)
+    if session is None:
+        return None
+    try:
+        raw_id = session[SESSION_KEY]
+        backend = session[BACKEND_SESSION_KEY]
+        session_hash = session[HASH_SESSION_KEY]
+    except KeyError:
+        return None
+    if backend not in settings.AUTHENTICATION_BACKENDS or not session_hash:
+        return None
+    return raw_id, session_hash
+
+
+def _verified_session_user_id(request):
+    """
+    The session's user id, if a request of the last
+    SESSION_USER_CACHE_TIMEOUT seconds verified the same session hash.
+    """
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.utils.crypto import constant_time_compare
+
+    auth = _session_auth(request)
+    if auth is None:
+        return None
+    raw_id, session_hash = auth
+    verified = cache.get(_session_user_cache_key(raw_id))
+    if verified is None or not constant_time_compare(verified, session_hash):
+        return None
+    try:
+        user_id = get_user_model()._meta.pk.to_python(raw_id)
+    except Exception:
+        return None
+    # one cache lookup per request, however many rows it writes
+    request._audit_log_user_id = user_id
+    return user_id
+
+
+def _remember_session_user(request, user):
+    # request.user was loaded (and checked) by get_user(): remember its hash
+    from django.core.cache import cache
+
+    from audit_log.conf import get_setting
+
+    auth = _session_auth(request)
+    if auth is None or str(auth[0]) != str(user.pk):
+        return
+    if auth[1] != user.get_session_auth_hash():
+        return
+    cache.set(
+        _session_user_cache_key(user.pk),
+        auth[1],
+        get_setting("SESSION_USER_CACHE_TIMEOUT"),
+    )
+
+
+def forget_session_user(user_id):
+    """Drop the verified session hash of a user (saved / deleted)."""
+    from django.core.cache import cache
+
+    cache.delete(_session_user_cache_key(user_id))
+
+
+def get_current_user_id():
+    """
+    Return the current user's id (None when anonymous).
+
+    An unevaluated request.user is not loaded when the session's auth
+    hash matches one verified by an earlier request (cached for
+    SESSION_USER_CACHE_TIMEOUT, dropped when the user is saved or
+    deleted). Otherwise the id comes from request.user, i.e.
+    django.contrib.auth.get_user(): the session hash, is_active and the
+    user's existence are checked, and the result is remembered.
+    """
+    user = _current_user.get()
+    request = None
+    if user is None:
+        request = _current_request.get()
+        user = getattr(request, "user", None)
+        if isinstance(user, LazyObject) and user._wrapped is empty:
+            user_id = getattr(request, "_audit_log_user_id", None)
+            if user_id is None:
+                user_id = _verified_session_user_id(request)
+            if user_id is not None:
+                return user_id
+        else:
+            request = None
+
+    if not getattr(user, "is_authenticated", False):
+        return None
+    if request is not None:
+        _remember_session_user(request, user)
+    return user.pk
 
 
 def set_current_request(request):
-    """Store the current HTTP request in thread-local state."""
-    _state.request = request
+    """Store the current HTTP request in the current context."""
+    _current_request.set(request)
 
 
 def get_current_request():
     """Return the current HTTP request if available, else None."""
-    return getattr(_state, "request", None)
+    return _current_request.get()
 
 
 def clear_context():
@@ -42,15 +166,30 @@ def clear_context():
     Clear all stored context safely.
     This is critical for test isolation and migrations.
     """
-    for attr in ("user", "request", "audit_disabled"):
-        if hasattr(_state, attr):
-            delattr(_state, attr)
+    _current_user.set(None)
+    _current_request.set(None)
+    _audit_disabled.set(False)
+    _correlation_id.set(None)
+
 
-    # Reset correlation id safely
+@contextmanager
+def request_context(*, user=None, request=None, correlation_id: Optional[str] = None):
+    """
+    Bind user, request and correlation id for one request.
+
+    Restores the previous values on exit (instead of clearing them), so
+    nested use and an outer audit_logging_disabled() are left intact.
+    """
+    tokens = [
+        (_current_user, _current_user.set(user)),
+        (_current_request, _current_request.set(request)),
+        (_correlation_id, _correlation_id.set(correlation_id)),
+    ]
     try:
-        _correlation_id.set(None)
-    except LookupError:
-        pass
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
 
 
 # -----------------------------------------
@@ -58,17 +197,17 @@ def clear_context():
 # -----------------------------------------
 def is_audit_logging_disabled() -> bool:
     """Check whether audit log recording is temporarily disabled."""
-    return getattr(_state, "audit_disabled", False)
+    return _audit_disabled.get()
 
 
 def disable_audit_logging():
     """Temporarily disable audit log recording."""
-    _state.audit_disabled = True
+    _audit_disabled.set(True)
 
 
 def enable_audit_logging():
     """Re-enable audit log recording."""
-    _state.audit_disabled = False
+    _audit_disabled.set(False)
 
 
 @contextmanager
@@ -77,12 +216,11 @@ def audit_logging_disabled():
     Context manager for safely disabling audit logging.
     Always restores previous state.
     """
-    previous = is_audit_logging_disabled()
-    _state.audit_disabled = True
+    token = _audit_disabled.set(True)
     try:
         yield
     finally:
-        _state.audit_disabled = previous
+        _audit_disabled.reset(token)
 
 
 # -----------------------------------------
@@ -0,0 +1,207 @@
+# audit_log/counts.py
+
+"""
+Row counts for the audit table that do not scan it.
+
+estimate_count() answers, in order of preference:
+
+1. exact, when the result has at most ADMIN_EXACT_COUNT_THRESHOLD rows
+   (a COUNT over a LIMITed subquery stops early);
+2. planner statistics: table stats for an unfiltered queryset,
+   EXPLAIN row estimates for a filtered one (PostgreSQL);
+3. the hourly rollup (AuditLogHourlyStat) when the filters map onto it;
+4. an exact COUNT(*) cached for ADMIN_COUNT_CACHE_TIMEOUT seconds.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Optional, Tuple
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.functional import cached_property
+
+from audit_log.conf import get_setting
+from audit_log.models import AuditLogHourlyStat
+from audit_log.partitions import PARENT_TABLE
+
+CACHE_PREFIX = "audit_log:count"
+
+# admin changelist parameters that do not filter rows
+_NON_FILTER_PARAMS = {"o", "p", "all", "_facets", "_popup", "_to_field", "_changelist_filters"}
+
+
+# -----------------------------------------
+# 📊 planner statistics
+# -----------------------------------------
+def _table_estimate(using: str) -> Optional[int]:
+    """Row estimate of the whole audit table (partitions included)."""
+    connection = connections[using]
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT SUM(GREATEST(c.reltuples, 0)), MAX(c.reltuples) FROM pg_class c "
+                "WHERE c.oid = %s::regclass OR c.oid IN "
+                "(SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass)",
+                [PARENT_TABLE, PARENT_TABLE],
+            )
+            total, highest = cursor.fetchone()
+            # reltuples < 0: never analyzed (a partitioned parent is -1 by design)
+            if highest is None or highest < 0:
+                return None
+            return int(total)
+
+        if connection.vendor == "sqlite":
+            if "sqlite_stat1" not in connection.introspection.table_names(cursor):
+                return None
+            # first number of an index's stat is the table's row count
+            cursor.execute(
+                "SELECT tbl, MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 "
+                "WHERE tbl = %s GROUP BY tbl",
+                [PARENT_TABLE],
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return None
+            return sum(count or 0 for _table, count in rows)
+
+    return None
+
+
+def _explain_estimate(queryset) -> Optional[int]:
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+# -----------------------------------------
+# 🧮 rollup
+# -----------------------------------------
+def _parse_bound(value: str) -> Optional[datetime]:
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            return None
+        parsed = datetime(day.year, day.month, day.day)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed.astimezone(dt_timezone.utc)
+
+
+def rollup_filters(params) -> Optional[Dict]:
+    """
+    AuditLogHourlyStat filters equivalent to admin changelist params,
+    or None when a filter has no exact rollup equivalent (search,
+    source, bounds inside an hour, ...).
+    """
+    filters = {}
+
+    for key, value in params.items():
+        if key in _NON_FILTER_PARAMS:
+            continue
+
+        if key in ("action", "action__exact", "status", "status__exact"):
+            filters[key.split("__")[0]] = value
+
+        elif key in ("timestamp__gte", "timestamp__lt"):
+            bound = _parse_bound(value)
+            if bound is None or bound.minute or bound.second or bound.microsecond:
+                return None
+            filters[key.replace("timestamp", "hour")] = bound
+
+        else:
+            return None
+
+    return filters
+
+
+def _rollup_estimate(filters: Dict, using: str) -> Optional[int]:
+    if not get_setting("HOURLY_STATS"):
+        return None
+
+    stats = AuditLogHourlyStat.objects.using(using).filter(**filters)
+    return stats.aggregate(total=Sum("count"))["total"] or 0
+
+
+# -----------------------------------------
+# 🔢 main
+# -----------------------------------------
+def _cached_count(queryset) -> int:
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha1(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+    return cache.get_or_set(
+        f"{CACHE_PREFIX}:{digest}",
+        queryset.count,
+        get_setting("ADMIN_COUNT_CACHE_TIMEOUT"),
+    )
+
+
+def estimate_count(queryset, rollup: Optional[Dict] = None) -> Tuple[int, bool]:
+    """
+    (count, exact) for an AuditLog queryset.
+
+    rollup: the queryset's filters expressed on AuditLogHourlyStat
+    (see rollup_filters), if they can be.
+    """
+    threshold = get_setting("ADMIN_EXACT_COUNT_THRESHOLD")
+    unordered = queryset.order_by()
+
+    bounded = unordered[:threshold + 1].count()
+    if bounded <= threshold:
+        return bounded, True
+
+    if not queryset.query.where:
+        estimate = _table_estimate(queryset.db)
+    else:
+        estimate = _explain_estimate(queryset)
+
+    if estimate is None and rollup is not None:
+        estimate = _rollup_estimate(rollup, queryset.db)
+
+    if estimate is None:
+        return _cached_count(queryset), False
+
+    # stale statistics must not claim fewer rows than we just saw
+    return max(estimate, bounded), False
+
+
+def estimate_before(queryset, cutoff: datetime) -> Optional[int]:
+    """
+    Rows of queryset older than cutoff, never counted: the hourly rollup
+    (the hour holding cutoff included), else the planner's estimate.
+    None when neither is available.
+    """
+    estimate = _rollup_estimate({"hour__lt": cutoff}, queryset.db)
+    if estimate is None:
+        estimate = _explain_estimate(queryset.filter(timestamp__lt=cutoff))
+    return estimate
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose count comes from estimate_count()."""
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, rollup=None):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.rollup = rollup
+        self.exact = True
+
+    @cached_property
+    def count(self):
+        count, self.exact = estimate_count(self.object_list, rollup=self.rollup)
+        return count
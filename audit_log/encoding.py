@@ -0,0 +1,260 @@
+# audit_log/encoding.py
+
+import base64
+import math
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+# rough JSON cost of one [start, end] pair, used to pick an encoding
+_RANGE_COST = 16
+
+
+class IdSetEncoder:
+    """
+    Streaming encoder for the set of primary keys touched by a bulk statement.
+
+    Feed ids in ascending order with add(); memory grows with the number
+    of contiguous runs, not with the number of ids. The result is either
+    a list of [start, end] ranges or a base64 bitmap, whichever is smaller.
+    Non-integer keys fall back to a plain list.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._ranges: List[List[int]] = []
+        self._plain: Optional[list] = None
+
+    def add(self, pk) -> None:
+        self.count += 1
+
+        if self._plain is not None:
+            self._plain.append(pk)
+            return
+
+        if not isinstance(pk, int) or isinstance(pk, bool):
+            # UUID / string keys: nothing to compress
+            self._plain = [
+                value
+                for start, end in self._ranges
+                for value in range(start, end + 1)
+            ]
+            self._plain.append(str(pk))
+            self._ranges = []
+            return
+
+        if self._ranges and pk == self._ranges[-1][1] + 1:
+            self._ranges[-1][1] = pk
+        elif self._ranges and pk <= self._ranges[-1][1]:
+            raise ValueError("ids must be added in ascending order")
+        else:
+            self._ranges.append([pk, pk])
+
+    def extend(self, pks: Iterable) -> "IdSetEncoder":
+        for pk in pks:
+            self.add(pk)
+        return self
+
+    def result(self) -> dict:
+        if self._plain is not None:
+            return {"encoding": "list", "count": self.count, "ids": [str(v) for v in self._plain]}
+
+        if not self._ranges:
+            return {"encoding": "ranges", "count": 0, "ranges": []}
+
+        base = self._ranges[0][0]
+        span = self._ranges[-1][1] - base + 1
+        bitmap_cost = math.ceil(span / 8) * 4 / 3
+
+        if bitmap_cost < len(self._ranges) * _RANGE_COST:
+            return {
+                "encoding": "bitmap",
+                "count": self.count,
+                "base": base,
+                "bitmap": _ranges_to_bitmap(self._ranges, base, span),
+            }
+
+        return {"encoding": "ranges", "count": self.count, "ranges": self._ranges}
+
+
+def encode_ids(pks: Iterable) -> dict:
+    """Encode ascending primary keys (see IdSetEncoder)."""
+    return IdSetEncoder().extend(pks).result()
+
+
+def decode_ids(encoded: dict) -> Iterator:
+    """Lazily yield the ids of an encode_ids() payload in ascending order."""
+    encoding = encoded.get("encoding")
+
+    if encoding == "ranges":
+        for start, end in encoded["ranges"]:
+            yield from range(start, end + 1)
+
+    elif encoding == "bitmap":
+        base = encoded["base"]
+        bitmap = base64.b64decode(encoded["bitmap"])
+        for byte_index, byte in enumerate(bitmap):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield base + byte_index * 8 + bit
+
+    elif encoding == "list":
+        yield from encoded["ids"]
+
+    else:
+        raise ValueError(f"Unknown id encoding: {encoding!r}")
+
+
+def _ranges_to_bitmap(ranges, base: int, span: int) -> str:
+    bitmap = bytearray(math.ceil(span / 8))
+    for start, end in ranges:
+        for value in range(start - base, end - base + 1):
+            bitmap[value >> 3] |= 1 << (value & 7)
+    return base64.b64encode(bytes(bitmap)).decode("ascii")
+
+
+# =========================
+# Columnar bulk snapshots
+# =========================
+
+class ColumnarEncoder:
+    """
+    Streaming columnar encoder for bulk before/after snapshots.
+
+    Rows are fed in ascending pk order. Ids go through IdSetEncoder and
+    each column is kept as parallel run-length encoded [value, run]
+    pairs, so memory and payload size scale with the number of value
+    changes, not with the number of rows.
+    """
+
+    def __init__(self, fields: Iterable[str]):
+        self.fields = tuple(fields)
+        self.ids = IdSetEncoder()
+        self._runs = {name: [] for name in self.fields}
+
+    @property
+    def count(self) -> int:
+        return self.ids.count
+
+    def add(self, pk, values) -> None:
+        self.ids.add(pk)
+
+        for name, value in zip(self.fields, values):
+            runs = self._runs[name]
+            if runs and runs[-1][0] == value:
+                runs[-1][1] += 1
+            else:
+                runs.append([value, 1])
+
+    def columns(self) -> dict:
+        return self._runs
+
+
+def expand_runs(runs) -> Iterator:
+    """Yield the values of a run-length encoded column."""
+    for value, run in runs:
+        for _ in range(run):
+            yield value
+
+
+def is_columnar(changes) -> bool:
+    return (
+        isinstance(changes, dict)
+        and changes.get("format") == "columnar"
+        and isinstance(changes.get("ids"), dict)
+    )
+
+
+def decode_rows(changes: dict, offset: int = 0, limit: Optional[int] = None) -> Iterator[dict]:
+    """
+    Lazily yield {"id": ..., <field>: <before>} rows of a columnar payload.
+
+    Memory stays flat: ids and runs are expanded as they are consumed, so
+    reading one page of a 100k-row event never builds the whole list.
+    """
+    before = changes.get("before") or {}
+    columns = {name: expand_runs(runs) for name, runs in before.items()}
+    rows = (
+        {"id": pk, **{name: next(values) for name, values in columns.items()}}
+        for pk in decode_ids(changes["ids"])
+    )
+    stop = None if limit is None else offset + limit
+    return islice(rows, offset, stop)
+
+
+def find_row(changes: dict, pk) -> Optional[dict]:
+    """
+    The decoded row of pk in a columnar payload, or None if the bulk
+    statement did not touch it. Ranges and bitmaps reject a pk without
+    expanding anything; a hit is decoded lazily up to its row.
+    """
+    ids = changes["ids"]
+    encoding = ids.get("encoding")
+
+    if encoding in ("ranges", "bitmap"):
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return None
+        if encoding == "ranges":
+            if not any(start <= pk <= end for start, end in ids["ranges"]):
+                return None
+        else:
+            offset = pk - ids["base"]
+            bitmap = base64.b64decode(ids["bitmap"])
+            if not 0 <= offset < len(bitmap) * 8 or not bitmap[offset >> 3] & (1 << (offset & 7)):
+                return None
+    else:
+        pk = str(pk)
+
+    return next((row for row in decode_rows(changes) if row["id"] == pk), None)
+
+
+def summarize_changes(changes, preview: int = 0):
+    """
+    Columnar payloads without their ids / before columns (count, after,
+    soft), plus the first `preview` decoded rows; others unchanged.
+    """
+    if not is_columnar(changes):
+        return changes
+
+    summary = {
+        name: value
+        for name, value in changes.items()
+        if name not in ("format", "ids", "before")
+    }
+    if preview:
+        summary["rows"] = list(decode_rows(changes, limit=preview))
+    return summary
+
+
+def decode_changes(changes):
+    """
+    Expand compact bulk payloads back to their plain form (tests, tools;
+    builds every row, so reads use decode_rows() / summarize_changes()):
+
+    - "ids" encode_ids() payload → list of ids
+    - columnar "before" → list of {"id": ..., <field>: ...} rows
+
+    Anything else is returned unchanged.
+    """
+    if not isinstance(changes, dict):
+        return changes
+
+    ids = changes.get("ids")
+    if not (isinstance(ids, dict) and "encoding" in ids):
+        return changes
+
+    decoded = dict(changes)
+    decoded["ids"] = list(decode_ids(ids))
+
+    if decoded.pop("format", None) == "columnar":
+        before = changes.get("before") or {}
+        columns = {name: expand_runs(runs) for name, runs in before.items()}
+        decoded["before"] = [
+            {"id": pk, **{name: next(values) for name, values in columns.items()}}
+            for pk in decoded["ids"]
+        ]
+
+    return decoded
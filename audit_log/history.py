@@ -0,0 +1,346 @@
+# audit_log/history.py
+
+"""
+Point-in-time state of audited objects, rebuilt from AuditLog.changes.
+
+Field diffs ({field: {"before": ..., "after": ...}}) are replayed from
+the nearest AuditLogCheckpoint: forwards ("after" values) from the last
+checkpoint at or before the requested time, or backwards ("before"
+values) from the first one after it. Without checkpoints the object's
+current row is the starting point, or for a hard-deleted object the
+full "before" snapshot its removal event recorded (removal_changes()).
+
+Checkpoints are laid down every AUDIT_LOG_CHECKPOINT_INTERVAL events by
+extend_checkpoints(), which the checkpoint_audit_history command runs
+for all busy objects, so a reconstruction replays at most about
+INTERVAL deltas. Neither the save path nor state_at() writes them.
+
+Bulk statements (QuerySet.audited()) are logged as one columnar event
+without object_id; the ones that touched an object are replayed with
+its own events (object_event()). A column set by an expression
+(F("stock") + 1) has no recorded "after": forward replay cannot pass
+it and the state is unwound backwards from a later state instead.
+UPDATEs that bypass audited() leave no event and cannot be replayed.
+"""
+
+import heapq
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from audit_log.conf import get_setting
+from audit_log.encoding import find_row, is_columnar
+from audit_log.models import AuditLog, AuditLogCheckpoint
+from audit_log.registry import content_type_id_for, registry, to_json_value
+
+State = Optional[dict]
+
+BULK_ACTIONS = ("bulk_update", "bulk_delete")
+
+# "after" of a bulk column set by an expression
+COMPUTED = object()
+
+
+class ComputedValue(Exception):
+    """Forward replay reached a value only an expression knew."""
+
+
+# -----------------------------------------
+# 🧩 events
+# -----------------------------------------
+def field_changes(changes) -> dict:
+    """Only the per-field diffs of AuditLog.changes (skips flags like soft)."""
+    if not isinstance(changes, dict):
+        return {}
+    return {
+        name: diff
+        for name, diff in changes.items()
+        if isinstance(diff, dict) and "before" in diff and "after" in diff
+    }
+
+
+def removes_object(event) -> bool:
+    if event.action == "hard_delete":
+        return True
+    return event.action == "delete" and not (event.changes or {}).get("soft")
+
+
+def apply_forward(state: State, event) -> State:
+    """State right after event, from the state right before it."""
+    if removes_object(event):
+        return None
+    state = dict(state or {})
+    for name, diff in field_changes(event.changes).items():
+        if diff["after"] is COMPUTED:
+            raise ComputedValue(name)
+        state[name] = diff["after"]
+    return state
+
+
+def apply_backward(state: State, event) -> State:
+    """State right before event, from the state right after it."""
+    if event.action == "create":
+        return None
+    if state is None:
+        # only a removal snapshot brings a deleted object back
+        if not removes_object(event) or not field_changes(event.changes):
+            return None
+        state = {}
+    state = dict(state)
+    for name, diff in field_changes(event.changes).items():
+        state[name] = diff["before"]
+    return state
+
+
+def _after(timestamp: datetime, event_id: int) -> Q:
+    return Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=event_id)
+
+
+def _events(content_type_id: int, object_id: str, using: str):
+    return AuditLog.objects.using(using).filter(
+        content_type_id=content_type_id,
+        object_id=object_id,
+    )
+
+
+def object_event(event, object_id: str) -> Optional[AuditLog]:
+    """
+    The part of a columnar bulk event that touched object_id, as a plain
+    (unsaved) event of that object; None if the statement missed it.
+    """
+    changes = event.changes
+    if not is_columnar(changes):
+        return None
+    row = find_row(changes, object_id)
+    if row is None:
+        return None
+
+    after = changes.get("after") or {}
+    computed = set(changes.get("computed") or ())
+    soft = changes.get("soft")
+
+    diffs = {}
+    for name, before in row.items():
+        if name == "id":
+            continue
+        if soft is False:
+            value = None
+        elif name in computed:
+            value = COMPUTED
+        else:
+            value = after.get(name)
+        diffs[name] = {"before": before, "after": value}
+
+    if soft is False:
+        action = "hard_delete"
+    elif soft:
+        action = "delete"
+        diffs["soft"] = True
+    else:
+        action = "update"
+
+    return AuditLog(
+        id=event.id,
+        timestamp=event.timestamp,
+        action=action,
+        content_type_id=event.content_type_id,
+        object_id=object_id,
+        changes=diffs,
+    )
+
+
+def _history(
+    content_type_id: int,
+    object_id: str,
+    using: str,
+    q: Q = Q(),
+    newest_first: bool = False,
+) -> Iterator[AuditLog]:
+    """An object's events matching q plus the bulk events that touched it, in order."""
+    order = ("-timestamp", "-id") if newest_first else ("timestamp", "id")
+    own = _events(content_type_id, object_id, using).filter(q).order_by(*order)
+    bulk = (
+        AuditLog.objects.using(using)
+        .filter(q, content_type_id=content_type_id, object_id__isnull=True, action__in=BULK_ACTIONS)
+        .order_by(*order)
+    )
+    touched = (object_event(event, object_id) for event in bulk.iterator(chunk_size=2000))
+    return heapq.merge(
+        own.iterator(chunk_size=2000),
+        (event for event in touched if event is not None),
+        key=lambda event: (event.timestamp, event.id),
+        reverse=newest_first,
+    )
+
+
+def _checkpoints(content_type_id: int, object_id: str, using: str):
+    return AuditLogCheckpoint.objects.using(using).filter(
+        content_type_id=content_type_id,
+        object_id=object_id,
+    )
+
+
+# -----------------------------------------
+# 📸 states
+# -----------------------------------------
+def snapshot(instance) -> dict:
+    """JSON-safe tracked field values of a live instance."""
+    meta = registry.get(type(instance))
+    if meta is not None:
+        fields = meta.tracked_fields
+    else:
+        fields = [f for f in instance._meta.concrete_fields if not f.primary_key]
+    return {
+        field.name: to_json_value(getattr(instance, field.attname), field) for field in fields
+    }
+
+
+def removal_changes(instance) -> dict:
+    """Diff for a removal event: every tracked field, before → None."""
+    return {name: {"before": value, "after": None} for name, value in snapshot(instance).items()}
+
+
+def current_state(content_type_id: int, object_id: str, using: str = "default") -> State:
+    model = ContentType.objects.db_manager(using).get_for_id(content_type_id).model_class()
+    if model is None:
+        return None
+    # base manager: soft-deleted rows are still the object's current state
+    instance = model._base_manager.using(using).filter(pk=object_id).first()
+    return snapshot(instance) if instance is not None else None
+
+
+def _resolve(target, object_id) -> Tuple[int, str]:
+    if isinstance(target, models.Model):
+        return content_type_id_for(type(target)), str(target.pk)
+    if object_id is None:
+        raise TypeError("object_id is required with a content type id")
+    return int(target), str(object_id)
+
+
+# -----------------------------------------
+# 🕰️ reconstruction
+# -----------------------------------------
+def state_at(
+    target,
+    object_id=None,
+    timestamp: Optional[datetime] = None,
+    *,
+    using: str = "default",
+) -> State:
+    """
+    Field values of an object as of timestamp (default: now).
+
+    target is a model instance, or a content type id with object_id.
+    Returns None if the object did not exist (or no longer existed)
+    at that time.
+    """
+    content_type_id, object_id = _resolve(target, object_id)
+    timestamp = timestamp or timezone.now()
+    checkpoints = _checkpoints(content_type_id, object_id, using)
+
+    before = checkpoints.filter(timestamp__lte=timestamp).order_by("-timestamp", "-audit_log_id").first()
+    if before is not None:
+        deltas = _history(
+            content_type_id,
+            object_id,
+            using,
+            _after(before.timestamp, before.audit_log_id) & Q(timestamp__lte=timestamp),
+        )
+        try:
+            state = before.state
+            for event in deltas:
+                state = apply_forward(state, event)
+            return state
+        except ComputedValue:
+            pass  # unwind from the next known state instead
+
+    after = checkpoints.filter(timestamp__gt=timestamp).order_by("timestamp", "audit_log_id").first()
+    later = Q(timestamp__gt=timestamp)
+    if after is not None:
+        state = after.state
+        later &= ~_after(after.timestamp, after.audit_log_id)
+    else:
+        state = current_state(content_type_id, object_id, using)
+
+    for event in _history(content_type_id, object_id, using, later, newest_first=True):
+        state = apply_backward(state, event)
+
+    return state
+
+
+# -----------------------------------------
+# 📍 checkpoints
+# -----------------------------------------
+def _checkpoint(content_type_id, object_id, event, state) -> AuditLogCheckpoint:
+    return AuditLogCheckpoint(
+        content_type_id=content_type_id,
+        object_id=object_id,
+        audit_log_id=event.id,
+        timestamp=event.timestamp,
+        state=state,
+    )
+
+
+def _every(events: Iterable, interval: int, step, state: State) -> Iterable:
+    """(event, state) for every interval-th event while stepping state."""
+    for position, event in enumerate(events, 1):
+        state = step(state, event)
+        if position % interval == 0 and state is not None:
+            yield event, state
+
+
+def extend_checkpoints(target, object_id=None, *, using: str = "default") -> int:
+    """
+    Add the checkpoints an object is missing. Returns how many.
+
+    With checkpoints: forward from the newest one, one per INTERVAL
+    later events. Without: backward from the current row (or the
+    snapshot of a hard delete), one at the newest event the object
+    existed after and one per INTERVAL events before it. A computed bulk
+    value on the way forward also takes the backward route.
+    """
+    content_type_id, object_id = _resolve(target, object_id)
+    interval = get_setting("CHECKPOINT_INTERVAL")
+    newest = _checkpoints(content_type_id, object_id, using).order_by("-timestamp", "-audit_log_id").first()
+
+    created: List[AuditLogCheckpoint] = []
+
+    if newest is not None:
+        later = _history(
+            content_type_id, object_id, using, _after(newest.timestamp, newest.audit_log_id)
+        )
+        try:
+            for event, state in _every(later, interval, apply_forward, newest.state):
+                created.append(_checkpoint(content_type_id, object_id, event, state))
+        except ComputedValue:
+            # an expression's result: rebuild backward from the current row
+            created, newest = [], None
+
+    if newest is None:
+        state = current_state(content_type_id, object_id, using)
+        history = _history(content_type_id, object_id, using, newest_first=True)
+        head = next(history, None)
+        if state is None and head is not None:
+            # hard-deleted: its removal event holds the state before it
+            state = apply_backward(None, head)
+            head = next(history, None)
+        if state is None or head is None:
+            return 0
+
+        # state after event k (newest first) = state after k-1, unwound through k-1
+        created.append(_checkpoint(content_type_id, object_id, head, state))
+        previous = head
+        for position, event in enumerate(history, 1):
+            state = apply_backward(state, previous)
+            if state is None:
+                break
+            if position % interval == 0:
+                created.append(_checkpoint(content_type_id, object_id, event, state))
+            previous = event
+
+    AuditLogCheckpoint.objects.using(using).bulk_create(created, ignore_conflicts=True)
+    return len(created)
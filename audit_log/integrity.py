@@ -0,0 +1,289 @@
+# audit_log/integrity.py
+
+"""
+Tamper evidence for the audit table (AuditLogBlock).
+
+Rows are never hashed on insert. seal_blocks() later takes the next
+AUDIT_LOG_INTEGRITY_BLOCK_SIZE rows by id, computes one Merkle root over
+them and chains it to the previous block's hash. Inserts stay
+independent of each other; hashing is batched and runs off the request
+path (seal_audit_log_blocks command).
+
+Ids are handed out at INSERT but become visible at COMMIT, so a slow
+transaction can commit a lower id after higher ones (its row timestamp
+says nothing about that). Every seal run records the highest id it sees
+(AuditLogIdMark) and seals no further than the newest mark that is
+AUDIT_LOG_INTEGRITY_SETTLE_SECONDS old: only a transaction running
+longer than that can still add a row to a sealed range. The first run
+only records its mark.
+
+verify_blocks() recomputes every root and the chain. Merkle roots are
+independent per block, so verify_audit_integrity hashes blocks in a
+process pool; the chain check is a cheap sequential pass over the roots.
+A block that retention may have partly purged is checked row by row
+against its sealed leaf list instead: every remaining row must be
+sealed, and only rows older than the cutoff may be missing.
+
+User and content type are hashed as written (user_ref,
+content_type_ref): the FK columns are SET_NULL when their target is
+deleted, which must not read as tampering.
+
+Anyone with write access to both tables can rewrite them consistently:
+keep the printed head chain hash somewhere else to anchor it.
+"""
+
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from audit_log.conf import get_setting
+from audit_log.merkle import (
+    GENESIS,
+    leaf_hash,
+    merkle_root,
+    pack_leaves,
+    plain,
+    root_of_leaves,
+    to_micros,
+    unpack_leaves,
+)
+from audit_log.models import AuditLog, AuditLogBlock, AuditLogIdMark
+from audit_log.utils import get_retention_cutoff
+
+# every column an attacker could want to change; order is part of the hash
+HASHED_FIELDS = (
+    "id",
+    "timestamp",
+    "user_ref",
+    "action",
+    "resource",
+    "status",
+    "description",
+    "source",
+    "correlation_id",
+    "content_type_ref",
+    "object_id",
+    "changes",
+)
+
+_TIMESTAMP = HASHED_FIELDS.index("timestamp")
+
+
+# -----------------------------------------
+# #️⃣ hashing
+# -----------------------------------------
+def chain_hash(previous: str, block) -> str:
+    header = ":".join(str(part) for part in (
+        previous,
+        block.number,
+        block.first_id,
+        block.last_id,
+        block.row_count,
+        plain(block.min_timestamp),
+        plain(block.max_timestamp),
+        block.merkle_root,
+    ))
+    return hashlib.sha256(header.encode()).hexdigest()
+
+
+# -----------------------------------------
+# 🔒 sealing
+# -----------------------------------------
+def _rows(first_id: int, last_id: Optional[int], using: str, limit: Optional[int] = None) -> List[tuple]:
+    qs = AuditLog.objects.using(using).filter(id__gte=first_id)
+    if last_id is not None:
+        qs = qs.filter(id__lte=last_id)
+    qs = qs.order_by("id").values_list(*HASHED_FIELDS)
+    return list(qs[:limit] if limit else qs)
+
+
+def observe_ids(using: str = "default", at: Optional[datetime] = None) -> AuditLogIdMark:
+    """Record the highest audit row id visible now."""
+    newest = AuditLog.objects.using(using).order_by("-id").values_list("id", flat=True).first()
+    return AuditLogIdMark.objects.using(using).create(
+        max_id=newest or 0,
+        observed_at=at or timezone.now(),
+    )
+
+
+def settled_id(using: str = "default") -> Optional[int]:
+    """
+    Highest id no transaction shorter than the settle time can still
+    commit below; None until a mark is that old. Records a new mark.
+    """
+    marks = AuditLogIdMark.objects.using(using)
+    observe_ids(using)
+
+    settled = timezone.now() - timedelta(seconds=get_setting("INTEGRITY_SETTLE_SECONDS"))
+    mark = marks.filter(observed_at__lte=settled).order_by("-observed_at").first()
+    if mark is None:
+        return None
+    marks.filter(observed_at__lt=mark.observed_at).delete()  # superseded
+    return mark.max_id
+
+
+def seal_blocks(using: str = "default", limit: Optional[int] = None) -> List[AuditLogBlock]:
+    """
+    Seal every complete block of unsealed rows (at most limit blocks).
+
+    Only ids up to settled_id() are sealed, so transactions still in
+    flight can commit their lower ids first.
+    """
+    size = get_setting("INTEGRITY_BLOCK_SIZE")
+    last_id = settled_id(using)
+    if last_id is None:
+        return []
+    blocks = AuditLogBlock.objects.using(using)
+
+    sealed = []
+    head = blocks.order_by("-number").first()
+
+    while limit is None or len(sealed) < limit:
+        rows = _rows((head.last_id + 1) if head else 0, last_id, using, limit=size)
+        if len(rows) < size:
+            break
+
+        timestamps = [row[_TIMESTAMP] for row in rows]
+
+        leaves = [leaf_hash(row) for row in rows]
+        block = AuditLogBlock(
+            number=head.number + 1 if head else 1,
+            first_id=rows[0][0],
+            last_id=rows[-1][0],
+            row_count=len(rows),
+            min_timestamp=min(timestamps),
+            max_timestamp=max(timestamps),
+            merkle_root=root_of_leaves(leaves),
+            leaves=pack_leaves(timestamps, leaves),
+        )
+        block.chain_hash = chain_hash(head.chain_hash if head else GENESIS, block)
+
+        try:
+            with transaction.atomic(using=using):
+                block.save(using=using)
+        except IntegrityError:
+            break  # another sealer took this number
+
+        sealed.append(block)
+        head = block
+
+    return sealed
+
+
+# -----------------------------------------
+# 🔍 verification
+# -----------------------------------------
+@dataclass
+class BlockFailure:
+    number: int
+    reason: str
+
+
+def _block_rows(blocks: Iterable[AuditLogBlock], using: str, cutoff: datetime) -> Iterator:
+    """(block, rows, partial); partial blocks may have lost rows to retention."""
+    for block in blocks:
+        partial = block.min_timestamp < cutoff
+        if partial and not block.leaves:
+            yield block, None, partial  # sealed without a leaf list: nothing to compare
+        else:
+            yield block, _rows(block.first_id, block.last_id, using), partial
+
+
+def _check_leaves(block: AuditLogBlock, rows: List[tuple], cutoff: datetime) -> Optional[str]:
+    sealed = unpack_leaves(block.leaves)
+    if len(sealed) != block.row_count or root_of_leaves([leaf for _, leaf in sealed]) != block.merkle_root:
+        return "sealed leaf list changed"
+
+    expected = {leaf for _, leaf in sealed}
+    present = set()
+    for row in rows:
+        leaf = leaf_hash(row)
+        if leaf not in expected:
+            return "row contents changed (not among the sealed rows)"
+        present.add(leaf)
+
+    limit = to_micros(cutoff)
+    missing = sum(1 for micros, leaf in sealed if leaf not in present and micros >= limit)
+    if missing:
+        return f"{missing} rows deleted before their retention cutoff"
+    return None
+
+
+def _check(
+    block: AuditLogBlock,
+    rows: Optional[List[tuple]],
+    partial: bool,
+    root: Optional[str],
+    cutoff: datetime,
+) -> Optional[str]:
+    if rows is None:
+        return None
+    if partial:
+        return _check_leaves(block, rows, cutoff)
+    if len(rows) != block.row_count:
+        return f"{len(rows)} rows in ids {block.first_id}–{block.last_id}, {block.row_count} sealed"
+    if root != block.merkle_root:
+        return "row contents changed (merkle root mismatch)"
+    return None
+
+
+def _roots(items, workers: int) -> Iterator:
+    """(block, rows, partial, root) with whole-block roots computed in a pool, in block order."""
+    if workers <= 1:
+        for block, rows, partial in items:
+            whole = rows is not None and not partial
+            yield block, rows, partial, merkle_root(rows) if whole else None
+        return
+
+    # spawn: workers must not inherit (and later close) our DB sockets;
+    # they only import audit_log.merkle, which needs no Django setup
+    window = workers * 2
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = []
+        for block, rows, partial in items:
+            whole = rows is not None and not partial
+            future = pool.submit(merkle_root, rows) if whole else None
+            pending.append((block, rows, partial, future))
+            if len(pending) >= window:
+                block, rows, partial, future = pending.pop(0)
+                yield block, rows, partial, future.result() if future else None
+        for block, rows, partial, future in pending:
+            yield block, rows, partial, future.result() if future else None
+
+
+def verify_blocks(
+    using: str = "default",
+    workers: int = 1,
+    start: int = 1,
+) -> Iterator[BlockFailure]:
+    """Yield one BlockFailure per block that no longer matches."""
+    blocks = AuditLogBlock.objects.using(using).filter(number__gte=start).order_by("number")
+    cutoff = get_retention_cutoff()
+
+    previous_block = (
+        AuditLogBlock.objects.using(using).filter(number=start - 1).first()
+        if start > 1 else None
+    )
+    previous = previous_block.chain_hash if previous_block else GENESIS
+    expected_number = start
+
+    items = _block_rows(blocks.iterator(chunk_size=100), using, cutoff)
+    for block, rows, partial, root in _roots(items, workers):
+        if block.number != expected_number:
+            yield BlockFailure(block.number, f"blocks {expected_number}–{block.number - 1} missing")
+        elif chain_hash(previous, block) != block.chain_hash:
+            yield BlockFailure(block.number, "chain hash mismatch (block header changed)")
+
+        reason = _check(block, rows, partial, root, cutoff)
+        if reason:
+            yield BlockFailure(block.number, reason)
+
+        previous = block.chain_hash
+        expected_number = block.number + 1
@@ -0,0 +1,66 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from audit_log.partitions import get_backend, partition_name, partitioning_enabled
+
+
+class Command(BaseCommand):
+    help = "Manage monthly audit log partitions (AUDIT_LOG_PARTITIONING)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "operation",
+            choices=("list", "setup", "create", "drop"),
+            help="list | setup (PostgreSQL conversion) | create | drop",
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=None,
+            help="setup / create: also create this many future months "
+                 "(default: AUDIT_LOG_PARTITION_MONTHS_AHEAD)",
+        )
+        parser.add_argument(
+            "--before",
+            help="drop: drop partitions that end on or before YYYY-MM-DD",
+        )
+        parser.add_argument(
+            "--database",
+            default="default",
+        )
+
+    def handle(self, *args, **options):
+        if not partitioning_enabled():
+            raise CommandError("AUDIT_LOG_PARTITIONING is disabled")
+
+        try:
+            backend = get_backend(options["database"])
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+        operation = options["operation"]
+
+        if operation == "setup":
+            backend.setup(months_ahead=options["ahead"])
+            self.stdout.write(self.style.SUCCESS("✅ Audit log table is partitioned"))
+
+        elif operation == "create":
+            for month in backend.ensure_upcoming(options["ahead"]):
+                self.stdout.write(f"📅 {partition_name(month)}")
+
+        elif operation == "drop":
+            before = parse_date(options["before"] or "")
+            if before is None:
+                raise CommandError("drop requires --before YYYY-MM-DD")
+
+            cutoff = datetime(before.year, before.month, before.day, tzinfo=dt_timezone.utc)
+            dropped = backend.drop_partitions_before(cutoff)
+            for month in dropped:
+                self.stdout.write(f"🗑 Dropped partition {month:%Y-%m}")
+            self.stdout.write(self.style.SUCCESS(f"✅ Dropped {len(dropped)} partitions"))
+
+        else:
+            for month in backend.list_partitions():
+                self.stdout.write(partition_name(month))
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from audit_log.models import AuditLog
+from audit_log.stats import hour_of, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild AuditLogHourlyStat from existing audit log history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="First day to rebuild (YYYY-MM-DD, default: oldest audit log)",
+        )
+        parser.add_argument(
+            "--until",
+            help="Rebuild up to this day, exclusive (YYYY-MM-DD, default: current hour)",
+        )
+        parser.add_argument("--database", default="default")
+
+    def _parse_day(self, value, option):
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"{option} must be YYYY-MM-DD")
+        return datetime(day.year, day.month, day.day, tzinfo=dt_timezone.utc)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+
+        if options["since"]:
+            since = self._parse_day(options["since"], "--since")
+        else:
+            oldest = (
+                AuditLog.objects.using(using)
+                .order_by("timestamp")
+                .values_list("timestamp", flat=True)
+                .first()
+            )
+            if oldest is None:
+                self.stdout.write(self.style.SUCCESS("✅ No audit logs to aggregate"))
+                return
+            since = hour_of(oldest)
+
+        # the current hour is still being counted incrementally: leave it alone
+        until = (
+            self._parse_day(options["until"], "--until")
+            if options["until"]
+            else hour_of(timezone.now())
+        )
+
+        if since >= until:
+            raise CommandError("Nothing to rebuild: --since must be before --until")
+
+        self.stdout.write(
+            f"📊 Rebuilding hourly stats {since:%Y-%m-%d %H:%M} → {until:%Y-%m-%d %H:%M}..."
+        )
+        buckets = rebuild(since, until, using=using)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Backfill completed. Wrote {buckets} hourly buckets.")
+        )
@@ -0,0 +1,206 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, models, transaction
+from django.utils import timezone
+
+from audit_log.models import AuditLog
+
+# index set before migration 0011: single-column db_index fields plus the
+# Meta duplicates of the same columns
+LEGACY_INDEXES = [
+    models.Index(fields=[field], name=f"bench_legacy_{i}")
+    for i, field in enumerate([
+        "action", "resource", "status", "source", "user", "content_type",
+        "action", "resource", "status", "source", "user", "timestamp",
+        "correlation_id",
+    ])
+] + [
+    models.Index(fields=["content_type", "object_id"], name="bench_legacy_object"),
+]
+
+ACTIONS = [choice for choice, _ in AuditLog.Action.choices]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large audit log table and compare query plans and latency of "
+        "the API access paths with the legacy and the composite index sets "
+        "(everything runs in one transaction that is rolled back)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=200_000)
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--objects", type=int, default=5_000)
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Runs per query; the median is reported",
+        )
+        parser.add_argument(
+            "--insert-rows",
+            type=int,
+            default=5_000,
+            help="Rows inserted per phase to measure write cost",
+        )
+        parser.add_argument("--database", default="default")
+
+    # -----------------------------------------
+    # 🌱 seed
+    # -----------------------------------------
+    def _seed(self, using, rows, users, objects):
+        User = get_user_model()
+        prefix = f"bench-{int(time.time())}"
+        User.objects.using(using).bulk_create([
+            User(username=f"{prefix}-{i}") for i in range(users)
+        ])
+        user_ids = list(
+            User.objects.using(using)
+            .filter(username__startswith=prefix)
+            .values_list("id", flat=True)
+        )
+        content_type_ids = list(
+            ContentType.objects.using(using).values_list("id", flat=True)[:10]
+        )
+
+        self.stdout.write(f"🌱 Seeding {rows:,} audit logs...")
+        for start in range(0, rows, 5_000):
+            AuditLog.objects.using(using).bulk_create(
+                self._rows(min(5_000, rows - start), user_ids, content_type_ids, objects),
+                batch_size=1_000,
+            )
+
+        return user_ids, content_type_ids
+
+    @staticmethod
+    def _rows(count, user_ids, content_type_ids, objects):
+        now = timezone.now()
+        return [
+            AuditLog(
+                user_id=random.choice(user_ids),
+                action=random.choice(ACTIONS),
+                resource="Product",
+                source="api",
+                content_type_id=random.choice(content_type_ids),
+                object_id=str(random.randrange(objects)),
+                timestamp=now - timedelta(seconds=random.randrange(180 * 86_400)),
+            )
+            for _ in range(count)
+        ]
+
+    # -----------------------------------------
+    # 📏 measure
+    # -----------------------------------------
+    def _access_paths(self, using, user_ids, content_type_ids, objects):
+        now = timezone.now()
+        logs = AuditLog.objects.using(using)
+        return {
+            "list (user, -timestamp)": lambda: (
+                logs.filter(user_id=random.choice(user_ids)).order_by("-timestamp", "-id")[:10]
+            ),
+            "history (content_type, object_id)": lambda: (
+                logs.filter(
+                    content_type_id=random.choice(content_type_ids),
+                    object_id=str(random.randrange(objects)),
+                ).order_by("-timestamp", "-id")[:10]
+            ),
+            "staff (action, time range)": lambda: (
+                logs.filter(
+                    action=random.choice(ACTIONS),
+                    timestamp__gte=now - timedelta(days=7),
+                    timestamp__lt=now,
+                ).order_by("-timestamp", "-id")[:10]
+            ),
+        }
+
+    def _measure(self, label, using, paths, repeat, insert_rows, seed_args):
+        results = {}
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label} =="))
+
+        for name, build in paths.items():
+            plan = build().explain()
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(build())
+                timings.append((time.perf_counter() - started) * 1000)
+
+            results[name] = statistics.median(timings)
+            self.stdout.write(f"\n{name}: {results[name]:.2f} ms (median of {repeat})")
+            for line in plan.splitlines():
+                self.stdout.write(f"    {line}")
+
+        rows = self._rows(insert_rows, *seed_args)
+        started = time.perf_counter()
+        AuditLog.objects.using(using).bulk_create(rows, batch_size=1_000)
+        results["insert"] = (time.perf_counter() - started) * 1000
+        self.stdout.write(
+            f"\ninsert {insert_rows:,} rows: {results['insert']:.1f} ms "
+            f"({insert_rows / max(results['insert'] / 1000, 1e-9):,.0f} rows/s)"
+        )
+        return results
+
+    def _swap_indexes(self, using, drop, create):
+        connection = connections[using]
+        # collect_sql editor: builds statements only, never enters a
+        # schema-editor context (SQLite refuses that inside atomic)
+        editor = connection.schema_editor(collect_sql=True)
+        editor.deferred_sql = []
+        with connection.cursor() as cursor:
+            for index in drop:
+                cursor.execute(str(index.remove_sql(AuditLog, editor)))
+            for index in create:
+                cursor.execute(str(index.create_sql(AuditLog, editor)))
+
+    # -----------------------------------------
+    # 🏁 main
+    # -----------------------------------------
+    def handle(self, *args, **options):
+        using = options["database"]
+        if options["rows"] < 1 or options["repeat"] < 1:
+            raise CommandError("--rows and --repeat must be positive")
+
+        composite = list(AuditLog._meta.indexes)
+        report = {}
+
+        try:
+            with transaction.atomic(using=using):
+                user_ids, content_type_ids = self._seed(
+                    using, options["rows"], options["users"], options["objects"]
+                )
+                seed_args = (user_ids, content_type_ids, options["objects"])
+                paths = self._access_paths(using, *seed_args)
+
+                report["composite"] = self._measure(
+                    "composite indexes (current)", using, paths,
+                    options["repeat"], options["insert_rows"], seed_args,
+                )
+
+                self._swap_indexes(using, drop=composite, create=LEGACY_INDEXES)
+                report["legacy"] = self._measure(
+                    "legacy single-column indexes", using, paths,
+                    options["repeat"], options["insert_rows"], seed_args,
+                )
+
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\n== summary (legacy → composite) =="))
+        for name, before in report["legacy"].items():
+            after = report["composite"][name]
+            change = (after - before) / before * 100 if before else 0
+            self.stdout.write(f"{name:<36} {before:>9.2f} ms → {after:>9.2f} ms  ({change:+.0f}%)")
+
+        self.stdout.write(self.style.SUCCESS("✅ Benchmark finished; all changes rolled back"))
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from audit_log.conf import get_setting
+from audit_log.history import extend_checkpoints
+from audit_log.models import AuditLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Write full-state checkpoints for busy audited objects so "
+        "audit_log.history.state_at() replays a bounded number of changes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Consider objects changed since this day (YYYY-MM-DD, default: last 24h)",
+        )
+        parser.add_argument(
+            "--min-events",
+            type=int,
+            help="Only objects with at least this many events since --since "
+                 "(default: AUDIT_LOG_CHECKPOINT_INTERVAL)",
+        )
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        min_events = options["min_events"] or get_setting("CHECKPOINT_INTERVAL")
+        if min_events < 1:
+            raise CommandError("--min-events must be positive")
+
+        if options["since"]:
+            day = parse_date(options["since"])
+            if day is None:
+                raise CommandError("--since must be YYYY-MM-DD")
+            since = datetime(day.year, day.month, day.day, tzinfo=dt_timezone.utc)
+        else:
+            since = timezone.now() - timedelta(days=1)
+
+        busy = (
+            AuditLog.objects.using(using)
+            .filter(timestamp__gte=since, content_type__isnull=False, object_id__isnull=False)
+            .values("content_type_id", "object_id")
+            .annotate(events=Count("id"))
+            .filter(events__gte=min_events)
+            .order_by()
+        )
+
+        objects = written = 0
+        for row in list(busy):
+            written += extend_checkpoints(row["content_type_id"], row["object_id"], using=using)
+            objects += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {written} checkpoints written for {objects} objects"
+        ))
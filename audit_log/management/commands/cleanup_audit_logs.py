@@ -1,10 +1,27 @@
-from django.core.management.base import BaseCommand
-from django.db import transaction
+import json
+import os
+import time
+from datetime import timedelta
 
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from audit_log.archive import ARCHIVE_FIELDS, SegmentArchive
+from audit_log.metrics import audit_log_cleanup_total
 from audit_log.models import AuditLog
 from audit_log.constants import AUDIT_LOG_RETENTION_DAYS
-from audit_log.utils import get_audit_logs_older_than_retention
-from audit_log.context import disable_audit_logging
+from audit_log.utils import get_retention_cutoff
+from audit_log.context import audit_logging_disabled
+from audit_log.counts import estimate_before
+from audit_log.partitions import (
+    get_backend,
+    month_bounds,
+    partition_name,
+    partitioning_enabled,
+)
+from audit_log.stats import discount, forget
 
 
 class Command(BaseCommand):
@@ -22,19 +39,175 @@ class Command(BaseCommand):
             default=1000,
             help="Number of rows to delete per batch",
         )
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint file; an interrupted run resumes from it",
+        )
+        parser.add_argument(
+            "--max-rate",
+            type=float,
+            default=0,
+            help="Maximum rows deleted per second (0 = unlimited)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between batches",
+        )
+        parser.add_argument(
+            "--archive",
+            metavar="DIR",
+            help="Write expired rows to compressed daily segments in DIR before deleting",
+        )
+        parser.add_argument(
+            "--archive-chunk-size",
+            type=int,
+            default=1000,
+            help="Rows fetched per round trip and stored per compressed block",
+        )
+
+    # -----------------------------------------
+    # 💾 checkpoint
+    # -----------------------------------------
+    def _load_checkpoint(self, path):
+        if not path or not os.path.exists(path):
+            return None
+
+        def key(prefix):
+            if data.get(f"{prefix}_id") is None:
+                return None
+            return (parse_datetime(data[f"{prefix}_timestamp"]), data[f"{prefix}_id"])
+
+        try:
+            with open(path) as fh:
+                data = json.load(fh)
+            return {
+                "cutoff": parse_datetime(data["cutoff"]),
+                "last_key": key("last"),
+                "archived_key": key("archived"),
+                "deleted": data.get("deleted", 0),
+            }
+        except (ValueError, KeyError, TypeError) as exc:
+            raise CommandError(f"Invalid checkpoint file {path}: {exc}")
+
+    def _save_checkpoint(self, path, cutoff, last_key, deleted, archived_key=None):
+        if not path:
+            return
+
+        data = {"cutoff": cutoff.isoformat(), "deleted": deleted}
+        for prefix, key in (("last", last_key), ("archived", archived_key)):
+            if key is not None:
+                data[f"{prefix}_timestamp"] = key[0].isoformat()
+                data[f"{prefix}_id"] = key[1]
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(data, fh)
+        os.replace(tmp_path, path)  # atomic: never a half-written checkpoint
+
+    # -----------------------------------------
+    # 🔑 keyset helpers on (timestamp, id)
+    # -----------------------------------------
+    @staticmethod
+    def _after(key):
+        timestamp, pk = key
+        return Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=pk)
+
+    @staticmethod
+    def _up_to(key):
+        timestamp, pk = key
+        return Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lte=pk)
+
+    def _delete_range(self, queryset):
+        # nothing cascades from or listens on AuditLog deletes, so Django
+        # fast-deletes: one DELETE ... WHERE <range>, no SELECT of ids
+        count, _ = queryset.delete()
+        return count
+
+    def _archive(self, archive, queryset, chunk_size):
+        # streamed in key order; never more than one chunk in memory
+        rows = (
+            queryset
+            .order_by("timestamp", "id")
+            .values(*ARCHIVE_FIELDS)
+            .iterator(chunk_size=chunk_size)
+        )
+        archive.write_rows(rows)
+        archive.sync()  # durable before the rows are deleted
+
+    def _progress(self, deleted, started, run_deleted, run_total):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        rate = run_deleted / elapsed
+
+        # estimated once per run (rollup / planner), never a COUNT(*)
+        if run_total is None:
+            remaining, eta = "?", "?"
+        else:
+            remaining = max(run_total - run_deleted, 0)
+            eta = timedelta(seconds=int(remaining / rate)) if rate else "?"
+
+        self.stdout.write(
+            f"… {deleted} deleted | {rate:,.0f} rows/s | "
+            f"~{remaining} left | ETA {eta}"
+        )
 
+    # -----------------------------------------
+    # 🧹 main
+    # -----------------------------------------
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
         batch_size = options["batch_size"]
+        checkpoint_path = options["checkpoint"]
+        max_rate = options["max_rate"]
+        pause = options["sleep"]
+        archive_dir = options["archive"]
+        chunk_size = options["archive_chunk_size"]
 
-        queryset = get_audit_logs_older_than_retention()
-        total = queryset.count()
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive")
+        if chunk_size < 1:
+            raise CommandError("--archive-chunk-size must be positive")
 
-        if total == 0:
-            self.stdout.write(self.style.SUCCESS("✅ No audit logs to clean up"))
-            return
+        checkpoint = self._load_checkpoint(checkpoint_path)
+        cutoff = checkpoint["cutoff"] if checkpoint else get_retention_cutoff()
+        last_key = checkpoint["last_key"] if checkpoint else None
+        archived_key = checkpoint["archived_key"] if checkpoint else None
+        deleted = checkpoint["deleted"] if checkpoint else 0
+
+        if checkpoint:
+            self.stdout.write(
+                f"↩️ Resuming from checkpoint ({deleted} already deleted)"
+            )
+
+        archive = None
+        if archive_dir and not dry_run:
+            archive = SegmentArchive(archive_dir, block_rows=chunk_size)
+            self.stdout.write(f"📦 Archiving expired rows to {archive_dir}")
+
+        # ✅ Partitioned storage: the coming months are created (so rows
+        # never pile up in the DEFAULT partition), whole expired months are
+        # dropped in O(1); what is left (legacy partition, partial months)
+        # gets row deletes
+        if partitioning_enabled() and not dry_run:
+            backend = get_backend(router.db_for_write(AuditLog))
+            for month in backend.ensure_upcoming():
+                self.stdout.write(f"📅 {partition_name(month)}")
+            for month in backend.expired_partitions(cutoff):
+                if archive is not None:
+                    self._archive(
+                        archive,
+                        AuditLog.objects.partition(month_bounds(month)[0]),
+                        chunk_size,
+                    )
+                backend.drop_partition(month)
+                forget(*month_bounds(month), using=backend.using)
+                self.stdout.write(f"🗑 Dropped partition {month:%Y-%m}")
+
+        expired = AuditLog.objects.filter(timestamp__lt=cutoff)
 
         if dry_run:
+            total = expired.count()
             self.stdout.write(
                 self.style.WARNING(
                     f"🧪 DRY RUN: {total} audit logs would be deleted "
@@ -43,25 +216,89 @@ class Command(BaseCommand):
             )
             return
 
+        final_key = (
+            expired
+            .order_by("-timestamp", "-id")
+            .values_list("timestamp", "id")
+            .first()
+        )
+
+        if final_key is None:
+            if archive is not None:
+                archive.close()
+            self.stdout.write(self.style.SUCCESS("✅ No audit logs to clean up"))
+            if checkpoint_path and os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+            return
+
         self.stdout.write(
-            f"🧹 Deleting {total} audit logs "
+            f"🧹 Deleting audit logs older than {cutoff:%Y-%m-%d %H:%M} "
             f"(older than {AUDIT_LOG_RETENTION_DAYS} days)..."
         )
 
-        deleted = 0
+        # the rollup already lost what an interrupted run deleted
+        run_total = estimate_before(AuditLog.objects.all(), cutoff)
+        started = time.monotonic()
+        run_deleted = 0
 
         # ⛔ Disable signals during cleanup
-        with disable_audit_logging():
+        with audit_logging_disabled():
             while True:
-                ids = list(
-                    queryset.values_list("id", flat=True)[:batch_size]
-                )
-                if not ids:
+                window = expired if last_key is None else expired.filter(self._after(last_key))
+
+                # a range archived by an interrupted run only needs deleting
+                resumed = archived_key is not None and (last_key is None or archived_key > last_key)
+
+                if resumed:
+                    upper_key = archived_key
+                else:
+                    # upper key of this batch: an index range scan, never a rescan
+                    upper_key = (
+                        window
+                        .order_by("timestamp", "id")
+                        .values_list("timestamp", "id")[batch_size - 1:batch_size]
+                        .first()
+                    ) or final_key
+
+                batch = window.filter(self._up_to(upper_key))
+
+                if archive is not None and not resumed:
+                    self._archive(archive, batch, chunk_size)
+                    archived_key = upper_key
+                    self._save_checkpoint(
+                        checkpoint_path, cutoff, last_key, deleted, archived_key
+                    )
+
+                # the rollup loses exactly what the batch deletes
+                with transaction.atomic(using=expired.db):
+                    discount(batch)
+                    count = self._delete_range(batch)
+
+                deleted += count
+                run_deleted += count
+                audit_log_cleanup_total.inc(count)
+                last_key = upper_key
+
+                self._save_checkpoint(checkpoint_path, cutoff, last_key, deleted, archived_key)
+                self._progress(deleted, started, run_deleted, run_total)
+
+                if upper_key == final_key:
                     break
 
-                with transaction.atomic():
-                    count, _ = AuditLog.objects.filter(id__in=ids).delete()
-                    deleted += count
+                # ⏳ throttling
+                if max_rate > 0:
+                    ahead = run_deleted / max_rate - (time.monotonic() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+                if pause > 0:
+                    time.sleep(pause)
+
+        if archive is not None:
+            archive.close()
+            self.stdout.write(f"📦 Archived {archive.rows_written} audit logs")
+
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
 
         self.stdout.write(
             self.style.SUCCESS(f"✅ Cleanup completed. Deleted {deleted} audit logs.")
@@ -0,0 +1,53 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from audit_log.integrity import verify_blocks
+from audit_log.models import AuditLogBlock
+
+
+class Command(BaseCommand):
+    help = "Recompute the Merkle roots and hash chain of sealed audit log blocks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes hashing blocks in parallel (1 = in this process)",
+        )
+        parser.add_argument(
+            "--start",
+            type=int,
+            default=1,
+            help="First block number to verify",
+        )
+        parser.add_argument(
+            "--expect-head",
+            metavar="CHAIN_HASH",
+            help="Chain hash recorded elsewhere for the newest block",
+        )
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if options["workers"] < 1 or options["start"] < 1:
+            raise CommandError("--workers and --start must be positive")
+
+        failures = 0
+        for failure in verify_blocks(using=using, workers=options["workers"], start=options["start"]):
+            failures += 1
+            self.stderr.write(self.style.ERROR(f"❌ block {failure.number}: {failure.reason}"))
+
+        blocks = AuditLogBlock.objects.using(using)
+        head = blocks.order_by("-number").first()
+        expected = options["expect_head"]
+        if expected and (head is None or not blocks.filter(chain_hash=expected).exists()):
+            failures += 1
+            self.stderr.write(self.style.ERROR("❌ expected head chain hash not found"))
+
+        if failures:
+            raise CommandError(f"{failures} integrity failures")
+
+        checked = blocks.filter(number__gte=options["start"]).count()
+        self.stdout.write(self.style.SUCCESS(f"✅ {checked} blocks verified"))
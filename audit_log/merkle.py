@@ -0,0 +1,77 @@
+# audit_log/merkle.py
+
+"""
+Merkle roots over audit rows (see audit_log.integrity).
+
+Standard library only: verify_audit_integrity runs merkle_root() in
+spawned pool workers that never set up Django.
+"""
+
+import hashlib
+import json
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Sequence, Tuple
+
+GENESIS = "0" * 64
+
+# sealed leaf: microseconds since the epoch (signed) + 32-byte leaf hash
+_LEAF = struct.Struct(">q32s")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def plain(value):
+    """Stable text form of datetimes (UTC ISO 8601); other values as-is."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.isoformat()
+    return value
+
+
+def leaf_hash(row: Sequence) -> bytes:
+    encoded = json.dumps(
+        [plain(value) for value in row],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    ).encode()
+    # 0x00 / 0x01 prefixes keep leaves and inner nodes apart
+    return hashlib.sha256(b"\x00" + encoded).digest()
+
+
+def merkle_root(rows: Iterable[Sequence]) -> str:
+    return root_of_leaves([leaf_hash(row) for row in rows])
+
+
+def root_of_leaves(leaves: List[bytes]) -> str:
+    level = list(leaves)
+    if not level:
+        return GENESIS
+
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [
+            hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest()
+            for i in range(0, len(level), 2)
+        ]
+    return level[0].hex()
+
+
+
+def to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def pack_leaves(timestamps: Sequence[datetime], leaves: Sequence[bytes]) -> bytes:
+    """Timestamp and leaf hash of every row, for AuditLogBlock.leaves."""
+    return b"".join(
+        _LEAF.pack(to_micros(timestamp), leaf) for timestamp, leaf in zip(timestamps, leaves)
+    )
+
+
+def unpack_leaves(data) -> List[Tuple[int, bytes]]:
+    """(timestamp in microseconds since the epoch, leaf hash) per sealed row."""
+    return list(_LEAF.iter_unpack(bytes(data)))
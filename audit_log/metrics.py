@@ -1,4 +1,11 @@
-from prometheus_client import Counter, Histogram
+from collections import Counter as _Counter
+
+from audit_log.prometheus import setup_multiprocess
+
+# before any metric exists: values must be created file-backed
+setup_multiprocess()
+
+from prometheus_client import Counter, Gauge, Histogram  # noqa: E402
 
 audit_log_created_total = Counter(
     "audit_log_created_total",
@@ -15,3 +22,64 @@ audit_log_create_latency_seconds = Histogram(
     "audit_log_create_latency_seconds",
     "Audit log creation latency in seconds"
 )
+
+# =========================
+# Write pipeline
+# =========================
+
+audit_log_write_calls_total = Counter(
+    "audit_log_write_calls_total",
+    "Audit events submitted, by write path",
+    ["path"]
+)
+
+audit_log_buffer_queue_depth = Gauge(
+    "audit_log_buffer_queue_depth",
+    "Audit events waiting in the in-process buffer",
+    multiprocess_mode="livesum",
+)
+
+audit_log_batch_size = Histogram(
+    "audit_log_batch_size",
+    "Rows per audit log insert",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+
+audit_log_flush_latency_seconds = Histogram(
+    "audit_log_flush_latency_seconds",
+    "Time to persist one batch of buffered or deferred audit events",
+    ["mode"]
+)
+
+audit_log_dropped_events_total = Counter(
+    "audit_log_dropped_events_total",
+    "Audit events that were never written",
+    ["reason"]
+)
+
+audit_log_suppressed_events_total = Counter(
+    "audit_log_suppressed_events_total",
+    "Audit events not written because of a sampling / rate limit / drop policy",
+    ["resource", "action", "source", "policy"]
+)
+
+# =========================
+# API
+# =========================
+
+audit_log_api_query_seconds = Histogram(
+    "audit_log_api_query_seconds",
+    "Audit log API request time in seconds",
+    ["endpoint"]
+)
+
+
+def record_created(entries) -> None:
+    """Count persisted rows (called by every insert path of AuditLog)."""
+    if not entries:
+        return
+
+    audit_log_batch_size.observe(len(entries))
+    counts = _Counter((entry.resource, entry.action) for entry in entries)
+    for (resource, action), count in counts.items():
+        audit_log_created_total.labels(resource=resource, action=action).inc(count)
@@ -1,45 +1,81 @@
+import re
 import uuid
 
-from audit_log.context import (
-    set_current_user,
-    set_current_request,
-    clear_context,
-    set_correlation_id,
-)
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from audit_log.coalesce import coalescing
+from audit_log.context import request_context
 
 
 class AuditLogContextMiddleware:
     """
     Middleware for:
-    - Storing current user & request in context
+    - Storing the current request (and so its user) in context
     - Generating / propagating Correlation ID
-    - Cleaning context after response
+    - Coalescing repeated saves of one object into one audit row,
+      written before the response leaves (audit_log.coalesce)
+    - Restoring the previous context after response
+
+    Sync and async capable: under ASGI it runs as a coroutine (no thread
+    hop) and the ContextVar state stays private to the request's task.
     """
 
+    sync_capable = True
+    async_capable = True
+
     HEADER_NAME = "HTTP_X_CORRELATION_ID"
     RESPONSE_HEADER = "X-Correlation-ID"
 
+    # stored on every audit row (correlation_id max_length=64): a client
+    # value that would not fit or is not a plain token is replaced
+    VALID_ID = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
-    def __call__(self, request):
+    def _correlation_id(self, request):
         # ---------- Correlation ID ----------
         correlation_id = request.META.get(self.HEADER_NAME)
-        if not correlation_id:
+        if not correlation_id or not self.VALID_ID.match(correlation_id):
             correlation_id = uuid.uuid4().hex
 
-        set_correlation_id(correlation_id)
         request.correlation_id = correlation_id
+        return correlation_id
 
+    def _context(self, request, correlation_id):
         # ---------- User / Request ----------
-        set_current_user(getattr(request, "user", None))
-        set_current_request(request)
+        # the user is read from request.user when an event is written:
+        # left lazy here, and DRF's authenticated user replaces it later
+        return request_context(
+            request=request,
+            correlation_id=correlation_id,
+        )
 
-        try:
-            response = self.get_response(request)
-        finally:
-            clear_context()
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        correlation_id = self._correlation_id(request)
+        with self._context(request, correlation_id), coalescing() as coalescer:
+            try:
+                response = self.get_response(request)
+            finally:
+                coalescer.flush()
 
         # ---------- Response header ----------
         response[self.RESPONSE_HEADER] = correlation_id
         return response
+
+    async def __acall__(self, request):
+        correlation_id = self._correlation_id(request)
+        with self._context(request, correlation_id), coalescing() as coalescer:
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(coalescer.flush)()
+
+        response[self.RESPONSE_HEADER] = correlation_id
+        return response
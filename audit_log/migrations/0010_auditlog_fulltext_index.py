@@ -0,0 +1,73 @@
+# Generated by Django 6.0 on 2026-10-18 09:00
+
+from django.db import migrations
+
+# Frozen copy of the schema in audit_log/search.py at the time of this
+# migration: later changes to the runtime module must not alter it.
+TABLE = "audit_log_auditlog"
+FTS_TABLE = "audit_log_auditlog_fts"
+PG_INDEX = "audit_log_auditlog_fts_gin"
+COLUMNS = "description, resource, action, object_id"
+
+
+def _values(prefix):
+    return ", ".join(f"COALESCE({prefix}.{c}, '')" for c in COLUMNS.split(", "))
+
+
+SQLITE_INSTALL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{COLUMNS}, content='', tokenize='unicode61')",
+    f'CREATE TRIGGER IF NOT EXISTS "{TABLE}_fts_ai" AFTER INSERT ON "{TABLE}" BEGIN '
+    f"INSERT INTO {FTS_TABLE} (rowid, {COLUMNS}) VALUES (new.id, {_values('new')}); "
+    f"END",
+    f'CREATE TRIGGER IF NOT EXISTS "{TABLE}_fts_ad" AFTER DELETE ON "{TABLE}" BEGIN '
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {COLUMNS}) "
+    f"VALUES ('delete', old.id, {_values('old')}); "
+    f"END",
+    f'CREATE TRIGGER IF NOT EXISTS "{TABLE}_fts_au" AFTER UPDATE OF {COLUMNS} ON "{TABLE}" BEGIN '
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {COLUMNS}) "
+    f"VALUES ('delete', old.id, {_values('old')}); "
+    f"INSERT INTO {FTS_TABLE} (rowid, {COLUMNS}) VALUES (new.id, {_values('new')}); "
+    f"END",
+    f"INSERT INTO {FTS_TABLE} (rowid, {COLUMNS}) "
+    f"SELECT id, {_values(TABLE)} FROM {TABLE}",
+]
+
+SQLITE_UNINSTALL = [
+    f'DROP TRIGGER IF EXISTS "{TABLE}_fts_{suffix}"' for suffix in ("ai", "ad", "au")
+] + [f"DROP TABLE IF EXISTS {FTS_TABLE}"]
+
+PG_DOCUMENT = "to_tsvector('simple', " + " || ' ' || ".join(
+    f"COALESCE({c}, '')" for c in COLUMNS.split(", ")
+) + ")"
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for sql in SQLITE_INSTALL:
+            schema_editor.execute(sql)
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON {TABLE} USING GIN (({PG_DOCUMENT}))"
+        )
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for sql in SQLITE_UNINSTALL:
+            schema_editor.execute(sql)
+    elif vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {PG_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_log', '0009_auditlog_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
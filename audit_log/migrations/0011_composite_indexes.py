@@ -0,0 +1,126 @@
+# Generated by Django 6.0 on 2026-10-18 09:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# single-column db_index=True indexes superseded by the composite ones:
+# (index name, column); names are Django's, identical on every backend
+SUPERSEDED = (
+    ("audit_log_auditlog_action_1c3be41c", "action"),
+    ("audit_log_auditlog_resource_325cd5f2", "resource"),
+    ("audit_log_auditlog_status_aa5b9d0e", "status"),
+    ("audit_log_auditlog_source_3c98bbee", "source"),
+    ("audit_log_auditlog_user_id_e60de996", "user_id"),
+    ("audit_log_auditlog_content_type_id_7e65afba", "content_type_id"),
+)
+
+# PostgreSQL's varchar_pattern_ops twins of the CharField indexes; not
+# recreated on reverse (operator class is PostgreSQL only)
+PATTERN_OPS = tuple(f"{name}_like" for name, _ in SUPERSEDED[:4])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_log', '0010_auditlog_fulltext_index'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_log_a_action_903622_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_log_a_resourc_2113e8_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_log_a_status_b50950_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_log_a_source_ce458f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_log_a_user_id_803677_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_log_a_timesta_1eda2d_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_log_a_content_bf31bf_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_log_a_correla_f5341e_idx',
+        ),
+        # drop the single-column indexes without letting SQLite rebuild the
+        # table (a rebuild per field would also drop the full-text triggers)
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='auditlog',
+                    name='action',
+                    field=models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete'), ('bulk_delete', 'Bulk delete'), ('bulk_update', 'Bulk update'), ('login', 'Login'), ('logout', 'Logout')], max_length=50),
+                ),
+                migrations.AlterField(
+                    model_name='auditlog',
+                    name='content_type',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='contenttypes.contenttype'),
+                ),
+                migrations.AlterField(
+                    model_name='auditlog',
+                    name='resource',
+                    field=models.CharField(default='', max_length=255),
+                ),
+                migrations.AlterField(
+                    model_name='auditlog',
+                    name='source',
+                    field=models.CharField(default='api', max_length=10),
+                ),
+                migrations.AlterField(
+                    model_name='auditlog',
+                    name='status',
+                    field=models.CharField(default='INFO', max_length=10),
+                ),
+                migrations.AlterField(
+                    model_name='auditlog',
+                    name='user',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_logs', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[
+                *(
+                    migrations.RunSQL(
+                        f'DROP INDEX IF EXISTS "{name}"',
+                        f'CREATE INDEX IF NOT EXISTS "{name}" ON "audit_log_auditlog" ("{column}")',
+                    )
+                    for name, column in SUPERSEDED
+                ),
+                *(
+                    migrations.RunSQL(f'DROP INDEX IF EXISTS "{name}"', migrations.RunSQL.noop)
+                    for name in PATTERN_OPS
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['user', 'timestamp'], name='auditlog_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['content_type', 'object_id', 'timestamp'], name='auditlog_object_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['action', 'timestamp'], name='auditlog_action_ts_idx'),
+        ),
+    ]
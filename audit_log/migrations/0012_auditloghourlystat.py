@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_log', '0011_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogHourlyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('resource', models.CharField(default='', max_length=255)),
+                ('action', models.CharField(max_length=50)),
+                ('status', models.CharField(default='INFO', max_length=10)),
+                ('count', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ('-hour',),
+                'constraints': [models.UniqueConstraint(fields=('hour', 'resource', 'action', 'status'), name='auditlog_hourly_stat_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-18 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_log', '0012_auditloghourlystat'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.CharField(max_length=64)),
+                ('audit_log_id', models.BigIntegerField()),
+                ('timestamp', models.DateTimeField()),
+                ('state', models.JSONField()),
+                ('content_type', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ('-timestamp', '-audit_log_id'),
+                'indexes': [models.Index(fields=['content_type', 'object_id', 'timestamp'], name='auditlog_ckpt_object_ts_idx')],
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'object_id', 'audit_log_id'), name='auditlog_checkpoint_event')],
+            },
+        ),
+    ]
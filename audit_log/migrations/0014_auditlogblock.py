@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-18 09:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_log', '0013_auditlogcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveBigIntegerField(unique=True)),
+                ('first_id', models.BigIntegerField()),
+                ('last_id', models.BigIntegerField()),
+                ('row_count', models.PositiveIntegerField()),
+                ('min_timestamp', models.DateTimeField()),
+                ('max_timestamp', models.DateTimeField()),
+                ('merkle_root', models.CharField(max_length=64)),
+                ('chain_hash', models.CharField(max_length=64)),
+                ('sealed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ('number',),
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_log', '0014_auditlogblock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditlog',
+            name='content_type_ref',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='user_ref',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='auditlogblock',
+            name='leaves',
+            field=models.BinaryField(default=b''),
+        ),
+        # existing rows: the FK values as they are now (what sealed blocks hashed)
+        migrations.RunSQL(
+            "UPDATE audit_log_auditlog "
+            "SET user_ref = user_id, content_type_ref = content_type_id",
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-18 09:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit_log', '0015_auditlog_refs_block_leaves'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogIdMark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('max_id', models.BigIntegerField()),
+                ('observed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ('-observed_at',),
+            },
+        ),
+    ]
@@ -1,7 +1,39 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, router, transaction
+from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 
+from audit_log.metrics import record_created
+from audit_log.partitions import month_bounds, month_of
+
+
+class AuditLogManager(models.Manager):
+    """
+    Counts every bulk insert in the hourly rollup and the created metric.
+
+    With AUDIT_LOG_PARTITIONING (PostgreSQL) the parent table routes rows
+    itself, so reads, updates and inserts need nothing special here.
+    """
+
+    def partition(self, timestamp):
+        """Rows of the month holding timestamp (pruned to one partition)."""
+        start, end = month_bounds(month_of(timestamp))
+        return self.get_queryset().filter(timestamp__gte=start, timestamp__lt=end)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from audit_log.stats import record
+
+        objs = list(objs)
+        for obj in objs:
+            obj.freeze_refs()
+
+        # ✅ hourly rollup: one upsert per batch, committed with the rows
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            record(objs, using=self.db)
+        record_created(objs)
+        return objs
+
 
 class AuditLog(models.Model):
     class Action(models.TextChoices):
@@ -19,24 +51,22 @@ class AuditLog(models.Model):
         blank=True,
         on_delete=models.SET_NULL,
         related_name="audit_logs",
+        db_index=False,  # covered by (user, timestamp)
     )
 
     action = models.CharField(
         max_length=50,
-        db_index=True,
         choices=Action.choices,
     )
 
     resource = models.CharField(
         max_length=255,
         default="",
-        db_index=True,
     )
 
     status = models.CharField(
         max_length=10,
         default="INFO",
-        db_index=True,
     )
 
     description = models.TextField(
@@ -47,7 +77,6 @@ class AuditLog(models.Model):
     source = models.CharField(
         max_length=10,
         default="api",
-        db_index=True,
     )
 
     # ✅ Correlation ID (Phase 2.4.1)
@@ -63,6 +92,7 @@ class AuditLog(models.Model):
         null=True,
         blank=True,
         on_delete=models.SET_NULL,
+        db_index=False,  # covered by (content_type, object_id, timestamp)
     )
 
     object_id = models.CharField(
@@ -76,22 +106,33 @@ class AuditLog(models.Model):
         blank=True,
     )
 
+    # ids as written: user/content_type are SET_NULL on delete, these are
+    # never touched again, so sealed integrity blocks keep verifying
+    user_ref = models.BigIntegerField(null=True, blank=True, editable=False)
+    content_type_ref = models.IntegerField(null=True, blank=True, editable=False)
+
+    # default (not auto_now_add) so buffered writes keep the event time
     timestamp = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
         db_index=True,
     )
 
+    objects = AuditLogManager()
+
     class Meta:
         ordering = ("-timestamp",)
+        # one composite per access path (equality columns first, then time);
+        # timestamp and correlation_id keep their single-column db_index
         indexes = [
-            models.Index(fields=["action"]),
-            models.Index(fields=["resource"]),
-            models.Index(fields=["status"]),
-            models.Index(fields=["source"]),
-            models.Index(fields=["user"]),
-            models.Index(fields=["timestamp"]),
-            models.Index(fields=["correlation_id"]),
-            models.Index(fields=["content_type", "object_id"]),
+            # non-staff list: user=… ORDER BY -timestamp
+            models.Index(fields=["user", "timestamp"], name="auditlog_user_ts_idx"),
+            # object history: content_type=…, object_id=… ORDER BY timestamp
+            models.Index(
+                fields=["content_type", "object_id", "timestamp"],
+                name="auditlog_object_ts_idx",
+            ),
+            # staff views: action=… AND timestamp range
+            models.Index(fields=["action", "timestamp"], name="auditlog_action_ts_idx"),
         ]
 
     @property
@@ -101,5 +142,152 @@ class AuditLog(models.Model):
             if self.content_type else None
         )
 
+    def freeze_refs(self):
+        self.user_ref = self.user_id
+        self.content_type_ref = self.content_type_id
+
+    def save(self, *args, **kwargs):
+        from audit_log.stats import record
+
+        adding = self._state.adding and self.pk is None
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+
+        if not adding:
+            super().save(*args, **kwargs)
+            return
+
+        self.freeze_refs()
+
+        # rows and their rollup commit together, also under autocommit
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+            record([self], using=using)
+        record_created([self])
+
     def __str__(self):
         return f"{self.user or 'system'} | {self.action} | {self.resource}"
+
+
+class AuditLogHourlyStat(models.Model):
+    """
+    Events per hour × resource × action × status.
+
+    Maintained incrementally by audit_log.stats on every insert, so
+    dashboards aggregate O(buckets) rows instead of the raw table.
+    cleanup_audit_logs subtracts the rows it deletes, so the counts
+    describe the rows still stored.
+    """
+
+    hour = models.DateTimeField()
+    resource = models.CharField(max_length=255, default="")
+    action = models.CharField(max_length=50)
+    status = models.CharField(max_length=10, default="INFO")
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ("-hour",)
+        constraints = [
+            # upsert target; its leading hour column also serves range scans
+            models.UniqueConstraint(
+                fields=["hour", "resource", "action", "status"],
+                name="auditlog_hourly_stat_bucket",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.hour:%Y-%m-%d %H}:00 | {self.resource} | {self.action} | {self.status} = {self.count}"
+
+
+class AuditLogCheckpoint(models.Model):
+    """
+    Full state of one audited object right after one of its audit events.
+
+    Written every AUDIT_LOG_CHECKPOINT_INTERVAL events by audit_log.history
+    so state_at() replays at most that many deltas from the nearest
+    checkpoint instead of the object's whole history.
+    """
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        db_index=False,  # covered by (content_type, object_id, timestamp)
+    )
+    object_id = models.CharField(max_length=64)
+
+    # last event folded into state, and its timestamp
+    audit_log_id = models.BigIntegerField()
+    timestamp = models.DateTimeField()
+
+    # tracked field name → JSON-safe value (same form as AuditLog.changes)
+    state = models.JSONField()
+
+    class Meta:
+        ordering = ("-timestamp", "-audit_log_id")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "audit_log_id"],
+                name="auditlog_checkpoint_event",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["content_type", "object_id", "timestamp"],
+                name="auditlog_ckpt_object_ts_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type_id}:{self.object_id} @ {self.timestamp:%Y-%m-%d %H:%M:%S}"
+
+
+class AuditLogBlock(models.Model):
+    """
+    Tamper evidence for a fixed-size run of AuditLog rows (by id).
+
+    merkle_root covers every row of the block; chain_hash links the block
+    to the previous one so blocks cannot be dropped or reordered unseen.
+    Sealed after the fact by audit_log.integrity, never on the insert path.
+    """
+
+    number = models.PositiveBigIntegerField(unique=True)
+
+    first_id = models.BigIntegerField()
+    last_id = models.BigIntegerField()
+    row_count = models.PositiveIntegerField()
+    min_timestamp = models.DateTimeField()
+    max_timestamp = models.DateTimeField()
+
+    merkle_root = models.CharField(max_length=64)
+    chain_hash = models.CharField(max_length=64)
+
+    # per row, in id order: timestamp + leaf hash (audit_log.merkle.pack_leaves);
+    # lets a block partly purged by retention still be checked row by row
+    leaves = models.BinaryField(default=b"", editable=False)
+
+    sealed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ("number",)
+
+    def __str__(self):
+        return f"block {self.number} | ids {self.first_id}–{self.last_id} | {self.merkle_root[:12]}"
+
+
+class AuditLogIdMark(models.Model):
+    """
+    Highest AuditLog id seen at a point in time (one per seal run).
+
+    Every id up to a mark was handed out when it was observed, so once
+    the mark is INTEGRITY_SETTLE_SECONDS old only a transaction running
+    longer than that can still commit one of them: audit_log.integrity
+    seals no further than the newest settled mark.
+    """
+
+    max_id = models.BigIntegerField()
+    observed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ("-observed_at",)
+
+    def __str__(self):
+        return f"id {self.max_id} seen at {self.observed_at:%Y-%m-%d %H:%M:%S}"
@@ -0,0 +1,269 @@
+# audit_log/partitions.py
+
+"""
+Optional monthly partitioning of audit_log_auditlog (AUDIT_LOG_PARTITIONING).
+
+PostgreSQL only: native declarative partitions (PARTITION BY RANGE
+timestamp). Reads, writes, UPDATEs and on_delete=SET_NULL all stay on
+the parent table and are routed by the database; retention detaches and
+drops whole months instead of deleting rows, and creates the months
+ahead. Rows of a month nobody created yet land in a DEFAULT partition
+and are moved out when that month is created. Other backends raise
+ImproperlyConfigured when the setting is on.
+"""
+
+import re
+from datetime import date, datetime, timezone as dt_timezone
+from typing import Dict, List, Optional, Set
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+
+from audit_log.conf import get_setting
+
+PARENT_TABLE = "audit_log_auditlog"
+LEGACY_TABLE = f"{PARENT_TABLE}_legacy"
+DEFAULT_TABLE = f"{PARENT_TABLE}_default"
+PARTITION_PREFIX = f"{PARENT_TABLE}_p"
+
+_PARTITION_RE = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})(\d{{2}})$")
+
+
+# -----------------------------------------
+# 📅 month helpers
+# -----------------------------------------
+def month_of(value: datetime) -> date:
+    if value.tzinfo is not None:
+        value = value.astimezone(dt_timezone.utc)
+    return date(value.year, value.month, 1)
+
+
+def next_month(month: date) -> date:
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def parse_partition_name(name: str) -> Optional[date]:
+    match = _PARTITION_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def month_bounds(month: date):
+    start = datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+    end_month = next_month(month)
+    end = datetime(end_month.year, end_month.month, 1, tzinfo=dt_timezone.utc)
+    return start, end
+
+
+def partitioning_enabled() -> bool:
+    return bool(get_setting("PARTITIONING"))
+
+
+# -----------------------------------------
+# 🧱 backends
+# -----------------------------------------
+class PartitionBackend:
+    def __init__(self, using: str):
+        self.using = using
+        self.connection = connections[using]
+        self._known: Set[date] = set()
+
+    # --- bookkeeping shared by backends ---
+    def _remember(self, month: date) -> None:
+        # cache only what has committed: a rolled-back CREATE must not stick
+        transaction.on_commit(lambda: self._known.add(month), using=self.using)
+
+    def reset(self) -> None:
+        self._known.clear()
+
+    def list_partitions(self) -> List[date]:
+        with self.connection.cursor() as cursor:
+            tables = self.connection.introspection.table_names(cursor)
+        return sorted(
+            month for month in map(parse_partition_name, tables) if month
+        )
+
+    def ensure_partition(self, month: date) -> bool:
+        """Create the partition for month if it does not exist yet."""
+        raise NotImplementedError
+
+    def drop_partition(self, month: date) -> None:
+        raise NotImplementedError
+
+    def ensure_upcoming(self, months_ahead: Optional[int] = None) -> List[date]:
+        """Make sure the current month and months_ahead more exist."""
+        if months_ahead is None:
+            months_ahead = get_setting("PARTITION_MONTHS_AHEAD")
+        months = []
+        month = month_of(datetime.now(dt_timezone.utc))
+        for _ in range(months_ahead + 1):
+            self.ensure_partition(month)
+            months.append(month)
+            month = next_month(month)
+        return months
+
+    def expired_partitions(self, cutoff: datetime) -> List[date]:
+        """Partitions that end on or before cutoff."""
+        return [
+            month for month in self.list_partitions()
+            if month_bounds(month)[1] <= cutoff
+        ]
+
+    def drop_partitions_before(self, cutoff: datetime) -> List[date]:
+        """Drop every partition that ends on or before cutoff."""
+        dropped = self.expired_partitions(cutoff)
+        for month in dropped:
+            self.drop_partition(month)
+        return dropped
+
+
+class NativePartitionBackend(PartitionBackend):
+    """PostgreSQL declarative partitioning; the DB routes rows."""
+
+    def is_partitioned(self) -> bool:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+                [PARENT_TABLE],
+            )
+            return cursor.fetchone() is not None
+
+    def _legacy_foreign_keys(self, cursor) -> List[tuple]:
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [LEGACY_TABLE],
+        )
+        return cursor.fetchall()
+
+    def _legacy_indexes(self, cursor) -> List[tuple]:
+        # plain indexes only: the pk on id alone cannot exist on the parent
+        cursor.execute(
+            "SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x "
+            "JOIN pg_class i ON i.oid = x.indexrelid "
+            "WHERE x.indrelid = %s::regclass AND NOT x.indisunique",
+            [LEGACY_TABLE],
+        )
+        return cursor.fetchall()
+
+    def setup(self, months_ahead: Optional[int] = None) -> None:
+        """
+        One-time conversion: the existing table becomes a legacy partition
+        covering everything before the current month, and a DEFAULT
+        partition catches rows past the last created month.
+
+        CREATE TABLE ... (LIKE ...) copies neither foreign keys nor
+        indexes: both are recreated on the parent under their original
+        names (so on_delete=SET_NULL updates and later migrations keep
+        working), and the legacy table hands its identity to the parent,
+        since an attached partition may not have its own.
+        """
+        if self.is_partitioned():
+            return
+
+        quote = self.connection.ops.quote_name
+        parent = quote(PARENT_TABLE)
+        legacy = quote(LEGACY_TABLE)
+        current = month_of(datetime.now(dt_timezone.utc))
+        start, _ = month_bounds(current)
+        on_legacy = re.compile(rf' ON (ONLY )?(\S+\.)?"?{LEGACY_TABLE}"? ')
+
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {parent} RENAME TO {legacy}")
+            cursor.execute(
+                f"CREATE TABLE {parent} (LIKE {legacy} INCLUDING DEFAULTS "
+                f"INCLUDING IDENTITY) PARTITION BY RANGE (\"timestamp\")"
+            )
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {legacy}), 0) + 1, false)",
+                [PARENT_TABLE],
+            )
+            cursor.execute(f"ALTER TABLE {legacy} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+            cursor.execute(f"ALTER TABLE {parent} ADD PRIMARY KEY (id, \"timestamp\")")
+
+            for name, definition in self._legacy_foreign_keys(cursor):
+                cursor.execute(f"ALTER TABLE {parent} ADD CONSTRAINT {quote(name)} {definition}")
+
+            for name, definition in self._legacy_indexes(cursor):
+                cursor.execute(f"ALTER INDEX {quote(name)} RENAME TO {quote(name[:55] + '_legacy')}")
+                # partitioned index: attached to the legacy copy on ATTACH
+                cursor.execute(on_legacy.sub(f" ON {parent} ", definition, count=1))
+
+            cursor.execute(
+                f"ALTER TABLE {parent} ATTACH PARTITION {legacy} "
+                f"FOR VALUES FROM (MINVALUE) TO (%s)",
+                [start],
+            )
+            cursor.execute(
+                f"CREATE TABLE {quote(DEFAULT_TABLE)} PARTITION OF {parent} DEFAULT"
+            )
+
+        self.ensure_upcoming(months_ahead)
+
+    def ensure_partition(self, month: date) -> bool:
+        if month in self._known:
+            return False
+
+        quote = self.connection.ops.quote_name
+        parent = quote(PARENT_TABLE)
+        name = quote(partition_name(month))
+        start, end = month_bounds(month)
+
+        # rows of the month may already sit in the DEFAULT partition, which
+        # would make a plain CREATE ... PARTITION OF fail: build the table
+        # detached, move them over, then attach
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [partition_name(month)])
+            if not cursor.fetchone()[0]:
+                cursor.execute(
+                    f"CREATE TABLE {name} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                )
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {quote(DEFAULT_TABLE)} "
+                    f"WHERE \"timestamp\" >= %s AND \"timestamp\" < %s RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved",
+                    [start, end],
+                )
+                cursor.execute(
+                    f"ALTER TABLE {parent} ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM (%s) TO (%s)",
+                    [start, end],
+                )
+
+        self._remember(month)
+        return True
+
+    def drop_partition(self, month: date) -> None:
+        quote = self.connection.ops.quote_name
+        name = quote(partition_name(month))
+
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {quote(PARENT_TABLE)} DETACH PARTITION {name}")
+            cursor.execute(f"DROP TABLE {name}")
+
+        self._known.discard(month)
+
+
+_backends: Dict[str, PartitionBackend] = {}
+
+
+def get_backend(using: str = "default") -> PartitionBackend:
+    backend = _backends.get(using)
+    if backend is None:
+        vendor = connections[using].vendor
+        if vendor != "postgresql":
+            raise ImproperlyConfigured(
+                f"AUDIT_LOG_PARTITIONING needs PostgreSQL (native partitions), not {vendor}"
+            )
+        backend = NativePartitionBackend(using)
+        _backends[using] = backend
+    return backend
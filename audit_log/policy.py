@@ -0,0 +1,219 @@
+# audit_log/policy.py
+
+"""
+Write-side policies for noisy audit sources.
+
+AUDIT_LOG_POLICIES is a list of rules; the first one matching an event's
+resource, action and source (case-insensitive, missing or "*" = any)
+decides:
+
+    {"resource": "Report", "action": "export", "source": "api",
+     "policy": "sample", "every": 10}             # keep 1 in 10
+    {"resource": "*", "action": "view",
+     "policy": "rate_limit", "rate": 5, "burst": 20}  # token bucket, per second
+    {"resource": "Session", "policy": "drop"}
+    {"resource": "User", "policy": "keep"}
+
+Events matching no rule are kept. Actions in
+AUDIT_LOG_POLICY_ALWAYS_KEEP_ACTIONS bypass the rules entirely, and so
+do the create / update / delete events of audited model instances
+(HISTORY_ACTIONS with a content type): audit_log.history replays every
+one of them, so a sampled update would make state_at() wrong. Rules
+therefore thin out free-form events (views, exports, API calls logged
+through audit_log.api.public.log) rather than model changes.
+
+Samplers and buckets are kept per (rule, resource, action, source) in
+this process; every suppressed event is counted in
+audit_log_suppressed_events_total, so volume stays accountable.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.core.exceptions import ImproperlyConfigured
+
+from audit_log.conf import get_setting
+from audit_log.metrics import audit_log_suppressed_events_total
+
+KEEP = "keep"
+SAMPLE = "sample"
+RATE_LIMIT = "rate_limit"
+DROP = "drop"
+
+POLICIES = (KEEP, SAMPLE, RATE_LIMIT, DROP)
+
+# events of a model instance that history replays: never suppressed
+HISTORY_ACTIONS = frozenset({
+    "create",
+    "update",
+    "delete",
+    "soft_delete",
+    "hard_delete",
+    "restore",
+    "bulk_update",
+    "bulk_delete",
+})
+
+Key = Tuple[str, str, str]
+
+
+class TokenBucket:
+    """rate tokens per second, at most burst stored; one token per event."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class Rule:
+    def __init__(self, config: dict):
+        self.resource = _pattern(config.get("resource"))
+        self.action = _pattern(config.get("action"))
+        self.source = _pattern(config.get("source"))
+        self.policy = config.get("policy", KEEP)
+
+        if self.policy not in POLICIES:
+            raise ImproperlyConfigured(
+                f"AUDIT_LOG_POLICIES: unknown policy {self.policy!r} "
+                f"(expected one of {', '.join(POLICIES)})"
+            )
+
+        self.every = int(config.get("every", 1))
+        self.rate = float(config.get("rate", 0))
+        self.burst = float(config.get("burst", max(self.rate, 1)))
+
+        if self.policy == SAMPLE and self.every < 1:
+            raise ImproperlyConfigured("AUDIT_LOG_POLICIES: 'every' must be >= 1")
+        if self.policy == RATE_LIMIT and self.rate <= 0:
+            raise ImproperlyConfigured("AUDIT_LOG_POLICIES: 'rate' must be > 0")
+
+        self._seen: Dict[Key, int] = {}
+        self._buckets: Dict[Key, TokenBucket] = {}
+
+    def matches(self, key: Key) -> bool:
+        return all(
+            pattern is None or pattern == value
+            for pattern, value in zip((self.resource, self.action, self.source), key)
+        )
+
+    def allows(self, key: Key) -> bool:
+        """Decide one event (callers hold the engine lock)."""
+        if self.policy == KEEP:
+            return True
+        if self.policy == DROP:
+            return False
+
+        if self.policy == SAMPLE:
+            # the 1st, (every+1)th, ... event of each key is kept
+            seen = self._seen.get(key, 0)
+            self._seen[key] = seen + 1
+            return seen % self.every == 0
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+        return bucket.take()
+
+
+def _pattern(value) -> Optional[str]:
+    if value in (None, "", "*"):
+        return None
+    return str(value).lower()
+
+
+class PolicyEngine:
+    def __init__(self, rules: List[dict], always_keep):
+        self.rules = [Rule(config) for config in rules]
+        self.always_keep = {action.lower() for action in always_keep}
+        self._lock = threading.Lock()
+
+    def decide(self, resource, action, source) -> Optional[Rule]:
+        """Return the rule suppressing this event, or None to keep it."""
+        key = (
+            (resource or "").lower(),
+            (action or "").lower(),
+            (source or "").lower(),
+        )
+        if key[1] in self.always_keep:
+            return None
+
+        for rule in self.rules:
+            if rule.matches(key):
+                with self._lock:
+                    return None if rule.allows(key) else rule
+        return None
+
+
+# -----------------------------------------
+# 🎛️ process-wide engine (rebuilt when the settings change)
+# -----------------------------------------
+_engine: Optional[PolicyEngine] = None
+_engine_config = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Optional[PolicyEngine]:
+    """The engine for the current settings; None when no rule is configured."""
+    global _engine, _engine_config
+
+    # compared by identity: the setting objects only change on reconfiguration
+    rules = get_setting("POLICIES")
+    always_keep = get_setting("POLICY_ALWAYS_KEEP_ACTIONS")
+    config = (rules, always_keep)
+
+    stale = _engine_config is None or any(
+        current is not previous for current, previous in zip(config, _engine_config)
+    )
+    if stale:
+        with _engine_lock:
+            _engine = PolicyEngine(rules, always_keep or ()) if rules else None
+            _engine_config = config
+    return _engine
+
+
+def reset() -> None:
+    """Forget sampler positions and bucket levels (tests)."""
+    global _engine, _engine_config
+    with _engine_lock:
+        _engine = None
+        _engine_config = None
+
+
+def should_write(entry) -> bool:
+    """
+    Apply the configured policies to an unsaved AuditLog.
+
+    Suppressed events are counted by resource, action, source and policy.
+    Model change events (content type + HISTORY_ACTIONS) are always kept.
+    """
+    engine = get_engine()
+    if engine is None:
+        return True
+
+    if entry.content_type_id is not None and (entry.action or "").lower() in HISTORY_ACTIONS:
+        return True
+
+    source = entry.source or ""
+    rule = engine.decide(entry.resource, entry.action, source)
+    if rule is None:
+        return True
+
+    audit_log_suppressed_events_total.labels(
+        resource=entry.resource or "",
+        action=entry.action or "",
+        source=source,
+        policy=rule.policy,
+    ).inc()
+    return False
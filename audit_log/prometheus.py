@@ -0,0 +1,197 @@
+# audit_log/prometheus.py
+
+"""
+Prometheus multiprocess mode (AUDIT_LOG_PROMETHEUS_MULTIPROC_DIR).
+
+Every worker writes its metric values to mmap-backed files in a shared
+directory and /metrics/ aggregates all of them at scrape time, so each
+scrape sees the totals of every gunicorn worker, not one random worker.
+
+Dead workers are handled at scrape time (and by the gunicorn
+child_exit hook): their live gauges are removed and their counter /
+histogram files are folded into one *_archive.db file per type, so
+totals never go backwards and the scrape cost follows the number of
+live workers, not every worker that ever ran.
+"""
+
+import fcntl
+import glob
+import logging
+import os
+import re
+from contextlib import contextmanager
+from typing import List, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+
+from audit_log.conf import get_setting
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = "PROMETHEUS_MULTIPROC_DIR"
+
+# metric types whose values accumulate and must survive their process
+ARCHIVED_TYPES = ("counter", "histogram", "summary")
+
+_PID_FILE_RE = re.compile(r"_(\d+)\.db$")
+
+
+def multiprocess_dir() -> Optional[str]:
+    """The shared metrics directory, or None in single-process mode."""
+    directory = os.environ.get(ENV_VAR)
+    if directory:
+        return directory
+
+    try:
+        return get_setting("PROMETHEUS_MULTIPROC_DIR")
+    except ImproperlyConfigured:
+        # gunicorn master without Django settings
+        return None
+
+
+def setup_multiprocess(directory: Optional[str] = None) -> Optional[str]:
+    """
+    Switch prometheus_client to file-backed values.
+
+    Must run before the audit metrics are created (audit_log.metrics
+    calls it first thing). Exporting the env var also hands the
+    directory to any process started from this one.
+    """
+    directory = directory or multiprocess_dir()
+    if not directory:
+        return None
+
+    os.makedirs(directory, exist_ok=True)
+    os.environ[ENV_VAR] = directory
+
+    from prometheus_client import values
+
+    # the value class is picked at import time: re-pick it in case
+    # prometheus_client was imported before the directory was known
+    values.ValueClass = values.get_value_class()
+    return directory
+
+
+def is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by someone else
+    return True
+
+
+@contextmanager
+def _locked(directory: str):
+    # scrapes in several workers may prune at the same time
+    with open(os.path.join(directory, ".prune.lock"), "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _pids(directory: str) -> List[int]:
+    pids = set()
+    for path in glob.glob(os.path.join(directory, "*.db")):
+        match = _PID_FILE_RE.search(os.path.basename(path))
+        if match:
+            pids.add(int(match.group(1)))
+    return sorted(pids)
+
+
+def _archive(directory: str, metric_type: str, path: str) -> None:
+    """Add the values of a dead worker's file to {type}_archive.db."""
+    from prometheus_client.mmap_dict import MmapedDict
+
+    archive = os.path.join(directory, f"{metric_type}_archive.db")
+    totals = {}
+    for source in (archive, path):
+        if os.path.exists(source):
+            for key, value, _timestamp, _pos in MmapedDict.read_all_values_from_file(source):
+                totals[key] = totals.get(key, 0.0) + value
+
+    # write aside and swap: a concurrent scrape never reads a half file
+    tmp = f"{archive}.tmp"
+    merged = MmapedDict(tmp)
+    try:
+        for key, value in totals.items():
+            merged.write_value(key, value, 0.0)
+    finally:
+        merged.close()
+
+    os.replace(tmp, archive)
+    os.remove(path)
+
+
+def prune_dead_workers(directory: Optional[str] = None) -> List[int]:
+    """
+    Clean up after workers that are gone. Returns their pids.
+    """
+    from prometheus_client import multiprocess
+
+    directory = directory or multiprocess_dir()
+    if not directory or not os.path.isdir(directory):
+        return []
+
+    dead = []
+    with _locked(directory):
+        for pid in _pids(directory):
+            if pid == os.getpid() or is_alive(pid):
+                continue
+
+            multiprocess.mark_process_dead(pid, directory)
+            for metric_type in ARCHIVED_TYPES:
+                path = os.path.join(directory, f"{metric_type}_{pid}.db")
+                if os.path.exists(path):
+                    _archive(directory, metric_type, path)
+            dead.append(pid)
+
+    return dead
+
+
+def get_registry():
+    """Registry to expose: aggregated across workers in multiprocess mode."""
+    from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+
+    directory = multiprocess_dir()
+    if not directory:
+        return REGISTRY
+
+    try:
+        prune_dead_workers(directory)
+    except Exception:
+        # ✅ fail-safe: a failed prune must not break the scrape
+        logger.exception("Failed to prune dead Prometheus worker files")
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=directory)
+    return registry
+
+
+# -----------------------------------------
+# 🦄 gunicorn hooks (see config/gunicorn.conf.py)
+# -----------------------------------------
+def on_starting(server):
+    """Start every deployment with an empty metrics directory."""
+    directory = multiprocess_dir()
+    if not directory:
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "*.db")):
+        os.remove(path)
+    os.environ[ENV_VAR] = directory  # inherited by the workers
+
+
+def child_exit(server, worker):
+    directory = multiprocess_dir()
+    if not directory:
+        return
+
+    try:
+        prune_dead_workers(directory)
+    except Exception:
+        logger.exception("Failed to clean up Prometheus files of worker %s", worker.pid)
@@ -0,0 +1,255 @@
+# audit_log/registry.py
+
+from decimal import Decimal, InvalidOperation
+from operator import itemgetter
+from typing import Collection, Dict, Iterable, Optional, Tuple
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models.fields.files import FieldFile
+
+from audit_log.conf import get_setting
+from audit_log.constants import IGNORED_FIELDS
+
+# placeholder for fields that were deferred when the row was loaded
+DEFERRED = object()
+
+_json_encoder = DjangoJSONEncoder()
+
+
+def to_json_value(value, field: Optional[models.Field] = None):
+    """
+    Make a model field value safe for AuditLog.changes (JSONField).
+
+    With ``field`` the value is first normalised the way the column
+    stores it, so an assigned "13" and a loaded Decimal("10.00") end up
+    as the same type ("13.00" / "10.00") in a diff.
+    """
+    if field is not None and value is not None:
+        value = _normalise(value, field)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, FieldFile):
+        return value.name or None
+    if isinstance(value, models.Model):
+        return value.pk
+    try:
+        return _json_encoder.default(value)
+    except TypeError:
+        return str(value)
+
+
+def _normalise(value, field: models.Field):
+    try:
+        value = field.to_python(value)
+    except (ValidationError, TypeError, ValueError):
+        return value
+    if isinstance(value, Decimal) and getattr(field, "decimal_places", None) is not None:
+        try:
+            value = value.quantize(Decimal(1).scaleb(-field.decimal_places))
+        except InvalidOperation:
+            pass
+    return value
+
+
+class AuditedModel:
+    """
+    Precomputed audit metadata for one model.
+
+    Built once at startup so the save path never has to inspect _meta.
+    """
+
+    __slots__ = (
+        "model",
+        "label",
+        "resource",
+        "tracked_fields",
+        "field_index",
+        "_attnames",
+        "_db_getter",
+        "_content_type_id",
+    )
+
+    def __init__(self, model):
+        self.model = model
+        self.label = model._meta.label
+        self.resource = model.__name__
+        self.tracked_fields: Tuple[models.Field, ...] = tuple(
+            field
+            for field in model._meta.concrete_fields
+            if not field.primary_key and field.name not in IGNORED_FIELDS
+        )
+
+        # snapshot layout: one tuple slot per tracked field
+        self.field_index: Dict[str, int] = {}
+        for i, field in enumerate(self.tracked_fields):
+            # update_fields may name a FK either way: "owner" / "owner_id"
+            self.field_index[field.name] = i
+            self.field_index[field.attname] = i
+        self._attnames = tuple(field.attname for field in self.tracked_fields)
+
+        # from_db() receives values in concrete field order when nothing
+        # is deferred: pick tracked slots straight out of that row
+        concrete = list(model._meta.concrete_fields)
+        positions = [concrete.index(field) for field in self.tracked_fields]
+        if len(positions) == 1:
+            position = positions[0]
+            self._db_getter = lambda row: (row[position],)
+        elif positions:
+            self._db_getter = itemgetter(*positions)
+        else:
+            self._db_getter = lambda row: ()
+
+        self._content_type_id: Optional[int] = None
+
+    @property
+    def content_type_id(self) -> int:
+        # lazy: the contenttypes table may not exist yet at ready()
+        if self._content_type_id is None:
+            from django.contrib.contenttypes.models import ContentType
+
+            self._content_type_id = ContentType.objects.get_for_model(
+                self.model,
+                for_concrete_model=False,
+            ).id
+        return self._content_type_id
+
+    # -----------------------------------------
+    # 📸 snapshots (tuple keyed by field_index)
+    # -----------------------------------------
+    def snapshot_from_db(self, field_names, values) -> tuple:
+        """Build a snapshot from the row passed to Model.from_db()."""
+        if len(values) == len(self.model._meta.concrete_fields):
+            return self._db_getter(values)
+
+        loaded = dict(zip(field_names, values))
+        return tuple(loaded.get(attname, DEFERRED) for attname in self._attnames)
+
+    def snapshot(
+        self,
+        instance,
+        previous: Optional[tuple] = None,
+        fields: Optional[Collection[str]] = None,
+    ) -> tuple:
+        """
+        Snapshot current instance values.
+
+        With `fields`, only those slots are refreshed from the instance and
+        the rest are kept from `previous` (e.g. save(update_fields=...)).
+        Deferred fields are never read (that would be one query each):
+        their slot keeps its previous value, or DEFERRED.
+        """
+        deferred = instance.get_deferred_fields()
+
+        if fields is None or previous is None:
+            indexes = range(len(self._attnames))
+        else:
+            indexes = [self.field_index[n] for n in fields if n in self.field_index]
+
+        current = list(previous) if previous is not None else [DEFERRED] * len(self._attnames)
+        for index in indexes:
+            attname = self._attnames[index]
+            if attname not in deferred:
+                current[index] = getattr(instance, attname)
+        return tuple(current)
+
+    def diff(
+        self,
+        snapshot: tuple,
+        instance,
+        fields: Optional[Collection[str]] = None,
+    ) -> dict:
+        """
+        Changed tracked fields as {field: {"before": ..., "after": ...}},
+        the same shape as audit_log.utils.compute_changes().
+        """
+        changes = {}
+
+        if fields is None:
+            indexes = range(len(self.tracked_fields))
+        else:
+            indexes = [self.field_index[n] for n in fields if n in self.field_index]
+
+        for i in indexes:
+            before = snapshot[i]
+            if before is DEFERRED:
+                continue
+
+            after = getattr(instance, self._attnames[i])
+            if before != after:
+                field = self.tracked_fields[i]
+                changes[field.name] = {
+                    "before": to_json_value(before, field),
+                    "after": to_json_value(after, field),
+                }
+
+        return changes
+
+    def __repr__(self):
+        return f"<AuditedModel {self.label}>"
+
+
+def _matches(model, patterns: Iterable[str]) -> bool:
+    app_label = model._meta.app_label
+    label = model._meta.label_lower
+
+    for pattern in patterns:
+        pattern = pattern.lower()
+        if pattern == app_label or pattern == label:
+            return True
+    return False
+
+
+class AuditModelRegistry:
+    """
+    Which models are audited, resolved from AUDIT_LOG_INCLUDE_MODELS /
+    AUDIT_LOG_EXCLUDE_MODELS at AuditLogConfig.ready().
+    """
+
+    def __init__(self):
+        self._models: Dict[type, AuditedModel] = {}
+
+    def build(self) -> "AuditModelRegistry":
+        include = get_setting("INCLUDE_MODELS")
+        exclude = get_setting("EXCLUDE_MODELS") or ()
+
+        self._models = {}
+        for model in apps.get_models():
+            if _matches(model, exclude):
+                continue
+            if include is not None and not _matches(model, include):
+                continue
+            self._models[model] = AuditedModel(model)
+
+        return self
+
+    def get(self, model) -> Optional[AuditedModel]:
+        return self._models.get(model)
+
+    def is_audited(self, model) -> bool:
+        return model in self._models
+
+    def __iter__(self):
+        return iter(self._models.values())
+
+    def __len__(self):
+        return len(self._models)
+
+
+registry = AuditModelRegistry()
+
+
+def content_type_id_for(model) -> int:
+    """
+    ContentType id stored on audit rows of model, without a query after
+    the first call (registry metadata, else ContentTypeManager's cache).
+    """
+    meta = registry.get(model)
+    if meta is not None:
+        return meta.content_type_id
+
+    from django.contrib.contenttypes.models import ContentType
+
+    return ContentType.objects.get_for_model(model, for_concrete_model=False).id
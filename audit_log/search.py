@@ -0,0 +1,91 @@
+# audit_log/search.py
+
+"""
+Full-text index over audit log text columns (created by migration 0010).
+
+- SQLite: contentless FTS5 table (rowid = AuditLog.id) kept in sync by
+  triggers on the audit table.
+- PostgreSQL: GIN index on a to_tsvector() expression over the same columns.
+
+Every word is a prefix match, so "dup" finds "duplicate" but "plicate"
+does not. Text that is not plain words (punctuation, e-mail addresses,
+…) and backends without an index return None and callers fall back to
+icontains.
+"""
+
+import re
+from typing import Iterable, List, Optional
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "audit_log_auditlog_fts"
+FTS_COLUMNS = ("description", "resource", "action", "object_id")
+PG_INDEX = "audit_log_auditlog_fts_gin"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# aliases whose FTS5 table is known to exist (positives only)
+_installed = set()
+
+
+# -----------------------------------------
+# 🧱 schema (created by migration 0010)
+# -----------------------------------------
+def _pg_document(alias: str = "") -> str:
+    prefix = f"{alias}." if alias else ""
+    parts = " || ' ' || ".join(f"COALESCE({prefix}{c}, '')" for c in FTS_COLUMNS)
+    return f"to_tsvector('simple', {parts})"
+
+
+def fts_installed(using: str = "default") -> bool:
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor != "sqlite":
+        return False
+
+    if using not in _installed:
+        with connection.cursor() as cursor:
+            if FTS_TABLE not in connection.introspection.table_names(cursor):
+                return False
+        _installed.add(using)
+    return True
+
+
+# -----------------------------------------
+# 🔎 query
+# -----------------------------------------
+def tokenize(text: str) -> List[str]:
+    return [token.lower() for token in _TOKEN_RE.findall(text or "")]
+
+
+def match_ids(text: str, columns: Iterable[str] = FTS_COLUMNS, using: str = "default") -> Optional[RawSQL]:
+    """
+    Subquery of AuditLog ids matching every word of text (prefix match),
+    or None if there is nothing to match or no index to use.
+    """
+    tokens = tokenize(text)
+    columns = [c for c in columns if c in FTS_COLUMNS]
+    if tokens != (text or "").lower().split():
+        return None  # not plain words: the index would split or drop characters
+    if not tokens or not columns or not fts_installed(using):
+        return None
+
+    vendor = connections[using].vendor
+
+    if vendor == "sqlite":
+        scope = "{" + " ".join(columns) + "} : " if len(columns) < len(FTS_COLUMNS) else ""
+        expression = " AND ".join(f'{scope}"{token}"*' for token in tokens)
+        return RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            (expression,),
+        )
+
+    # postgresql: one expression index, so matching spans all indexed columns
+    query = " & ".join(f"{token}:*" for token in tokens)
+    return RawSQL(
+        f"SELECT id FROM audit_log_auditlog "
+        f"WHERE {_pg_document()} @@ to_tsquery('simple', %s)",
+        (query,),
+    )
@@ -2,10 +2,14 @@
 
 from django.contrib.contenttypes.models import ContentType
 from .models import AuditLog
+from .writer import write
 
-def log_action(*, user, action: str, instance, source: str):
+def log_action(*, user, action: str, instance, source: str, changes=None):
     """
     Central service to create an AuditLog entry.
+
+    changes: optional field diffs, e.g. history.removal_changes(instance)
+    for a hard delete so the object's history can still be replayed.
     """
     if not user.is_authenticated:
         # Prevent logging for anonymous users if necessary, 
@@ -17,14 +21,16 @@ def log_action(*, user, action: str, instance, source: str):
     # Get the content type of the affected instance (e.g., Product)
     content_type = ContentType.objects.get_for_model(instance)
 
-    # Create the log entry
-    AuditLog.objects.create(
+    # Create the log entry (deferred to commit / buffered when configured)
+    write(AuditLog(
         user=user,
         action=action,
+        resource=type(instance).__name__,
         source=source,
         content_type=content_type,
         object_id=instance.pk,
-    )
+        changes=changes,
+    ), path="service")
 
     # OPTIONAL: You can return the created log object if needed, 
     # but for simplicity, we keep it as a side-effect function.
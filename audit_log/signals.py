@@ -1,58 +1,98 @@
-import sys
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from django.contrib.contenttypes.models import ContentType
-from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
 
+from audit_log.coalesce import coalesce
+from audit_log.metrics import audit_log_dropped_events_total
 from audit_log.models import AuditLog
+from audit_log.registry import registry
+from audit_log.writer import write
 from audit_log.context import (
-    get_current_user,
+    forget_session_user,
+    get_current_user_id,
     is_audit_logging_disabled,
 )
 
-# ⛔ HARD STOP — do NOT even register signals during migrate / test
-if any(cmd in sys.argv for cmd in ["migrate", "makemigrations", "pytest", "test"]):
-    pass
-else:
 
-    @receiver(post_save)
-    def audit_log_post_save(sender, instance, created, **kwargs):
+def audit_log_post_save(sender, instance, created, **kwargs):
+    # ⛔ raw saves (fixtures, migrations)
+    if kwargs.get("raw", False):
+        return
 
-        if not apps.ready:
-            return
+    if is_audit_logging_disabled():
+        return
 
-        # ⛔ never log audit log itself
-        if sender is AuditLog:
-            return
+    meta = registry.get(sender)
+    if meta is None:
+        return
 
-        # ⛔ never log django migration models
-        if sender.__module__.startswith("django.db.migrations"):
-            return
+    try:
+        changes = None
 
-        # ⛔ raw saves (fixtures, migrations)
-        if kwargs.get("raw", False):
-            return
+        # AuditModel subclasses carry a from_db() snapshot: diff in memory
+        snapshot = getattr(instance, "_audit_snapshot", None)
+        if not created and snapshot is not None:
+            changes = meta.diff(snapshot, instance, kwargs.get("update_fields")) or None
 
-        if is_audit_logging_disabled():
-            return
+        entry = AuditLog(
+            user_id=get_current_user_id(),
+            action="create" if created else "update",
+            resource=meta.resource,
+            content_type_id=meta.content_type_id,
+            object_id=str(instance.pk),
+            source="signal",
+            changes=changes,
+        )
 
-        try:
-            user = get_current_user()
+        # in a request: repeated saves of the object become one row
+        if not coalesce(entry, diffed=snapshot is not None, using=kwargs.get("using") or "default"):
+            write(entry, path="signal")
 
-            content_type = ContentType.objects.get_for_model(
-                sender,
-                for_concrete_model=False,
-            )
+    except Exception:
+        # ✅ ABSOLUTELY FAIL‑SAFE
+        audit_log_dropped_events_total.labels(reason="error").inc()
+        return
 
-            AuditLog.objects.create(
-                user=user,
-                action="create" if created else "update",
-                resource=sender.__name__,
-                content_type=content_type,
-                object_id=str(instance.pk),
-                source="signal",
-            )
 
-        except Exception:
-            # ✅ ABSOLUTELY FAIL‑SAFE
-            return
+def forget_verified_session(sender, instance, **kwargs):
+    # password, is_active or existence may have changed: verify again
+    forget_session_user(instance.pk)
+
+
+def connect_signals():
+    """
+    Connect post_save only to audited models.
+
+    Unaudited models (sessions, tokens, contenttypes, migrations, the
+    audit log itself) get no receiver at all, so their saves pay nothing.
+    The user model also drops its cached session verification
+    (audit_log.context.get_current_user_id) when saved or deleted.
+    """
+    for meta in registry:
+        post_save.connect(
+            audit_log_post_save,
+            sender=meta.model,
+            dispatch_uid=f"audit_log_post_save:{meta.label}",
+        )
+
+    user_model = get_user_model()
+    for signal in (post_save, post_delete):
+        signal.connect(
+            forget_verified_session,
+            sender=user_model,
+            dispatch_uid="audit_log_forget_verified_session",
+        )
+
+
+def disconnect_signals():
+    for meta in registry:
+        post_save.disconnect(
+            sender=meta.model,
+            dispatch_uid=f"audit_log_post_save:{meta.label}",
+        )
+
+    user_model = get_user_model()
+    for signal in (post_save, post_delete):
+        signal.disconnect(
+            sender=user_model,
+            dispatch_uid="audit_log_forget_verified_session",
+        )
@@ -0,0 +1,163 @@
+# audit_log/stats.py
+
+"""
+Hourly rollup of audit events (AuditLogHourlyStat).
+
+record() runs on every AuditLog insert path (save and bulk_create) and
+turns a batch into one INSERT ... ON CONFLICT DO UPDATE that adds the
+batch's per-bucket counts, in the insert's transaction. discount()
+takes deleted rows back out (retention), forget() drops whole hours.
+rebuild() recomputes a time range from the raw table (backfill).
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Iterable
+
+from django.db import connections, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.db.models.functions import TruncHour
+
+from audit_log.conf import get_setting
+from audit_log.models import AuditLog, AuditLogHourlyStat
+
+STAT_COLUMNS = ("hour", "resource", "action", "status")
+
+
+def hour_of(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(dt_timezone.utc)
+    else:
+        value = value.replace(tzinfo=dt_timezone.utc)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def count_buckets(entries: Iterable) -> Counter:
+    return Counter(
+        (hour_of(entry.timestamp), entry.resource or "", entry.action, entry.status or "")
+        for entry in entries
+    )
+
+
+def stats_enabled() -> bool:
+    return bool(get_setting("HOURLY_STATS"))
+
+
+def record(entries, using: str = "default") -> None:
+    """Add the entries to their hourly buckets (no-op when disabled)."""
+    if not entries or not stats_enabled():
+        return
+    upsert(count_buckets(entries), using=using)
+
+
+def upsert(deltas: Counter, using: str = "default") -> None:
+    if not deltas:
+        return
+
+    connection = connections[using]
+
+    if connection.vendor not in ("sqlite", "postgresql"):
+        _upsert_fallback(deltas, using)
+        return
+
+    quote = connection.ops.quote_name
+    table = quote(AuditLogHourlyStat._meta.db_table)
+    columns = ", ".join(quote(c) for c in STAT_COLUMNS)
+    count = quote("count")
+
+    params = []
+    for (hour, resource, action, status), delta in deltas.items():
+        params += [
+            connection.ops.adapt_datetimefield_value(hour),
+            resource,
+            action,
+            status,
+            delta,
+        ]
+
+    values = ", ".join(["(%s, %s, %s, %s, %s)"] * len(deltas))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}, {count}) VALUES {values} "
+            f"ON CONFLICT ({columns}) DO UPDATE "
+            f"SET {count} = {table}.{count} + excluded.{count}",
+            params,
+        )
+
+
+def _upsert_fallback(deltas: Counter, using: str) -> None:
+    stats = AuditLogHourlyStat.objects.using(using)
+    with transaction.atomic(using=using):
+        for (hour, resource, action, status), delta in deltas.items():
+            bucket = dict(hour=hour, resource=resource, action=action, status=status)
+            if not stats.filter(**bucket).update(count=F("count") + delta):
+                stats.create(count=delta, **bucket)
+
+
+def _buckets(queryset):
+    return (
+        queryset
+        .annotate(bucket=TruncHour("timestamp", tzinfo=dt_timezone.utc))
+        .values("bucket", "resource", "action", "status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+
+
+def discount(queryset) -> None:
+    """Subtract the rows of queryset (about to be deleted) from their buckets."""
+    if not stats_enabled():
+        return
+
+    stats = AuditLogHourlyStat.objects.using(queryset.db)
+    for row in _buckets(queryset):
+        stats.filter(
+            hour=row["bucket"],
+            resource=row["resource"],
+            action=row["action"],
+            status=row["status"],
+        ).update(count=Greatest(F("count") - row["total"], 0))
+
+
+def forget(start: datetime, end: datetime, using: str = "default") -> None:
+    """Drop the buckets of [start, end) once every row of it is gone."""
+    if stats_enabled():
+        AuditLogHourlyStat.objects.using(using).filter(hour__gte=start, hour__lt=end).delete()
+
+
+def rebuild(start: datetime, end: datetime, using: str = "default") -> int:
+    """
+    Recompute the buckets of [start, end) from the raw table.
+
+    Runs one day at a time so memory is bounded by the buckets of a day.
+    Returns the number of buckets written.
+    """
+    written = 0
+    day = hour_of(start)
+
+    while day < end:
+        day_end = min(day + timedelta(days=1), end)
+
+        rows = _buckets(
+            AuditLog.objects.using(using).filter(timestamp__gte=day, timestamp__lt=day_end)
+        )
+
+        with transaction.atomic(using=using):
+            stats = AuditLogHourlyStat.objects.using(using)
+            stats.filter(hour__gte=day, hour__lt=day_end).delete()
+            created = stats.bulk_create(
+                AuditLogHourlyStat(
+                    hour=row["bucket"],
+                    resource=row["resource"],
+                    action=row["action"],
+                    status=row["status"],
+                    count=row["total"],
+                )
+                for row in rows
+            )
+            written += len(created)
+
+        day = day_end
+
+    return written
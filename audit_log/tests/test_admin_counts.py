@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from audit_log.counts import EstimatedCountPaginator, estimate_count, rollup_filters
+from audit_log.models import AuditLog, AuditLogHourlyStat
+
+HOUR = datetime(2026, 10, 1, 12, tzinfo=dt_timezone.utc)
+
+
+def make_logs(count, **fields):
+    fields.setdefault("action", "create")
+    fields.setdefault("resource", "Product")
+    AuditLog.objects.bulk_create(
+        AuditLog(timestamp=HOUR + timedelta(minutes=i % 60), **fields) for i in range(count)
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def unbounded_counts(queries):
+    return [
+        q["sql"] for q in queries
+        if "COUNT(*)" in q["sql"] and "audit_log_auditlog" in q["sql"] and "LIMIT" not in q["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_small_results_are_counted_exactly():
+    make_logs(4)
+
+    assert estimate_count(AuditLog.objects.all()) == (4, True)
+
+
+@pytest.mark.django_db
+@override_settings(AUDIT_LOG_ADMIN_EXACT_COUNT_THRESHOLD=5)
+def test_unfiltered_count_uses_table_statistics():
+    make_logs(8)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE audit_log_auditlog")
+    make_logs(4)  # statistics are now stale
+
+    with CaptureQueriesContext(connection) as ctx:
+        count, exact = estimate_count(AuditLog.objects.all())
+
+    assert (count, exact) == (8, False)
+    assert unbounded_counts(ctx.captured_queries) == []
+
+
+@pytest.mark.django_db
+@override_settings(AUDIT_LOG_ADMIN_EXACT_COUNT_THRESHOLD=5)
+def test_rollup_answers_filters_it_can_express():
+    make_logs(8)
+    # the rollup, not the table, is the source of the estimate
+    AuditLogHourlyStat.objects.filter(hour=HOUR, action="create").update(count=1000)
+
+    rollup = rollup_filters({"action__exact": "create", "timestamp__gte": "2026-10-01 00:00:00+00:00"})
+    queryset = AuditLog.objects.filter(action="create", timestamp__gte=HOUR.replace(hour=0))
+
+    assert estimate_count(queryset, rollup=rollup) == (1000, False)
+
+
+def test_rollup_filters_reject_what_the_rollup_cannot_answer():
+    assert rollup_filters({}) == {}
+    assert rollup_filters({"o": "1", "p": "2", "status__exact": "success"}) == {"status": "success"}
+    assert rollup_filters({"q": "price"}) is None
+    assert rollup_filters({"source__exact": "admin"}) is None
+    assert rollup_filters({"timestamp__gte": "2026-10-01 12:30:00+00:00"}) is None
+
+
+@pytest.mark.django_db
+@override_settings(AUDIT_LOG_ADMIN_EXACT_COUNT_THRESHOLD=5)
+def test_other_filters_fall_back_to_a_cached_count():
+    make_logs(7, source="admin")
+    queryset = AuditLog.objects.filter(source="admin")
+
+    assert estimate_count(queryset) == (7, False)
+    make_logs(3, source="admin")
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert estimate_count(queryset) == (7, False)
+    assert unbounded_counts(ctx.captured_queries) == []
+
+
+@pytest.mark.django_db
+@override_settings(AUDIT_LOG_ADMIN_EXACT_COUNT_THRESHOLD=5)
+def test_paginator_exposes_estimate():
+    make_logs(8)
+
+    paginator = EstimatedCountPaginator(AuditLog.objects.order_by("-timestamp"), 3, rollup={})
+
+    assert (paginator.count, paginator.exact, paginator.num_pages) == (8, False, 3)
+    assert len(paginator.page(1).object_list) == 3
+
+
+@pytest.mark.django_db
+@override_settings(AUDIT_LOG_ADMIN_EXACT_COUNT_THRESHOLD=5)
+def test_admin_changelist_never_counts_the_whole_table(client):
+    admin = get_user_model().objects.create_superuser(username="root", password="pass1234")
+    client.force_login(admin)
+    make_logs(60)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/admin/audit_log/auditlog/")
+        filtered = client.get("/admin/audit_log/auditlog/", {"action__exact": "create"})
+
+    assert response.status_code == 200
+    assert filtered.status_code == 200
+    assert unbounded_counts(ctx.captured_queries) == []
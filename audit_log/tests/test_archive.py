@@ -0,0 +1,182 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from audit_log.archive import (
+    HEADER_SIZE,
+    SegmentArchive,
+    find_segments,
+    iter_segment,
+    read_header,
+    segment_path,
+)
+from audit_log.management.commands.cleanup_audit_logs import Command
+from audit_log.models import AuditLog
+
+DAY = datetime(2025, 1, 10, 12, tzinfo=dt_timezone.utc)
+
+
+def row(pk, timestamp, **extra):
+    return {"id": pk, "timestamp": timestamp, "action": "create", **extra}
+
+
+def test_segments_are_split_per_day_with_header_index(tmp_path):
+    archive = SegmentArchive(tmp_path, block_rows=2)
+    archive.write_rows([
+        row(1, DAY),
+        row(2, DAY + timedelta(hours=1)),
+        row(3, DAY + timedelta(hours=2), changes={"price": {"before": 1, "after": 2}}),
+        row(4, DAY + timedelta(days=1)),
+    ])
+    archive.close()
+
+    assert [p.name for p in find_segments(tmp_path)] == [
+        "audit-2025-01-10.seg",
+        "audit-2025-01-11.seg",
+    ]
+
+    header = read_header(segment_path(tmp_path, date(2025, 1, 10)))
+    assert header["rows"] == 3
+    assert header["blocks"] == 2
+    assert (header["min_id"], header["max_id"]) == (1, 3)
+    assert header["min_timestamp"] == DAY.isoformat()
+    assert header["max_timestamp"] == (DAY + timedelta(hours=2)).isoformat()
+
+    rows = list(iter_segment(segment_path(tmp_path, date(2025, 1, 10))))
+    assert [r["id"] for r in rows] == [1, 2, 3]
+    assert rows[2]["changes"]["price"]["after"] == 2
+
+
+def test_segments_are_append_only_and_drop_torn_blocks(tmp_path):
+    path = segment_path(tmp_path, DAY.date())
+
+    archive = SegmentArchive(tmp_path)
+    archive.write_rows([row(1, DAY)])
+    archive.close()
+    size = read_header(path)["size"]
+
+    # a crash mid-append leaves bytes the header never recorded
+    with open(path, "ab") as fh:
+        fh.write(b"\x00\x00\x01\x00garbage")
+
+    archive = SegmentArchive(tmp_path)
+    archive.write_rows([row(2, DAY)])
+    archive.close()
+
+    header = read_header(path)
+    assert header["size"] > size > HEADER_SIZE
+    assert [r["id"] for r in iter_segment(path)] == [1, 2]
+
+
+@pytest.fixture
+def logs(db):
+    old = datetime.now(dt_timezone.utc) - timedelta(days=365)
+    AuditLog.objects.bulk_create(
+        [
+            AuditLog(action="create", resource=f"Old {i}", timestamp=old + timedelta(hours=i * 8))
+            for i in range(7)
+        ]
+        + [AuditLog(action="create", resource="Recent")]
+    )
+
+
+def archived_rows(directory):
+    return [r for path in find_segments(directory) for r in iter_segment(path)]
+
+
+def test_cleanup_archives_rows_before_deleting(logs, tmp_path):
+    out = StringIO()
+    call_command(
+        "cleanup_audit_logs", "--batch-size", "3", "--archive", str(tmp_path),
+        "--archive-chunk-size", "2", stdout=out,
+    )
+
+    assert "Archived 7 audit logs" in out.getvalue()
+    assert AuditLog.objects.count() == 1
+
+    rows = archived_rows(tmp_path)
+    assert sorted(r["resource"] for r in rows) == [f"Old {i}" for i in range(7)]
+    assert len(list(find_segments(tmp_path))) >= 2
+    assert sum(read_header(p)["rows"] for p in find_segments(tmp_path)) == 7
+
+
+def test_resumed_cleanup_does_not_archive_twice(logs, tmp_path, monkeypatch):
+    checkpoint = tmp_path / "cleanup.json"
+    archive_dir = tmp_path / "archive"
+    original = Command._delete_range
+    calls = {"n": 0}
+
+    def flaky_delete(self, queryset):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise KeyboardInterrupt  # after the batch was archived
+        return original(self, queryset)
+
+    args = ["--batch-size", "3", "--checkpoint", str(checkpoint), "--archive", str(archive_dir)]
+
+    monkeypatch.setattr(Command, "_delete_range", flaky_delete)
+    with pytest.raises(KeyboardInterrupt):
+        call_command("cleanup_audit_logs", *args, stdout=StringIO())
+
+    monkeypatch.setattr(Command, "_delete_range", original)
+    call_command("cleanup_audit_logs", *args, stdout=StringIO())
+
+    ids = [r["id"] for r in archived_rows(archive_dir)]
+    assert len(ids) == len(set(ids)) == 7
+    assert AuditLog.objects.count() == 1
+
+
+def test_only_the_current_day_segment_stays_open(tmp_path):
+    archive = SegmentArchive(tmp_path, block_rows=10)
+    archive.write_rows([row(1, DAY), row(2, DAY + timedelta(days=1))])
+
+    first_day = read_header(segment_path(tmp_path, DAY.date()))
+    assert first_day["rows"] == 1  # closed and synced when the day changed
+
+    archive.sync()
+    assert archive._writer.path == segment_path(tmp_path, (DAY + timedelta(days=1)).date())
+
+    archive.close()
+    assert archive._writer is None
+
+
+def test_rows_archived_again_are_skipped(tmp_path):
+    path = segment_path(tmp_path, DAY.date())
+
+    archive = SegmentArchive(tmp_path)
+    archive.write_rows([row(1, DAY), row(2, DAY)])
+    archive.close()
+
+    # a rerun after a crash replays the batch plus new rows
+    archive = SegmentArchive(tmp_path)
+    archive.write_rows([row(1, DAY), row(2, DAY), row(3, DAY)])
+    archive.close()
+
+    assert archive.rows_written == 1
+    assert read_header(path)["last_key"] == [DAY.isoformat(), 3]
+    assert [r["id"] for r in iter_segment(path)] == [1, 2, 3]
+
+
+def test_crash_before_checkpoint_does_not_archive_twice(logs, tmp_path, monkeypatch):
+    checkpoint = tmp_path / "cleanup.json"
+    archive_dir = tmp_path / "archive"
+    original = Command._save_checkpoint
+
+    def crash(self, *args, **kwargs):
+        raise KeyboardInterrupt  # segment synced, checkpoint never written
+
+    args = ["--batch-size", "3", "--checkpoint", str(checkpoint), "--archive", str(archive_dir)]
+
+    monkeypatch.setattr(Command, "_save_checkpoint", crash)
+    with pytest.raises(KeyboardInterrupt):
+        call_command("cleanup_audit_logs", *args, stdout=StringIO())
+    assert not checkpoint.exists()
+
+    monkeypatch.setattr(Command, "_save_checkpoint", original)
+    call_command("cleanup_audit_logs", *args, stdout=StringIO())
+
+    ids = [r["id"] for r in archived_rows(archive_dir)]
+    assert len(ids) == len(set(ids)) == 7
+    assert AuditLog.objects.count() == 1
@@ -0,0 +1,81 @@
+import pytest
+from django.test import override_settings
+
+from audit_log import buffer as audit_buffer
+from audit_log.api.public import log
+from audit_log.buffer import AuditLogBuffer
+from audit_log.models import AuditLog
+
+
+@pytest.fixture
+def fresh_buffer():
+    audit_buffer.shutdown_buffer()
+    yield
+    audit_buffer.shutdown_buffer()
+
+
+@pytest.mark.django_db
+def test_sync_mode_writes_immediately():
+    entry = log(action="create", resource="Thing")
+
+    assert entry.pk is not None
+    assert AuditLog.objects.count() == 1
+
+
+@pytest.mark.django_db
+@override_settings(
+    AUDIT_LOG_WRITE_MODE="buffered",
+    AUDIT_LOG_BUFFER_BATCH_SIZE=3,
+    AUDIT_LOG_BUFFER_FLUSH_INTERVAL=0,
+)
+def test_buffered_mode_flushes_on_batch_size(fresh_buffer, django_assert_num_queries):
+    log(action="create", resource="Thing")
+    log(action="update", resource="Thing")
+
+    # nothing written yet
+    assert AuditLog.objects.count() == 0
+
+    # third event triggers one bulk INSERT (+ one hourly stats upsert)
+    with django_assert_num_queries(2):
+        log(action="delete", resource="Thing")
+
+    assert AuditLog.objects.count() == 3
+    assert len(audit_buffer.get_buffer()) == 0
+
+
+@pytest.mark.django_db
+@override_settings(
+    AUDIT_LOG_WRITE_MODE="buffered",
+    AUDIT_LOG_BUFFER_BATCH_SIZE=100,
+    AUDIT_LOG_BUFFER_FLUSH_INTERVAL=0,
+)
+def test_shutdown_flushes_pending_events(fresh_buffer):
+    entry = log(action="create", resource="Thing")
+    assert entry.pk is None
+
+    audit_buffer.shutdown_buffer()
+
+    assert AuditLog.objects.filter(resource="Thing").count() == 1
+
+
+@pytest.mark.django_db
+def test_full_queue_applies_backpressure_instead_of_dropping():
+    buffer = AuditLogBuffer(max_size=2, batch_size=10, flush_interval=0)
+
+    for i in range(5):
+        buffer.put(AuditLog(action="create", resource=f"R{i}"))
+    buffer.flush()
+
+    assert AuditLog.objects.count() == 5
+
+
+@pytest.mark.django_db
+def test_buffered_rows_keep_event_timestamp():
+    buffer = AuditLogBuffer(max_size=10, batch_size=10, flush_interval=0)
+    entry = AuditLog(action="create", resource="Thing")
+    event_time = entry.timestamp
+
+    buffer.put(entry)
+    buffer.flush()
+
+    assert AuditLog.objects.get().timestamp == event_time
@@ -0,0 +1,187 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from audit_log.encoding import ColumnarEncoder, decode_changes, decode_ids, encode_ids
+from audit_log.models import AuditLog
+from products.models import Category, Product
+
+User = get_user_model()
+
+
+# ============================
+# 🗜 id set encoding
+# ============================
+
+def test_contiguous_ids_collapse_to_ranges():
+    encoded = encode_ids(list(range(1, 100_001)) + [200_000])
+
+    assert encoded["encoding"] == "ranges"
+    assert encoded["count"] == 100_001
+    assert encoded["ranges"] == [[1, 100_000], [200_000, 200_000]]
+
+
+def test_scattered_ids_use_bitmap():
+    ids = list(range(1, 10_000, 2))
+    encoded = encode_ids(ids)
+
+    assert encoded["encoding"] == "bitmap"
+    assert list(decode_ids(encoded)) == ids
+
+
+def test_non_integer_ids_fall_back_to_list():
+    encoded = encode_ids([1, 2, "a-uuid"])
+
+    assert encoded == {"encoding": "list", "count": 3, "ids": ["1", "2", "a-uuid"]}
+
+
+def test_unsorted_ids_are_rejected():
+    with pytest.raises(ValueError):
+        encode_ids([5, 3])
+
+
+# ============================
+# 🧱 columnar snapshots
+# ============================
+
+def test_columnar_snapshot_scales_with_runs_not_rows():
+    snapshot = ColumnarEncoder(["is_active"])
+    for pk in range(1, 100_001):
+        snapshot.add(pk, [pk <= 60_000])
+
+    assert snapshot.columns() == {"is_active": [[True, 60_000], [False, 40_000]]}
+    assert snapshot.ids.result()["ranges"] == [[1, 100_000]]
+
+
+def test_decode_changes_restores_rows():
+    snapshot = ColumnarEncoder(["is_active", "stock"])
+    snapshot.add(3, [True, 1])
+    snapshot.add(4, [True, 1])
+    snapshot.add(9, [False, 1])
+
+    decoded = decode_changes({
+        "format": "columnar",
+        "ids": snapshot.ids.result(),
+        "count": 3,
+        "before": snapshot.columns(),
+        "after": {"is_active": False},
+    })
+
+    assert decoded == {
+        "ids": [3, 4, 9],
+        "count": 3,
+        "before": [
+            {"id": 3, "is_active": True, "stock": 1},
+            {"id": 4, "is_active": True, "stock": 1},
+            {"id": 9, "is_active": False, "stock": 1},
+        ],
+        "after": {"is_active": False},
+    }
+
+
+def test_decode_changes_leaves_plain_payloads_alone():
+    assert decode_changes({"name": {"before": "a", "after": "b"}}) == {
+        "name": {"before": "a", "after": "b"},
+    }
+    assert decode_changes(None) is None
+
+
+# ============================
+# 📦 audited queryset mode
+# ============================
+
+@pytest.fixture
+def products(db):
+    owner = User.objects.create_user(username="owner", password="pass1234")
+    category = Category.objects.create(name="Bulk", slug="bulk")
+    return [
+        Product.objects.create(
+            category=category,
+            name=f"Product {i}",
+            sku=f"BULK-{i}",
+            price=10,
+            stock=1,
+            owner=owner,
+        )
+        for i in range(5)
+    ]
+
+
+def bulk_logs():
+    return AuditLog.objects.filter(action__startswith="bulk_")
+
+
+@pytest.mark.django_db
+def test_plain_update_is_not_audited(products):
+    Product.objects.update(stock=3)
+
+    assert not bulk_logs().exists()
+
+
+@pytest.mark.django_db
+def test_audited_update_logs_one_compact_event(products, django_assert_num_queries):
+    qs = Product.objects.audited(source="script")
+
+    # SELECT ids + UPDATE + INSERT audit log + stats upsert (+ savepoint pair)
+    with django_assert_num_queries(6):
+        updated = qs.update(stock=0)
+
+    assert updated == 5
+
+    log = bulk_logs().get()
+    assert log.action == "bulk_update"
+    assert log.resource == "Product"
+    assert log.source == "script"
+    assert log.changes["count"] == 5
+    assert log.changes["before"] == {"stock": [[1, 5]]}
+    assert log.changes["after"] == {"stock": 0}
+    assert list(decode_ids(log.changes["ids"])) == [p.pk for p in products]
+
+
+@pytest.mark.django_db
+def test_audited_soft_delete(products):
+    Product.objects.filter(pk__in=[p.pk for p in products[:2]]).audited().delete()
+
+    log = bulk_logs().get()
+    assert log.action == "bulk_delete"
+    assert log.changes["soft"] is True
+    assert log.changes["count"] == 2
+    assert log.changes["before"] == {"deleted_at": [[None, 2]]}
+    assert "deleted_at" in log.changes["after"]
+
+
+@pytest.mark.django_db
+def test_audited_hard_delete(products):
+    Product.objects.audited().hard_delete()
+
+    log = bulk_logs().get()
+    assert log.changes["soft"] is False
+    assert log.changes["count"] == 5
+    assert Product.all_objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_empty_statement_logs_nothing(products):
+    Product.objects.filter(stock=999).audited().update(stock=0)
+
+    assert not bulk_logs().exists()
+
+
+@pytest.mark.django_db
+def test_snapshot_rows_are_locked_until_the_statement(monkeypatch):
+    from django.db.models import QuerySet
+
+    locked = []
+    select_for_update = QuerySet.select_for_update
+
+    def spy(self, *args, **kwargs):
+        locked.append(self.model)
+        return select_for_update(self, *args, **kwargs)
+
+    monkeypatch.setattr(QuerySet, "select_for_update", spy)
+    owner = User.objects.create_user(username="locker", password="pass1234")
+    category = Category.objects.create(name="Locks", slug="locks")
+    Product.objects.create(category=category, name="P", sku="L-1", price=1, stock=1, owner=owner)
+
+    Product.objects.audited().update(stock=0)
+
+    assert locked == [Product]
@@ -0,0 +1,113 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from audit_log.management.commands.cleanup_audit_logs import Command
+from audit_log.models import AuditLog
+
+
+@pytest.fixture
+def logs(db):
+    old = timezone.now() - timedelta(days=365)
+    AuditLog.objects.bulk_create(
+        [
+            AuditLog(action="create", resource=f"Old {i}", timestamp=old + timedelta(seconds=i))
+            for i in range(7)
+        ]
+        + [AuditLog(action="create", resource="Recent")]
+    )
+
+
+def run(*args):
+    out = StringIO()
+    call_command("cleanup_audit_logs", *args, stdout=out)
+    return out.getvalue()
+
+
+def test_deletes_expired_rows_in_keyset_batches(logs):
+    output = run("--batch-size", "3")
+
+    assert "Deleted 7 audit logs" in output
+    assert "rows/s" in output and "ETA" in output
+    assert list(AuditLog.objects.values_list("resource", flat=True)) == ["Recent"]
+
+
+def test_progress_is_estimated_without_counting(logs):
+    with CaptureQueriesContext(connection) as ctx:
+        output = run("--batch-size", "3")
+
+    # remaining rows come from the hourly rollup, not a COUNT(*)
+    assert "~4 left" in output
+    assert "~0 left" in output
+    assert not [q for q in ctx.captured_queries if '"__count"' in q["sql"]]
+
+
+@override_settings(AUDIT_LOG_HOURLY_STATS=False)
+def test_progress_without_an_estimate(logs):
+    output = run("--batch-size", "3")
+
+    assert "~? left | ETA ?" in output
+
+
+@override_settings(AUDIT_LOG_HOURLY_STATS=False)  # rollup updates vary with hours spanned
+def test_batches_never_rescan_from_the_start(logs, django_assert_max_num_queries):
+    # per batch: upper key lookup + DELETE (+ savepoint pair); plus the
+    # final key lookup (no rollup to estimate the ETA from here)
+    with django_assert_max_num_queries(1 + 3 * 4):
+        run("--batch-size", "3")
+
+
+def test_dry_run_deletes_nothing(logs):
+    output = run("--dry-run")
+
+    assert "7 audit logs would be deleted" in output
+    assert AuditLog.objects.count() == 8
+
+
+def test_interrupted_run_resumes_from_checkpoint(logs, tmp_path, monkeypatch):
+    checkpoint = tmp_path / "cleanup.json"
+    original = Command._delete_range
+    calls = {"n": 0}
+
+    def flaky_delete(self, queryset):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise KeyboardInterrupt
+        return original(self, queryset)
+
+    monkeypatch.setattr(Command, "_delete_range", flaky_delete)
+    with pytest.raises(KeyboardInterrupt):
+        run("--batch-size", "3", "--checkpoint", str(checkpoint))
+
+    state = json.loads(checkpoint.read_text())
+    assert state["deleted"] == 3
+    assert AuditLog.objects.count() == 5
+
+    monkeypatch.setattr(Command, "_delete_range", original)
+    output = run("--batch-size", "3", "--checkpoint", str(checkpoint))
+
+    assert "Resuming from checkpoint" in output
+    assert "Deleted 7 audit logs" in output
+    assert not checkpoint.exists()
+    assert AuditLog.objects.count() == 1
+
+
+def test_max_rate_throttles(logs, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(
+        "audit_log.management.commands.cleanup_audit_logs.time.sleep",
+        sleeps.append,
+    )
+
+    run("--batch-size", "2", "--max-rate", "1", "--sleep", "0.5")
+
+    assert sleeps
+    assert 0.5 in sleeps
+    assert any(s > 0.5 for s in sleeps)
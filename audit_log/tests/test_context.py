@@ -0,0 +1,113 @@
+import asyncio
+from types import SimpleNamespace
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from audit_log.context import (
+    audit_logging_disabled,
+    get_correlation_id,
+    get_current_request,
+    get_current_user,
+    is_audit_logging_disabled,
+)
+from audit_log.middleware import AuditLogContextMiddleware
+
+
+def make_request(username, correlation_id=None):
+    headers = {"HTTP_X_CORRELATION_ID": correlation_id} if correlation_id else {}
+    request = RequestFactory().get("/", **headers)
+    request.user = SimpleNamespace(username=username)
+    return request
+
+
+def seen(request):
+    user = get_current_user()
+    return {
+        "user": user.username if user else None,
+        "request": get_current_request() is request,
+        "correlation_id": get_correlation_id(),
+    }
+
+
+def test_middleware_is_sync_and_async_capable():
+    sync = AuditLogContextMiddleware(lambda request: HttpResponse())
+
+    async def view(request):
+        return HttpResponse()
+
+    assert not iscoroutinefunction(sync)
+    assert iscoroutinefunction(AuditLogContextMiddleware(view))
+
+
+def test_sync_request_binds_and_restores_context():
+    observed = {}
+
+    def view(request):
+        observed.update(seen(request))
+        return HttpResponse()
+
+    request = make_request("alice", "req-sync")
+    response = AuditLogContextMiddleware(view)(request)
+
+    assert observed == {"user": "alice", "request": True, "correlation_id": "req-sync"}
+    assert response["X-Correlation-ID"] == "req-sync"
+    assert (get_current_user(), get_current_request(), get_correlation_id()) == (None, None, None)
+
+
+def test_concurrent_async_requests_keep_their_own_user():
+    observed = {}
+
+    async def view(request):
+        await asyncio.sleep(0)  # let the other request run in between
+        observed[request.user.username] = seen(request)
+        # ORM work in a worker thread sees the same context
+        observed[request.user.username]["thread_user"] = (
+            await sync_to_async(lambda: get_current_user().username)()
+        )
+        return HttpResponse()
+
+    middleware = AuditLogContextMiddleware(view)
+
+    async def main():
+        await asyncio.gather(
+            middleware(make_request("alice", "req-a")),
+            middleware(make_request("bob", "req-b")),
+        )
+
+    asyncio.run(main())
+
+    assert observed["alice"]["correlation_id"] == "req-a"
+    assert observed["bob"]["correlation_id"] == "req-b"
+    assert observed["alice"]["thread_user"] == "alice"
+    assert observed["bob"]["thread_user"] == "bob"
+    assert all(o["request"] for o in observed.values())
+
+
+def test_disabled_flag_is_scoped_and_survives_requests():
+    def view(request):
+        assert is_audit_logging_disabled()
+        return HttpResponse()
+
+    with audit_logging_disabled():
+        AuditLogContextMiddleware(view)(make_request("alice"))
+        assert is_audit_logging_disabled()
+
+    assert not is_audit_logging_disabled()
+
+
+def test_disabled_flag_does_not_leak_between_tasks():
+    async def disabled():
+        with audit_logging_disabled():
+            await asyncio.sleep(0)
+            return is_audit_logging_disabled()
+
+    async def enabled():
+        await asyncio.sleep(0)
+        return is_audit_logging_disabled()
+
+    async def main():
+        return await asyncio.gather(disabled(), enabled())
+
+    assert asyncio.run(main()) == [True, False]
@@ -0,0 +1,99 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import override_settings
+
+from audit_log import buffer as audit_buffer
+from audit_log.api.public import log
+from audit_log.context import clear_context, set_correlation_id
+from audit_log.models import AuditLog
+from audit_log.services import log_action
+from products.models import Category, Product
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def correlation_id():
+    set_correlation_id("req-123")
+    yield "req-123"
+    clear_context()
+
+
+def test_public_and_signal_paths_store_the_request_id(correlation_id):
+    log(action="create", resource="Thing")
+    Category.objects.create(name="Traced", slug="traced")
+
+    assert set(AuditLog.objects.values_list("correlation_id", flat=True)) == {"req-123"}
+    assert AuditLog.objects.count() == 2
+
+
+def test_service_and_bulk_paths_store_the_request_id(correlation_id):
+    owner = get_user_model().objects.create_user(username="owner", password="pass1234")
+    category = Category.objects.create(name="Bulk", slug="bulk")
+    product = Product.objects.create(
+        name="P", sku="SKU-1", price=1, stock=1, category=category, owner=owner
+    )
+
+    log_action(user=owner, action="update", instance=product, source="api")
+    Product.objects.filter(pk=product.pk).audited().update(price=2)
+
+    sources = dict(
+        AuditLog.objects.filter(source__in=["api", "bulk"])
+        .values_list("source", "correlation_id")
+    )
+    assert sources == {"api": "req-123", "bulk": "req-123"}
+
+
+def test_explicit_id_wins(correlation_id):
+    entry = log(action="create", resource="Job", correlation_id="job-7")
+
+    assert AuditLog.objects.get(pk=entry.pk).correlation_id == "job-7"
+
+
+@override_settings(
+    AUDIT_LOG_WRITE_MODE="buffered",
+    AUDIT_LOG_BUFFER_BATCH_SIZE=100,
+    AUDIT_LOG_BUFFER_FLUSH_INTERVAL=0,
+)
+def test_buffered_and_deferred_writes_keep_the_id_after_the_request():
+    audit_buffer.shutdown_buffer()
+    set_correlation_id("req-buffered")
+    log(action="create", resource="Buffered")
+    clear_context()  # request over before the flush
+
+    audit_buffer.shutdown_buffer()
+
+    assert AuditLog.objects.get(resource="Buffered").correlation_id == "req-buffered"
+
+
+@override_settings(AUDIT_LOG_DEFER_UNTIL_COMMIT=True)
+def test_deferred_writes_keep_the_id(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            set_correlation_id("req-deferred")
+            log(action="create", resource="Deferred")
+            clear_context()
+
+    assert AuditLog.objects.get(resource="Deferred").correlation_id == "req-deferred"
+
+
+def test_middleware_id_reaches_the_row(client):
+    admin = get_user_model().objects.create_superuser(username="root", password="pass1234")
+    client.force_login(admin)
+
+    response = client.post(
+        "/api/categories/",
+        {"name": "Via API", "slug": "via-api"},
+        HTTP_X_CORRELATION_ID="incident-42",
+    )
+
+    assert response.status_code == 201
+    assert response["X-Correlation-ID"] == "incident-42"
+    assert AuditLog.objects.get(resource="Category").correlation_id == "incident-42"
+
+
+def test_middleware_replaces_ids_that_do_not_fit(client):
+    response = client.get("/api/categories/", HTTP_X_CORRELATION_ID="x" * 65)
+
+    assert len(response["X-Correlation-ID"]) == 32
@@ -0,0 +1,88 @@
+import pytest
+from django.db import transaction
+from django.test import override_settings
+
+from audit_log.api.public import log
+from audit_log.collector import pending_count
+from audit_log.models import AuditLog
+
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("deferred_writes"),
+]
+
+
+@pytest.fixture
+def deferred_writes():
+    with override_settings(AUDIT_LOG_DEFER_UNTIL_COMMIT=True):
+        yield
+
+
+def test_events_are_written_on_commit_in_one_insert(
+    django_capture_on_commit_callbacks,
+    django_assert_num_queries,
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        with transaction.atomic():
+            log(action="create", resource="Thing")
+            log(action="update", resource="Thing")
+            log(action="delete", resource="Thing")
+
+            assert pending_count() == 3
+            assert AuditLog.objects.count() == 0
+
+    # one batch registered for the whole transaction
+    assert len(callbacks) == 1
+
+    # one INSERT + one hourly stats upsert for the whole batch
+    with django_assert_num_queries(2):
+        callbacks[0]()
+
+    assert AuditLog.objects.count() == 3
+
+
+def test_rolled_back_work_drops_its_events(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            log(action="create", resource="Kept")
+
+            try:
+                with transaction.atomic():
+                    log(action="create", resource="Dropped")
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+
+            log(action="update", resource="Kept")
+
+    assert sorted(AuditLog.objects.values_list("resource", flat=True)) == [
+        "Kept",
+        "Kept",
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_autocommit_writes_immediately():
+    entry = log(action="create", resource="Thing")
+
+    assert entry.pk is not None
+    assert pending_count() == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_transaction_leaves_nothing_for_the_next_one():
+    try:
+        with transaction.atomic():
+            log(action="create", resource="Dropped")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    # same savepoint ids as the rolled-back transaction: a fresh batch
+    with transaction.atomic():
+        log(action="create", resource="Kept")
+        assert pending_count() == 1
+
+    assert list(AuditLog.objects.values_list("resource", flat=True)) == ["Kept"]
+    assert pending_count() == 0
@@ -0,0 +1,82 @@
+import pytest
+from django.contrib.admin.sites import site
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from audit_log.models import AuditLog
+from audit_log.search import FTS_TABLE, match_ids
+
+
+def search(text, columns=None):
+    ids = match_ids(text, columns) if columns else match_ids(text)
+    return set(AuditLog.objects.filter(id__in=ids).values_list("resource", flat=True))
+
+
+@pytest.fixture
+def logs(db):
+    AuditLog.objects.create(action="update", resource="Invoice", description="Price corrected by finance")
+    AuditLog.objects.create(action="delete", resource="Product", description="Removed duplicate listing")
+    AuditLog.objects.create(action="create", resource="Order", object_id="4711")
+
+
+def test_index_follows_inserts_updates_and_deletes(logs):
+    assert search("finance") == {"Invoice"}
+    assert search("dup") == {"Product"}          # prefix match
+    assert search("PRICE fin") == {"Invoice"}    # all words, any case
+    assert search("4711") == {"Order"}
+
+    AuditLog.objects.filter(resource="Invoice").update(description="Reviewed")
+    assert search("finance") == set()
+    assert search("reviewed") == {"Invoice"}
+
+    AuditLog.objects.filter(resource="Product").delete()
+    assert search("duplicate") == set()
+
+
+def test_column_scoped_search(logs):
+    assert search("product") == {"Product"}
+    assert search("product", ["description"]) == set()
+
+
+def test_api_search_uses_index(logs, admin_user):
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/audit-logs/", {"search": "finance"})
+
+    assert [row["resource"] for row in response.json()["results"]] == ["Invoice"]
+    sql = " ".join(q["sql"] for q in ctx.captured_queries)
+    assert f"{FTS_TABLE} MATCH" in sql
+    assert "LIKE '%" not in sql  # no unanchored scan
+
+
+def test_admin_search_uses_index_and_username(logs, admin_user):
+    AuditLog.objects.create(action="login", resource="Session", user=admin_user)
+    request = RequestFactory().get("/")
+    model_admin = site._registry[AuditLog]
+
+    results, may_have_duplicates = model_admin.get_search_results(
+        request, AuditLog.objects.all(), "listing"
+    )
+    assert [log.resource for log in results] == ["Product"]
+    assert may_have_duplicates is False
+
+    results, _ = model_admin.get_search_results(
+        request, AuditLog.objects.all(), admin_user.username[1:]
+    )
+    assert [log.resource for log in results] == ["Session"]
+
+
+def test_text_that_is_not_plain_words_falls_back_to_icontains(logs, admin_user):
+    AuditLog.objects.create(action="update", resource="Mail", description="sent to ops@example.com")
+    assert match_ids("ops@example.com") is None
+
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+    response = client.get("/api/audit-logs/", {"search": "ops@example.com"})
+
+    assert [row["resource"] for row in response.json()["results"]] == ["Mail"]
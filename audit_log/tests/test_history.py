@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import F
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from audit_log.history import extend_checkpoints, state_at
+from audit_log.models import AuditLog, AuditLogCheckpoint
+from audit_log.registry import content_type_id_for
+from products.models import Category, Product
+
+pytestmark = pytest.mark.django_db
+
+T0 = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+
+
+def at(step):
+    """Half an hour after the event of step (0 = create)."""
+    return T0 + timedelta(hours=step, minutes=30)
+
+
+def stamp_last_event(product, step):
+    event = AuditLog.objects.filter(object_id=str(product.pk)).order_by("-id").first()
+    AuditLog.objects.filter(pk=event.pk).update(timestamp=T0 + timedelta(hours=step))
+
+
+def edit(product, steps):
+    """One price change per step; price after step n is n.00."""
+    for step in steps:
+        product.price = Decimal(f"{step}.00")
+        product.save()
+        stamp_last_event(product, step)
+
+
+@pytest.fixture
+def product():
+    owner = get_user_model().objects.create_user(username="owner", password="pass1234")
+    category = Category.objects.create(name="Lamps", slug="lamps")
+    product = Product.objects.create(
+        category=category, name="Lamp", sku="L-1", price=Decimal("0.00"), stock=1, owner=owner
+    )
+    stamp_last_event(product, 0)
+    return product
+
+
+def price_at(product, step, **kwargs):
+    state = state_at(product, timestamp=at(step), **kwargs)
+    return state and state["price"]
+
+
+def test_state_is_rebuilt_from_current_row_without_checkpoints(product):
+    edit(product, range(1, 4))
+
+    assert [price_at(product, step) for step in range(4)] == ["0.00", "1.00", "2.00", "3.00"]
+    assert state_at(product, timestamp=T0 - timedelta(hours=1)) is None
+    assert state_at(product, timestamp=at(1))["name"] == "Lamp"
+
+
+@override_settings(AUDIT_LOG_CHECKPOINT_INTERVAL=3)
+def test_checkpoints_bound_long_replays(product, django_assert_max_num_queries):
+    edit(product, range(1, 11))
+
+    assert price_at(product, 0) == "0.00"
+    assert not AuditLogCheckpoint.objects.exists()  # reads never write
+
+    assert extend_checkpoints(product) == 4
+    # one at the newest event, one every 3 events before it
+    checkpoints = list(AuditLogCheckpoint.objects.order_by("timestamp"))
+    assert [c.state["price"] for c in checkpoints] == ["1.00", "4.00", "7.00", "10.00"]
+
+    for step in range(11):
+        assert price_at(product, step) == f"{step}.00"
+
+    # bounded: checkpoint lookups + one replay of at most 3 events
+    with django_assert_max_num_queries(4):
+        state_at(product, timestamp=at(5))
+
+
+@override_settings(AUDIT_LOG_CHECKPOINT_INTERVAL=3)
+def test_checkpoints_extend_forward_after_new_edits(product):
+    edit(product, range(1, 5))
+    extend_checkpoints(product)
+    before = AuditLogCheckpoint.objects.count()
+
+    edit(product, range(5, 12))
+    product.delete()  # the live row no longer matters once checkpoints exist
+
+    assert price_at(product, 11) == "11.00"
+    # 7 edits + soft delete + its deleted_at update → one per 3 events
+    assert extend_checkpoints(product) == 3
+    assert AuditLogCheckpoint.objects.count() == before + 3
+    assert [price_at(product, step) for step in (2, 6, 9)] == ["2.00", "6.00", "9.00"]
+
+
+@override_settings(AUDIT_LOG_CHECKPOINT_INTERVAL=3)
+def test_hard_deleted_object_is_replayed_from_its_removal_snapshot(product):
+    edit(product, range(1, 5))
+    admin = get_user_model().objects.create_user(
+        username="admin", password="pass1234", is_staff=True
+    )
+    product.delete()
+    pk = product.pk
+
+    client = APIClient()
+    client.force_authenticate(admin)
+    response = client.post(f"/api/products/{pk}/hard-delete/?deleted=true")
+
+    assert response.status_code == 204
+    assert not Product._base_manager.filter(pk=pk).exists()
+
+    ct = content_type_id_for(Product)
+    assert state_at(ct, pk) is None
+    assert state_at(ct, pk, at(2))["price"] == "2.00"
+    assert state_at(ct, pk, at(4))["price"] == "4.00"
+
+    assert extend_checkpoints(ct, pk) > 0
+    assert state_at(ct, pk, at(3))["price"] == "3.00"
+
+
+def bulk(queryset, step, statement="update", **values):
+    getattr(queryset.audited(), statement)(**values)
+    event = AuditLog.objects.filter(object_id__isnull=True).order_by("-id").first()
+    AuditLog.objects.filter(pk=event.pk).update(timestamp=T0 + timedelta(hours=step))
+
+
+@override_settings(AUDIT_LOG_CHECKPOINT_INTERVAL=2)
+def test_bulk_updates_are_replayed(product):
+    edit(product, [1])
+    others = Product.objects.filter(pk=product.pk)
+    bulk(others, 2, stock=7)
+    bulk(others, 3, stock=F("stock") + 1)
+    edit(Product.objects.get(pk=product.pk), [4, 5])
+
+    def stock_at(step):
+        return state_at(product, timestamp=at(step))["stock"]
+
+    assert [stock_at(step) for step in range(6)] == [1, 1, 7, 8, 8, 8]
+
+    # forward from a checkpoint cannot pass F("stock") + 1: unwound instead
+    assert extend_checkpoints(product) > 0
+    assert [stock_at(step) for step in range(6)] == [1, 1, 7, 8, 8, 8]
+
+
+def test_bulk_hard_delete_keeps_the_history(product):
+    edit(product, [1, 2])
+    bulk(Product.objects.filter(pk=product.pk), 3, statement="hard_delete")
+
+    ct = content_type_id_for(Product)
+    assert state_at(ct, product.pk) is None
+    assert state_at(ct, product.pk, at(2))["price"] == "2.00"
+    assert state_at(ct, product.pk, at(1))["price"] == "1.00"
+
+
+def test_content_type_id_form(product):
+    edit(product, [1])
+
+    state = state_at(content_type_id_for(Product), product.pk, at(0))
+
+    assert state["price"] == "0.00"
+
+
+@override_settings(AUDIT_LOG_CHECKPOINT_INTERVAL=3)
+def test_command_checkpoints_busy_objects(product):
+    edit(product, range(1, 8))
+    out = StringIO()
+
+    call_command("checkpoint_audit_history", "--since", "2026-01-01", stdout=out)
+
+    assert "3 checkpoints written for 1 objects" in out.getvalue()
+
+
+def test_history_state_endpoint(product):
+    edit(product, range(1, 3))
+    client = APIClient()
+    client.force_authenticate(product.owner)
+    url = f"/api/products/{product.pk}/history/state/"
+
+    response = client.get(url, {"at": at(1).isoformat()})
+
+    assert response.status_code == 200
+    assert response.json()["state"]["price"] == "1.00"
+    assert client.get(url, {"at": "2020-01-01T00:00:00+00:00"}).status_code == 404
+    assert client.get(url, {"at": "yesterday"}).status_code == 400
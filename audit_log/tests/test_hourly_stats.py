@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from audit_log.models import AuditLog, AuditLogHourlyStat
+
+HOUR = datetime(2026, 5, 1, 10, tzinfo=dt_timezone.utc)
+
+
+def entry(minutes=0, **kwargs):
+    kwargs.setdefault("action", "update")
+    kwargs.setdefault("resource", "Product")
+    return AuditLog(timestamp=HOUR + timedelta(minutes=minutes), **kwargs)
+
+
+def buckets():
+    return {
+        (s.hour, s.resource, s.action, s.status): s.count
+        for s in AuditLogHourlyStat.objects.all()
+    }
+
+
+@pytest.mark.django_db
+def test_inserts_update_hourly_buckets():
+    entry(5).save()
+    AuditLog.objects.bulk_create([entry(10), entry(20, action="delete"), entry(70)])
+    AuditLog.objects.bulk_create([entry(30)])
+
+    assert buckets() == {
+        (HOUR, "Product", "update", "INFO"): 3,
+        (HOUR, "Product", "delete", "INFO"): 1,
+        (HOUR + timedelta(hours=1), "Product", "update", "INFO"): 1,
+    }
+
+
+@pytest.mark.django_db
+def test_one_upsert_per_batch(django_assert_num_queries):
+    with django_assert_num_queries(2):  # bulk INSERT + stats upsert
+        AuditLog.objects.bulk_create([entry(i) for i in range(50)])
+
+    assert buckets() == {(HOUR, "Product", "update", "INFO"): 50}
+
+
+@pytest.mark.django_db
+@override_settings(AUDIT_LOG_HOURLY_STATS=False)
+def test_rollup_can_be_disabled():
+    AuditLog.objects.bulk_create([entry()])
+
+    assert not AuditLogHourlyStat.objects.exists()
+
+
+@pytest.mark.django_db
+def test_backfill_rebuilds_from_raw_rows():
+    with override_settings(AUDIT_LOG_HOURLY_STATS=False):
+        AuditLog.objects.bulk_create(
+            [entry(i) for i in range(3)] + [entry(24 * 60, status="FAILED")]
+        )
+    AuditLogHourlyStat.objects.create(
+        hour=HOUR, resource="Product", action="update", status="INFO", count=99
+    )
+
+    out = StringIO()
+    call_command("backfill_audit_log_stats", "--since", "2026-05-01", stdout=out)
+
+    assert "Backfill completed" in out.getvalue()
+    assert buckets() == {
+        (HOUR, "Product", "update", "INFO"): 3,
+        (HOUR + timedelta(days=1), "Product", "update", "FAILED"): 1,
+    }
+
+
+@pytest.mark.django_db
+class TestStatsEndpoint:
+
+    def setup_method(self):
+        AuditLog.objects.bulk_create([
+            entry(1), entry(2), entry(3, action="delete"),
+            entry(61, resource="Order"),
+        ])
+        self.url = "/api/audit-logs/stats/"
+        self.params = {"since": "2026-05-01T00:00:00Z", "until": "2026-05-02T00:00:00Z"}
+
+    def client_for(self, django_user_model, is_staff):
+        client = APIClient()
+        client.force_authenticate(
+            django_user_model.objects.create_user(username="u", password="p", is_staff=is_staff)
+        )
+        return client
+
+    def test_groups_rollup_rows(self, django_user_model, django_assert_num_queries):
+        client = self.client_for(django_user_model, is_staff=True)
+
+        with django_assert_num_queries(1):  # one aggregate over the rollup
+            response = client.get(self.url, {**self.params, "group_by": "resource,action"})
+
+        assert response.status_code == 200
+        assert response.data["results"] == [
+            {"resource": "Order", "action": "update", "count": 1},
+            {"resource": "Product", "action": "delete", "count": 1},
+            {"resource": "Product", "action": "update", "count": 2},
+        ]
+
+        response = client.get(self.url, {**self.params, "group_by": "day", "resource": "Product"})
+        assert [row["count"] for row in response.data["results"]] == [3]
+
+    def test_rejects_unknown_dimension(self, django_user_model):
+        client = self.client_for(django_user_model, is_staff=True)
+
+        response = client.get(self.url, {"group_by": "user"})
+
+        assert response.status_code == 400
+
+    def test_staff_only(self, django_user_model):
+        client = self.client_for(django_user_model, is_staff=False)
+
+        assert client.get(self.url).status_code == 403
+
+
+@pytest.mark.django_db(transaction=True)
+def test_row_and_rollup_commit_together(monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("rollup unavailable")
+
+    monkeypatch.setattr("audit_log.stats.upsert", broken)
+
+    with pytest.raises(RuntimeError):
+        entry().save()
+
+    assert not AuditLog.objects.exists()
+
+
+@pytest.mark.django_db
+def test_cleanup_subtracts_deleted_rows():
+    old = HOUR - timedelta(days=365)
+    AuditLog.objects.bulk_create(
+        [entry(i - 365 * 24 * 60) for i in range(3)]
+        + [entry(-365 * 24 * 60, action="delete"), entry()]
+    )
+
+    call_command("cleanup_audit_logs", "--batch-size", "2", stdout=StringIO())
+
+    assert buckets() == {
+        (old, "Product", "update", "INFO"): 0,
+        (old, "Product", "delete", "INFO"): 0,
+        (HOUR, "Product", "update", "INFO"): 1,
+    }
@@ -0,0 +1,44 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from audit_log.models import AuditLog
+
+
+def audit_indexes():
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, AuditLog._meta.db_table)
+    return {name for name, info in constraints.items() if info["index"]}
+
+
+@pytest.mark.django_db
+def test_composite_indexes_replace_single_column_ones():
+    indexes = audit_indexes()
+
+    assert {"auditlog_user_ts_idx", "auditlog_object_ts_idx", "auditlog_action_ts_idx"} <= indexes
+    # timestamp and correlation_id keep their own index; nothing else
+    assert len(indexes) == 5
+
+
+@pytest.mark.django_db
+def test_benchmark_reports_both_index_sets_and_rolls_back():
+    before = audit_indexes()
+    out = StringIO()
+
+    call_command(
+        "benchmark_audit_log_indexes",
+        "--rows", "300", "--users", "5", "--objects", "20",
+        "--repeat", "1", "--insert-rows", "50",
+        stdout=out,
+    )
+
+    output = out.getvalue()
+    assert "composite indexes (current)" in output
+    assert "legacy single-column indexes" in output
+    assert "auditlog_user_ts_idx" in output   # query plan is printed
+    assert "summary (legacy → composite)" in output
+
+    assert AuditLog.objects.count() == 0
+    assert audit_indexes() == before
@@ -0,0 +1,202 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from audit_log.context import audit_logging_disabled
+from audit_log.integrity import observe_ids, seal_blocks, verify_blocks
+from audit_log.merkle import merkle_root
+from audit_log.models import AuditLog, AuditLogBlock, AuditLogIdMark
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("small_blocks"),
+]
+
+
+@pytest.fixture
+def small_blocks():
+    with override_settings(AUDIT_LOG_INTEGRITY_BLOCK_SIZE=10, AUDIT_LOG_INTEGRITY_SETTLE_SECONDS=60):
+        yield
+
+
+def make_logs(count, age=timedelta(hours=1)):
+    start = timezone.now() - age
+    AuditLog.objects.bulk_create(
+        AuditLog(
+            action="update",
+            resource="Product",
+            description=f"event {i}",
+            changes={"price": {"before": i, "after": i + 1}},
+            timestamp=start + timedelta(seconds=i),
+        )
+        for i in range(count)
+    )
+    # a seal run saw the new ids as they were written
+    observe_ids(at=start + timedelta(seconds=count - 1))
+    return list(AuditLog.objects.order_by("id"))
+
+
+def reasons(**kwargs):
+    return [(f.number, f.reason) for f in verify_blocks(**kwargs)]
+
+
+def test_only_complete_settled_blocks_are_sealed():
+    make_logs(25)
+    make_logs(10, age=timedelta(seconds=1))  # too fresh to seal
+
+    blocks = seal_blocks()
+
+    assert [(b.number, b.row_count) for b in blocks] == [(1, 10), (2, 10)]
+    assert blocks[1].first_id == blocks[0].last_id + 1
+    assert seal_blocks() == []  # the 5 + 10 remaining rows wait
+
+
+def test_ids_seen_too_recently_wait_whatever_their_timestamps():
+    make_logs(20)
+    # hour-old rows that only just became visible (a long transaction)
+    AuditLogIdMark.objects.update(observed_at=timezone.now())
+
+    assert seal_blocks() == []
+
+
+def test_a_late_lower_id_is_sealed_with_its_range():
+    logs = make_logs(20)
+    late = logs[14]
+    AuditLog.objects.filter(pk=late.pk).delete()  # not committed yet
+    AuditLogIdMark.objects.update(observed_at=timezone.now())
+    assert seal_blocks() == []
+
+    AuditLog.objects.create(id=late.pk, action="update", resource="Product",
+                            timestamp=late.timestamp)
+    AuditLogIdMark.objects.update(observed_at=timezone.now() - timedelta(minutes=2))
+
+    assert len(seal_blocks()) == 2
+    assert reasons() == []
+
+
+def test_untouched_blocks_verify():
+    make_logs(30)
+    seal_blocks()
+
+    assert reasons() == []
+
+
+def test_merkle_root_depends_on_every_row_and_order():
+    rows = [(1, "a"), (2, "b"), (3, "c")]
+
+    assert merkle_root(rows) != merkle_root(rows[:2])
+    assert merkle_root(rows) != merkle_root(list(reversed(rows)))
+    assert merkle_root(rows) != merkle_root([(1, "a"), (2, "B"), (3, "c")])
+
+
+def test_edited_row_is_detected():
+    logs = make_logs(30)
+    seal_blocks()
+
+    AuditLog.objects.filter(pk=logs[14].pk).update(description="nothing to see")
+
+    assert reasons() == [(2, "row contents changed (merkle root mismatch)")]
+
+
+def test_deleted_row_and_changed_block_are_detected():
+    logs = make_logs(30)
+    seal_blocks()
+
+    AuditLog.objects.filter(pk=logs[3].pk).delete()
+    AuditLogBlock.objects.filter(number=3).update(row_count=9)
+
+    failures = reasons()
+
+    assert failures[0][0] == 1 and "9 rows" in failures[0][1]
+    assert (3, "chain hash mismatch (block header changed)") in failures
+
+
+def test_missing_block_is_detected():
+    make_logs(30)
+    seal_blocks()
+
+    AuditLogBlock.objects.filter(number=2).delete()
+
+    assert reasons() == [(3, "blocks 2–2 missing")]
+
+
+def test_blocks_past_retention_are_not_compared():
+    logs = make_logs(10, age=timedelta(days=400))
+    seal_blocks()
+
+    AuditLog.objects.filter(pk=logs[0].pk).delete()  # retention at work
+
+    assert reasons() == []
+
+
+def straddling_block():
+    """One sealed block: 5 rows past retention, 5 recent ones."""
+    logs = make_logs(5, age=timedelta(days=400)) + make_logs(5)[5:]
+    seal_blocks()
+    AuditLog.objects.filter(pk__in=[log.pk for log in logs[:5]]).delete()  # retention
+    return logs
+
+
+def test_rows_of_a_partly_purged_block_are_still_checked():
+    logs = straddling_block()
+    assert reasons() == []
+
+    AuditLog.objects.filter(pk=logs[7].pk).update(description="nothing to see")
+
+    assert reasons() == [(1, "row contents changed (not among the sealed rows)")]
+
+
+def test_recent_row_deleted_from_a_partly_purged_block_is_detected():
+    logs = straddling_block()
+
+    AuditLog.objects.filter(pk=logs[8].pk).delete()
+
+    assert reasons() == [(1, "1 rows deleted before their retention cutoff")]
+
+
+def test_deleting_a_user_keeps_blocks_valid(django_user_model):
+    with audit_logging_disabled():
+        user = django_user_model.objects.create_user(username="gone", password="p")
+    AuditLog.objects.create(action="login", resource="Session", user=user,
+                            timestamp=timezone.now() - timedelta(hours=2))
+    make_logs(9)
+    assert len(seal_blocks()) == 1
+    user_pk = user.pk
+
+    user.delete()  # SET_NULL on user_id
+
+    assert AuditLog.objects.get(resource="Session").user_id is None
+    assert reasons() == []
+
+    AuditLog.objects.filter(resource="Session").update(user_ref=user_pk + 1)
+    assert reasons() == [(1, "row contents changed (merkle root mismatch)")]
+
+
+def test_pool_verification_finds_the_same_failures():
+    logs = make_logs(50)
+    seal_blocks()
+    AuditLog.objects.filter(pk=logs[42].pk).update(status="OK")
+
+    assert reasons(workers=2) == [(5, "row contents changed (merkle root mismatch)")]
+
+
+def test_commands():
+    make_logs(20)
+    out = StringIO()
+    call_command("seal_audit_log_blocks", stdout=out)
+    head = AuditLogBlock.objects.get(number=2).chain_hash
+
+    assert "2 blocks sealed" in out.getvalue()
+    assert head in out.getvalue()
+
+    out = StringIO()
+    call_command("verify_audit_integrity", "--workers", "1", "--expect-head", head, stdout=out)
+    assert "2 blocks verified" in out.getvalue()
+
+    AuditLog.objects.filter(pk=AuditLog.objects.order_by("id").first().pk).update(action="delete")
+    with pytest.raises(CommandError, match="1 integrity failures"):
+        call_command("verify_audit_integrity", "--workers", "1", stdout=StringIO(), stderr=StringIO())
@@ -0,0 +1,120 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from audit_log import buffer as audit_buffer
+from audit_log.api.public import log
+from audit_log.models import AuditLog
+from products.models import Category, Product
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class Delta:
+    """Metric value change across a block."""
+
+    def __init__(self, name, **labels):
+        self.name, self.labels = name, labels
+
+    def __enter__(self):
+        self.before = sample(self.name, **self.labels)
+        return self
+
+    def __exit__(self, *exc):
+        self.value = sample(self.name, **self.labels) - self.before
+
+
+@pytest.mark.django_db
+def test_public_log_counts_call_latency_and_row():
+    with Delta("audit_log_write_calls_total", path="public") as calls, \
+            Delta("audit_log_created_total", resource="Thing", action="create") as created, \
+            Delta("audit_log_create_latency_seconds_count") as latency:
+        log(action="create", resource="Thing")
+
+    assert (calls.value, created.value, latency.value) == (1, 1, 1)
+
+
+@pytest.mark.django_db
+def test_signal_model_and_bulk_paths_are_labelled():
+    owner = get_user_model().objects.create_user(username="owner", password="pass1234")
+    category = Category.objects.create(name="Metrics", slug="metrics")
+
+    with Delta("audit_log_write_calls_total", path="signal") as signal, \
+            Delta("audit_log_write_calls_total", path="model") as model, \
+            Delta("audit_log_write_calls_total", path="bulk") as bulk:
+        product = Product.objects.create(
+            category=category, name="P", sku="M-1", price=1, stock=1, owner=owner
+        )
+        Product.objects.audited(source="admin").update(stock=0)
+        product.delete()
+
+    assert signal.value >= 1
+    assert model.value == 1
+    assert bulk.value == 1
+
+
+@pytest.mark.django_db
+@override_settings(
+    AUDIT_LOG_WRITE_MODE="buffered",
+    AUDIT_LOG_BUFFER_BATCH_SIZE=100,
+    AUDIT_LOG_BUFFER_FLUSH_INTERVAL=0,
+)
+def test_buffer_depth_batch_size_and_flush_latency():
+    audit_buffer.shutdown_buffer()
+    try:
+        for _ in range(3):
+            log(action="create", resource="Thing")
+        assert sample("audit_log_buffer_queue_depth") >= 3
+
+        with Delta("audit_log_batch_size_sum") as rows, \
+                Delta("audit_log_flush_latency_seconds_count", mode="buffered") as flushes:
+            audit_buffer.flush_buffer()
+
+        assert rows.value == 3
+        assert flushes.value == 1
+        assert sample("audit_log_buffer_queue_depth") == 0
+    finally:
+        audit_buffer.shutdown_buffer()
+
+
+@pytest.mark.django_db
+def test_failed_flush_counts_dropped_events(monkeypatch):
+    buffer = audit_buffer.AuditLogBuffer(max_size=10, batch_size=10, flush_interval=0)
+    buffer.put(AuditLog(action="create", resource="Thing"))
+    monkeypatch.setattr(AuditLog.objects, "bulk_create", lambda *a, **k: 1 / 0)
+
+    with Delta("audit_log_dropped_events_total", reason="write_error") as dropped:
+        buffer.flush()
+
+    assert dropped.value == 1
+
+
+@pytest.mark.django_db
+def test_cleanup_counts_deleted_rows():
+    old = timezone.now() - timedelta(days=400)
+    AuditLog.objects.bulk_create([AuditLog(action="create", timestamp=old) for _ in range(4)])
+
+    with Delta("audit_log_cleanup_total") as cleaned:
+        call_command("cleanup_audit_logs", "--batch-size", "3", stdout=StringIO())
+
+    assert cleaned.value == 4
+
+
+@pytest.mark.django_db
+def test_api_request_time_is_observed(admin_user):
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+
+    with Delta("audit_log_api_query_seconds_count", endpoint="list") as observed:
+        client.get("/api/audit-logs/")
+
+    assert observed.value == 1
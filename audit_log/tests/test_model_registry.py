@@ -0,0 +1,70 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sessions.models import Session
+from django.db.models.signals import post_save
+from django.test import override_settings
+
+from audit_log.models import AuditLog
+from audit_log.registry import AuditModelRegistry, registry
+from audit_log.signals import audit_log_post_save
+from products.models import Category, Product
+
+
+def test_default_registry_skips_framework_models():
+    assert registry.is_audited(Product)
+    assert registry.is_audited(Category)
+
+    assert not registry.is_audited(AuditLog)
+    assert not registry.is_audited(Session)
+    assert not registry.is_audited(ContentType)
+
+
+def test_receiver_connected_only_to_audited_models():
+    def receivers_for(model):
+        sync_receivers, _ = post_save._live_receivers(model)
+        return sync_receivers
+
+    assert audit_log_post_save in receivers_for(Category)
+    assert audit_log_post_save not in receivers_for(Session)
+    assert audit_log_post_save not in receivers_for(AuditLog)
+
+
+def test_tracked_fields_exclude_pk_and_ignored_fields():
+    names = [field.name for field in registry.get(Product).tracked_fields]
+
+    assert "id" not in names
+    assert "updated_at" not in names
+    assert "name" in names
+    assert "price" in names
+
+
+@override_settings(
+    AUDIT_LOG_INCLUDE_MODELS=["products"],
+    AUDIT_LOG_EXCLUDE_MODELS=["products.Category"],
+)
+def test_include_and_exclude_settings():
+    custom = AuditModelRegistry().build()
+
+    assert custom.is_audited(Product)
+    assert not custom.is_audited(Category)
+    assert len(custom) == 1
+
+
+@pytest.mark.django_db
+def test_registry_caches_content_type_id(django_assert_num_queries):
+    meta = registry.get(Category)
+    expected = ContentType.objects.get_for_model(Category).id
+
+    assert meta.content_type_id == expected
+    with django_assert_num_queries(0):
+        assert meta.content_type_id == expected
+
+
+@pytest.mark.django_db
+def test_audited_model_save_is_logged():
+    category = Category.objects.create(name="Books", slug="books")
+
+    log = AuditLog.objects.get(resource="Category")
+    assert log.action == "create"
+    assert log.object_id == str(category.pk)
+    assert log.source == "signal"
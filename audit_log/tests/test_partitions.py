@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+
+from audit_log.archive import find_segments, iter_segment
+from audit_log.management.commands import cleanup_audit_logs
+from audit_log.models import AuditLog
+from audit_log.partitions import (
+    DEFAULT_TABLE,
+    LEGACY_TABLE,
+    PartitionBackend,
+    get_backend,
+    month_of,
+    next_month,
+    partition_name,
+)
+
+postgresql_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="native partitioning needs PostgreSQL"
+)
+
+
+@pytest.fixture
+def partitioned(db):
+    backend = get_backend()
+    backend.reset()
+    with override_settings(AUDIT_LOG_PARTITIONING=True):
+        backend.setup(months_ahead=1)
+        yield backend
+    backend.reset()
+
+
+class RecordingBackend(PartitionBackend):
+    def __init__(self):
+        super().__init__("default")
+        self.created = []
+
+    def list_partitions(self):
+        return []
+
+    def ensure_partition(self, month):
+        self.created.append(month)
+        return True
+
+
+def entry(timestamp, **kwargs):
+    kwargs.setdefault("action", "create")
+    return AuditLog(resource="Thing", timestamp=timestamp, **kwargs)
+
+
+@pytest.mark.skipif(connection.vendor == "postgresql", reason="PostgreSQL is supported")
+@override_settings(AUDIT_LOG_PARTITIONING=True)
+def test_other_backends_refuse_partitioning(db):
+    with pytest.raises(ImproperlyConfigured):
+        get_backend()
+
+    with pytest.raises(CommandError, match="PostgreSQL"):
+        call_command("audit_log_partitions", "list", stdout=StringIO())
+
+
+@postgresql_only
+def test_setup_keeps_legacy_rows_and_routes_new_ones(db):
+    old = entry(timezone.now() - timedelta(days=90))
+    old.save()
+
+    backend = get_backend()
+    backend.reset()
+    with override_settings(AUDIT_LOG_PARTITIONING=True):
+        backend.setup(months_ahead=1)
+
+        assert backend.is_partitioned()
+        new = AuditLog.objects.create(action="update", resource="Thing")
+
+        # identity lives on the parent; the legacy partition has none
+        assert new.pk > old.pk
+        assert AuditLog.objects.count() == 2
+        assert AuditLog.objects.partition(new.timestamp).get().pk == new.pk
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_constraint "
+                "WHERE conrelid = 'audit_log_auditlog'::regclass AND contype = 'f'"
+            )
+            assert cursor.fetchone()[0] >= 2
+            cursor.execute(
+                "SELECT is_identity FROM information_schema.columns "
+                "WHERE table_name = %s AND column_name = 'id'",
+                [LEGACY_TABLE],
+            )
+            assert cursor.fetchone()[0] == "NO"
+    backend.reset()
+
+
+@postgresql_only
+def test_deleting_a_user_nulls_rows_in_every_partition(partitioned, django_user_model):
+    user = django_user_model.objects.create_user(username="u", password="p")
+    now = timezone.now()
+    AuditLog.objects.bulk_create([
+        entry(now, user=user),
+        entry(now - timedelta(days=90), user=user),  # legacy partition
+    ])
+
+    user.delete()
+
+    assert AuditLog.objects.filter(user__isnull=True, resource="Thing").count() == 2
+
+
+@postgresql_only
+def test_queryset_update_reaches_every_partition(partitioned):
+    now = timezone.now()
+    AuditLog.objects.bulk_create([entry(now), entry(now - timedelta(days=90))])
+
+    assert AuditLog.objects.filter(resource="Thing").update(description="x") == 2
+    assert set(AuditLog.objects.values_list("description", flat=True)) == {"x"}
+
+
+@postgresql_only
+def test_cleanup_archives_expired_rows_of_the_legacy_partition(partitioned, tmp_path):
+    # months before setup live in the legacy partition: row deletes, no drop
+    old = timezone.now() - timedelta(days=400)
+    AuditLog.objects.bulk_create([entry(old), entry(old), entry(timezone.now())])
+
+    out = StringIO()
+    call_command("cleanup_audit_logs", "--archive", str(tmp_path), stdout=out)
+
+    assert "Dropped partition" not in out.getvalue()
+    assert AuditLog.objects.count() == 1
+    assert len([r for p in find_segments(tmp_path) for r in iter_segment(p)]) == 2
+
+
+@postgresql_only
+def test_partitions_command_creates_months_ahead(partitioned):
+    out = StringIO()
+    call_command("audit_log_partitions", "create", "--ahead", "1", stdout=out)
+
+    assert partition_name(month_of(datetime.now(dt_timezone.utc))) in out.getvalue()
+
+
+@override_settings(AUDIT_LOG_PARTITIONING=True, AUDIT_LOG_PARTITION_MONTHS_AHEAD=2)
+def test_cleanup_creates_the_coming_months(db, monkeypatch):
+    backend = RecordingBackend()
+    monkeypatch.setattr(cleanup_audit_logs, "get_backend", lambda using: backend)
+
+    out = StringIO()
+    call_command("cleanup_audit_logs", stdout=out)
+
+    current = month_of(datetime.now(dt_timezone.utc))
+    assert backend.created == [current, next_month(current), next_month(next_month(current))]
+    assert partition_name(current) in out.getvalue()
+
+
+@postgresql_only
+def test_rows_past_the_last_month_land_in_the_default_partition(partitioned):
+    later = timezone.now() + timedelta(days=400)
+    AuditLog.objects.bulk_create([entry(later)])
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {DEFAULT_TABLE}")
+        assert cursor.fetchone()[0] == 1
+
+
+@postgresql_only
+def test_cleanup_rolls_partitions_forward_out_of_the_default(partitioned):
+    current = month_of(datetime.now(dt_timezone.utc))
+    third = next_month(next_month(next_month(current)))
+    timestamp = datetime(third.year, third.month, 15, tzinfo=dt_timezone.utc)
+    AuditLog.objects.bulk_create([entry(timestamp)])
+
+    with override_settings(AUDIT_LOG_PARTITION_MONTHS_AHEAD=3):
+        call_command("cleanup_audit_logs", stdout=StringIO())
+
+    assert third in partitioned.list_partitions()
+    assert AuditLog.objects.partition(timestamp).count() == 1
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {DEFAULT_TABLE}")
+        assert cursor.fetchone()[0] == 0
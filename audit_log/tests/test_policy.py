@@ -0,0 +1,96 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from prometheus_client import REGISTRY
+
+from audit_log import policy
+from audit_log.api.public import log
+from audit_log.models import AuditLog
+from audit_log.services import log_action
+from products.models import Category
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fresh_engine():
+    policy.reset()
+    yield
+    policy.reset()
+
+
+def suppressed(**labels):
+    return REGISTRY.get_sample_value("audit_log_suppressed_events_total", labels) or 0
+
+
+@override_settings(AUDIT_LOG_POLICIES=[
+    {"resource": "thing", "action": "create", "policy": "sample", "every": 3},
+])
+def test_sample_keeps_one_in_n_and_counts_the_rest():
+    labels = dict(resource="Thing", action="create", source="api", policy="sample")
+    before = suppressed(**labels)
+
+    results = [log(action="create", resource="Thing") for _ in range(7)]
+
+    assert AuditLog.objects.filter(resource="Thing").count() == 3
+    assert [r is not None for r in results] == [True, False, False, True, False, False, True]
+    assert suppressed(**labels) - before == 4
+
+
+@override_settings(AUDIT_LOG_POLICIES=[
+    {"action": "view", "policy": "rate_limit", "rate": 0.001, "burst": 2},
+])
+def test_rate_limit_is_a_token_bucket_per_resource():
+    for _ in range(5):
+        log(action="view", resource="Report")
+        log(action="view", resource="Invoice")
+
+    counts = {
+        resource: AuditLog.objects.filter(resource=resource).count()
+        for resource in ("Report", "Invoice")
+    }
+    assert counts == {"Report": 2, "Invoice": 2}
+
+
+@override_settings(AUDIT_LOG_POLICIES=[
+    {"resource": "Report", "source": "cron", "policy": "drop"},
+])
+def test_drop_matches_the_source():
+    log(action="export", resource="Report", source="cron")
+    log(action="export", resource="Report", source="admin")
+
+    assert list(AuditLog.objects.values_list("source", flat=True)) == ["admin"]
+
+
+@override_settings(AUDIT_LOG_POLICIES=[{"resource": "Category", "policy": "drop"}])
+def test_model_changes_are_never_suppressed():
+    category = Category.objects.create(name="Noisy", slug="noisy")
+    category.name = "Quiet"
+    category.save()
+    user = get_user_model().objects.create_user(username="u", password="p")
+    log_action(user=user, action="export", instance=category, source="api")
+
+    # history replays create / update; the free-form export is dropped
+    assert sorted(AuditLog.objects.filter(resource="Category").values_list("action", flat=True)) == [
+        "create", "update",
+    ]
+
+
+@override_settings(AUDIT_LOG_POLICIES=[
+    {"resource": "Thing", "action": "update", "policy": "keep"},
+    {"resource": "*", "policy": "drop"},
+])
+def test_first_matching_rule_wins_and_security_actions_are_always_kept():
+    log(action="update", resource="Thing")
+    log(action="create", resource="Thing")
+    log(action="login", resource="User")
+    log(action="delete", resource="Thing")
+
+    assert sorted(AuditLog.objects.values_list("action", flat=True)) == ["delete", "login", "update"]
+
+
+@override_settings(AUDIT_LOG_POLICIES=[{"resource": "Thing", "policy": "throttle"}])
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ImproperlyConfigured, match="throttle"):
+        policy.get_engine()
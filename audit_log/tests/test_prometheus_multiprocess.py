@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.test import override_settings
+
+from audit_log import prometheus
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# one short-lived "worker": records audit metrics, then exits
+WORKER = """
+import django
+django.setup()
+from audit_log import metrics
+metrics.audit_log_created_total.labels(resource="Product", action="create").inc({count})
+metrics.audit_log_flush_latency_seconds.labels(mode="buffered").observe(0.2)
+metrics.audit_log_buffer_queue_depth.inc(5)
+"""
+
+
+def run_worker(directory, count):
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE="config.settings",
+        PROMETHEUS_MULTIPROC_DIR=str(directory),
+    )
+    subprocess.run(
+        [sys.executable, "-c", WORKER.format(count=count)],
+        cwd=ROOT, env=env, check=True,
+    )
+
+
+def scrape(directory):
+    with override_settings(AUDIT_LOG_PROMETHEUS_MULTIPROC_DIR=str(directory)):
+        registry = prometheus.get_registry()
+    return lambda name, **labels: registry.get_sample_value(name, labels) or 0
+
+
+@pytest.fixture
+def multiproc_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv(prometheus.ENV_VAR, raising=False)
+    return tmp_path
+
+
+def test_single_process_mode_uses_default_registry(multiproc_dir):
+    from prometheus_client import REGISTRY
+
+    assert prometheus.get_registry() is REGISTRY
+
+
+def test_scrape_aggregates_all_workers(multiproc_dir):
+    run_worker(multiproc_dir, 3)
+    run_worker(multiproc_dir, 4)
+
+    value = scrape(multiproc_dir)
+
+    assert value("audit_log_created_total", resource="Product", action="create") == 7
+    assert value("audit_log_flush_latency_seconds_count", mode="buffered") == 2
+    # livesum gauge: the workers are gone, their queue depth is too
+    assert value("audit_log_buffer_queue_depth") == 0
+
+
+def test_dead_worker_files_are_folded_into_archive(multiproc_dir):
+    run_worker(multiproc_dir, 3)
+    run_worker(multiproc_dir, 4)
+
+    dead = prometheus.prune_dead_workers(str(multiproc_dir))
+
+    assert len(dead) == 2
+    files = sorted(p.name for p in multiproc_dir.glob("*.db"))
+    assert files == ["counter_archive.db", "histogram_archive.db"]
+
+    # a third worker after compaction: totals keep growing
+    run_worker(multiproc_dir, 5)
+    value = scrape(multiproc_dir)
+
+    assert value("audit_log_created_total", resource="Product", action="create") == 12
+    assert value("audit_log_flush_latency_seconds_count", mode="buffered") == 3
+    assert len(list(multiproc_dir.glob("*.db"))) == 2
+
+
+def test_live_worker_files_are_kept(multiproc_dir):
+    (multiproc_dir / f"counter_{os.getpid()}.db").write_bytes(b"")
+
+    assert prometheus.prune_dead_workers(str(multiproc_dir)) == []
+    assert (multiproc_dir / f"counter_{os.getpid()}.db").exists()
+
+
+def test_metrics_endpoint_serves_aggregated_values(client, multiproc_dir):
+    run_worker(multiproc_dir, 2)
+
+    with override_settings(AUDIT_LOG_PROMETHEUS_MULTIPROC_DIR=str(multiproc_dir)):
+        response = client.get("/metrics/")
+
+    assert response.status_code == 200
+    body = response.content.decode("utf-8")
+    assert 'audit_log_created_total{action="create",resource="Product"} 2.0' in body
+
+
+def test_on_starting_clears_previous_run(multiproc_dir, monkeypatch):
+    run_worker(multiproc_dir, 1)
+    monkeypatch.setenv(prometheus.ENV_VAR, str(multiproc_dir))
+
+    prometheus.on_starting(server=None)
+
+    assert list(multiproc_dir.glob("*.db")) == []
@@ -0,0 +1,140 @@
+import base64
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from audit_log.api.public import log
+from audit_log.middleware import AuditLogContextMiddleware
+from audit_log.models import AuditLog
+from products.models import Category
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="alice", password="pass1234")
+
+
+def run_view(view, session_key=None):
+    request = RequestFactory().post("/")
+    if session_key:
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+    handler = SessionMiddleware(AuthenticationMiddleware(AuditLogContextMiddleware(view)))
+    return handler(request)
+
+
+def user_queries(queries):
+    return [q["sql"] for q in queries if User._meta.db_table in q["sql"]]
+
+
+def session_for(user):
+    client = Client()
+    client.force_login(user)
+    return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+def report_view(request):
+    with CaptureQueriesContext(connection) as ctx:
+        log(action="export", resource="Report")
+        log(action="export", resource="Report")
+    report_view.queries = ctx.captured_queries
+    return HttpResponse()
+
+
+def report_users():
+    return list(AuditLog.objects.filter(resource="Report").order_by("pk").values_list("user_id", flat=True))
+
+
+def test_session_user_is_loaded_once_per_request(user):
+    run_view(report_view, session_for(user))
+
+    assert report_users() == [user.pk, user.pk]
+    assert len(user_queries(report_view.queries)) == 1
+
+
+def test_verified_session_is_not_loaded_again(user):
+    session_key = session_for(user)
+    run_view(report_view, session_key)
+
+    run_view(report_view, session_key)
+
+    assert report_users() == [user.pk] * 4
+    assert user_queries(report_view.queries) == []
+
+
+def test_saving_the_user_drops_the_verified_session(user):
+    session_key = session_for(user)
+    run_view(report_view, session_key)
+
+    user.is_active = False
+    user.save()
+    run_view(report_view, session_key)
+
+    assert report_users() == [user.pk, user.pk, None, None]
+
+
+def test_session_of_a_changed_password_is_not_trusted(user):
+    session_key = session_for(user)
+    user.set_password("changed")
+    user.save()
+
+    run_view(report_view, session_key)
+
+    assert report_users() == [None, None]
+
+
+def test_session_of_an_inactive_or_deleted_user_is_not_trusted(user):
+    session_key = session_for(user)
+    User.objects.filter(pk=user.pk).update(is_active=False)
+    run_view(report_view, session_key)
+
+    User.objects.filter(pk=user.pk).delete()
+    run_view(report_view, session_key)
+
+    assert report_users() == [None] * 4
+
+
+def test_anonymous_request_is_recorded_without_user():
+    def view(request):
+        Category.objects.create(name="Anon", slug="anon")
+        return HttpResponse()
+
+    run_view(view)
+
+    assert list(AuditLog.objects.values_list("user_id", flat=True)) == [None]
+
+
+def test_user_authenticated_by_drf_is_attributed(user):
+    client = APIClient()
+    token = base64.b64encode(b"alice:pass1234").decode()
+    client.credentials(HTTP_AUTHORIZATION=f"Basic {token}")
+    category = Category.objects.create(name="Lamps", slug="lamps")
+
+    response = client.post(
+        "/api/products/",
+        {"name": "Lamp", "sku": "A-1", "price": "10.00", "stock": 1, "category": category.pk},
+        format="json",
+    )
+
+    assert response.status_code == 201
+    product_events = AuditLog.objects.filter(resource="Product")
+    assert [event.user_id for event in product_events] == [user.pk]
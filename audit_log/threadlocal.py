@@ -1,12 +1,8 @@
 # audit_log/threadlocal.py
-import threading
+# kept for old imports: the state lives in audit_log.context (ContextVar)
 
-_local = threading.local()
-
-
-def set_current_user(user):
-    _local.user = user
-
-
-def get_current_user():
-    return getattr(_local, "user", None)
+from audit_log.context import (  # noqa: F401
+    get_current_user,
+    get_current_user_id,
+    set_current_user,
+)
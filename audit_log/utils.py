@@ -1,38 +1,18 @@
-import threading
-from typing import Optional
 from datetime import timedelta
 
-from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 from audit_log.constants import IGNORED_FIELDS, AUDIT_LOG_RETENTION_DAYS
+# re-exported: the current user lives in audit_log.context (ContextVar),
+# the same state the middleware binds
+from audit_log.context import (  # noqa: F401
+    get_current_user,
+    get_current_user_id,
+    set_current_user,
+)
 from audit_log.models import AuditLog
 
 
-User = get_user_model()
-_thread_locals = threading.local()
-
-
-# =========================
-# Current User (Thread Local)
-# =========================
-
-def set_current_user(user: Optional[User]) -> None:
-    """
-    Store current user in thread local storage.
-    Used by middleware.
-    """
-    _thread_locals.user = user
-
-
-def get_current_user() -> Optional[User]:
-    """
-    Safely get current user from thread local storage.
-    Returns None if not set.
-    """
-    return getattr(_thread_locals, "user", None)
-
-
 # =========================
 # Changes Diff (Phase 2.1)
 # =========================
@@ -65,6 +45,12 @@ def compute_changes(before: dict | None, after: dict | None) -> dict:
 # Retention Policy (Phase 2.3)
 # =========================
 
+def get_retention_cutoff(days: int | None = None):
+    """Timestamp before which audit logs are past the retention window."""
+    retention_days = days or AUDIT_LOG_RETENTION_DAYS
+    return timezone.now() - timedelta(days=retention_days)
+
+
 def get_audit_logs_older_than_retention(days: int | None = None):
     """
     Returns queryset of audit logs older than retention window.
@@ -73,7 +59,4 @@ def get_audit_logs_older_than_retention(days: int | None = None):
     - This function DOES NOT delete anything.
     - Safe to use in tests, admin, and management commands.
     """
-    retention_days = days or AUDIT_LOG_RETENTION_DAYS
-    cutoff = timezone.now() - timedelta(days=retention_days)
-
-    return AuditLog.objects.filter(timestamp__lt=cutoff)
+    return AuditLog.objects.filter(timestamp__lt=get_retention_cutoff(days))
@@ -3,10 +3,15 @@
 from django.http import HttpResponse
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from audit_log.prometheus import get_registry
+
 
 def metrics_view(request):
     """
     Expose Prometheus metrics.
+
+    In multiprocess mode the values of every worker are aggregated,
+    so any worker answers with the full totals.
     """
-    data = generate_latest()
+    data = generate_latest(get_registry())
     return HttpResponse(data, content_type=CONTENT_TYPE_LATEST)
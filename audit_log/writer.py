@@ -0,0 +1,108 @@
+# audit_log/writer.py
+
+import time
+from typing import List, Optional
+
+from audit_log.conf import get_setting
+from audit_log.context import get_correlation_id
+from audit_log.constants import WRITE_MODE_BUFFERED
+from audit_log.metrics import (
+    audit_log_create_latency_seconds,
+    audit_log_flush_latency_seconds,
+    audit_log_write_calls_total,
+)
+from audit_log.models import AuditLog
+from audit_log.policy import should_write
+
+
+def write(entry: AuditLog, path: Optional[str] = None) -> Optional[AuditLog]:
+    """
+    Persist a single (unsaved) AuditLog entry.
+
+    path names the caller ("signal", "public", "service", ...) for the
+    audit_log_write_calls_total metric; the time spent here is what the
+    caller pays and goes to audit_log_create_latency_seconds.
+
+    - AUDIT_LOG_DEFER_UNTIL_COMMIT: inside atomic(), wait for commit and
+      write everything collected in one bulk_create
+    - AUDIT_LOG_WRITE_MODE="buffered": queue for a background bulk_create
+
+    In both deferred cases the returned instance has no pk yet.
+
+    Events suppressed by AUDIT_LOG_POLICIES (audit_log.policy) are not
+    written at all; None is returned for them.
+
+    The request's correlation id is stamped here, while the caller's
+    context is still current (flushes run on other threads).
+    """
+    audit_log_write_calls_total.labels(path=path or "other").inc()
+
+    if not should_write(entry):
+        return None
+
+    if entry.correlation_id is None:
+        entry.correlation_id = get_correlation_id()
+
+    with audit_log_create_latency_seconds.time():
+        if get_setting("DEFER_UNTIL_COMMIT"):
+            from audit_log.collector import collect
+
+            if collect(entry, persist=_write_on_commit):
+                return entry
+
+        write_many([entry])
+    return entry
+
+
+def write_batch(entries: List[AuditLog], path: Optional[str] = None) -> List[AuditLog]:
+    """
+    Persist several (unsaved) entries with one bulk write.
+
+    Same policy, correlation id and deferral rules as write(); returns
+    the entries that were kept.
+    """
+    audit_log_write_calls_total.labels(path=path or "other").inc(len(entries))
+
+    kept = [entry for entry in entries if should_write(entry)]
+    if not kept:
+        return kept
+
+    correlation_id = get_correlation_id()
+    for entry in kept:
+        if entry.correlation_id is None:
+            entry.correlation_id = correlation_id
+
+    with audit_log_create_latency_seconds.time():
+        pending = kept
+        if get_setting("DEFER_UNTIL_COMMIT"):
+            from audit_log.collector import collect
+
+            pending = [entry for entry in kept if not collect(entry, persist=_write_on_commit)]
+
+        if pending:
+            write_many(pending)
+    return kept
+
+
+def _write_on_commit(entries: List[AuditLog]) -> None:
+    started = time.perf_counter()
+    write_many(entries)
+    audit_log_flush_latency_seconds.labels(mode="on_commit").observe(
+        time.perf_counter() - started
+    )
+
+
+def write_many(entries: List[AuditLog]) -> None:
+    """Persist already-committed entries according to AUDIT_LOG_WRITE_MODE."""
+    if get_setting("WRITE_MODE") == WRITE_MODE_BUFFERED:
+        from audit_log.buffer import get_buffer
+
+        buffer = get_buffer()
+        for entry in entries:
+            buffer.put(entry)
+        return
+
+    if len(entries) == 1:
+        entries[0].save()
+    else:
+        AuditLog.objects.bulk_create(entries)
@@ -1,19 +1,83 @@
 from django.db import models
 from django.utils import timezone
 
+from audit_log.registry import registry as audit_registry
+
 
 class SoftDeleteQuerySet(models.QuerySet):
+    # set by audited(): statements on this queryset log one bulk event
+    _audit_options = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._audit_options = self._audit_options
+        return clone
+
+    def audited(self, *, user=None, source="bulk", action=None):
+        """
+        Return a queryset whose update() / delete() / hard_delete()
+        record one compact bulk audit event per statement.
+        """
+        clone = self._chain()
+        clone._audit_options = {"user": user, "source": source, "action": action}
+        return clone
+
+    def _run_audited(self, default_action, statement, values=None, soft=None):
+        from audit_log.bulk import run_audited
+
+        options = self._audit_options
+        return run_audited(
+            self,
+            action=options["action"] or default_action,
+            statement=statement,
+            values=values,
+            soft=soft,
+            user=options["user"],
+            source=options["source"],
+        )
+
+    def update(self, **kwargs):
+        if self._audit_options is None:
+            return super().update(**kwargs)
+
+        # an UPDATE logged as bulk_delete is a soft delete
+        soft = True if self._audit_options["action"] == "bulk_delete" else None
+
+        return self._run_audited(
+            "bulk_update",
+            lambda: super(SoftDeleteQuerySet, self).update(**kwargs),
+            values=kwargs,
+            soft=soft,
+        )
+
     def delete(self):
         """
         Soft delete: set deleted_at instead of real DELETE
         """
-        return super().update(deleted_at=timezone.now())
+        values = {"deleted_at": timezone.now()}
+
+        if self._audit_options is None:
+            return super().update(**values)
+
+        return self._run_audited(
+            "bulk_delete",
+            lambda: super(SoftDeleteQuerySet, self).update(**values),
+            values=values,
+            soft=True,
+        )
 
     def hard_delete(self):
         """
         Real delete from database (dangerous)
         """
-        return super().delete()
+        if self._audit_options is None:
+            return super().delete()
+
+        return self._run_audited(
+            "bulk_delete",
+            lambda: super(SoftDeleteQuerySet, self).delete(),
+            soft=False,
+        )
 
     def alive(self):
         return self.filter(deleted_at__isnull=True)
@@ -30,6 +94,9 @@ class SoftDeleteManager(models.Manager):
 
     def hard_delete(self):
         return self.get_queryset().hard_delete()
+
+    def audited(self, **kwargs):
+        return self.get_queryset().audited(**kwargs)
        
 
 class AuditModel(models.Model):
@@ -68,7 +135,40 @@ class AuditModel(models.Model):
     
     class Meta:
         abstract = True
-    
+
+    # ✅ Field-level diff support: snapshot tracked values when loaded,
+    # so post_save can diff without a pre_save SELECT
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        meta = audit_registry.get(cls)
+        if meta is not None:
+            instance._audit_snapshot = meta.snapshot_from_db(field_names, values)
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # post_save (and its diff) has run: the saved values become the baseline
+        meta = audit_registry.get(type(self))
+        if meta is not None:
+            self._audit_snapshot = meta.snapshot(
+                self,
+                previous=getattr(self, "_audit_snapshot", None),
+                fields=kwargs.get("update_fields"),
+            )
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+        meta = audit_registry.get(type(self))
+        if meta is not None:
+            self._audit_snapshot = meta.snapshot(
+                self,
+                previous=getattr(self, "_audit_snapshot", None),
+                fields=fields,
+            )
+
 # ✅ FIX: instance-level soft delete
     def delete(self, using=None, keep_parents=False):
         if self.deleted_at is None:
@@ -0,0 +1,16 @@
+# config/gunicorn.conf.py
+#
+#   PROMETHEUS_MULTIPROC_DIR=/run/audit-metrics \
+#       gunicorn -c config/gunicorn.conf.py config.wsgi
+#
+# The metrics directory must be set before the workers import
+# prometheus_client (env var, or AUDIT_LOG_PROMETHEUS_MULTIPROC_DIR).
+
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+from audit_log.prometheus import child_exit, on_starting  # noqa: E402,F401
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "4"))
@@ -165,3 +165,39 @@ SIMPLE_JWT = {
 }
 
 AUTH_USER_MODEL = 'accounts.User'
+
+# Audit log
+# "sync" → one INSERT per event, "buffered" → queued + bulk_create
+AUDIT_LOG_WRITE_MODE = "sync"
+AUDIT_LOG_BUFFER_BATCH_SIZE = 500
+AUDIT_LOG_BUFFER_FLUSH_INTERVAL = 2.0
+# write audit rows made inside atomic() with one bulk_create on commit
+AUDIT_LOG_DEFER_UNTIL_COMMIT = False
+# one row per object/action per request for repeated saves
+AUDIT_LOG_COALESCE_EVENTS = True
+AUDIT_LOG_COALESCE_MAX_EVENTS = 1000
+# write-side sample / rate_limit / drop rules (audit_log/policy.py);
+# none by default, model create / update / delete are always kept
+AUDIT_LOG_POLICIES = []
+# request.user is not loaded while the session hash stays verified
+AUDIT_LOG_SESSION_USER_CACHE_TIMEOUT = 300
+# monthly partitions (PostgreSQL): cleanup_audit_logs keeps N months ahead
+AUDIT_LOG_PARTITIONING = False
+AUDIT_LOG_PARTITION_MONTHS_AHEAD = 2
+# per hour/resource/action/status counters (backfill: backfill_audit_log_stats)
+AUDIT_LOG_HOURLY_STATS = True
+# Prometheus multiprocess mode for several gunicorn workers
+# (or set PROMETHEUS_MULTIPROC_DIR; see config/gunicorn.conf.py)
+AUDIT_LOG_PROMETHEUS_MULTIPROC_DIR = None
+# admin changelist: exact counts below the threshold, estimates above
+AUDIT_LOG_ADMIN_EXACT_COUNT_THRESHOLD = 10_000
+AUDIT_LOG_ADMIN_COUNT_CACHE_TIMEOUT = 300
+# /api/audit-logs/trace/<correlation_id>/ (completed traces are cached)
+AUDIT_LOG_TRACE_SETTLE_SECONDS = 60
+AUDIT_LOG_TRACE_CACHE_TIMEOUT = 300
+AUDIT_LOG_TRACE_MAX_EVENTS = 1000
+# state_at(): full-state checkpoint every N events of an object
+AUDIT_LOG_CHECKPOINT_INTERVAL = 100
+# tamper evidence: seal_audit_log_blocks / verify_audit_integrity
+AUDIT_LOG_INTEGRITY_BLOCK_SIZE = 1000
+AUDIT_LOG_INTEGRITY_SETTLE_SECONDS = 60
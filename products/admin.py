@@ -1,10 +1,8 @@
 from django.contrib import admin
 from django.core.exceptions import PermissionDenied
 from django.utils import timezone
-from django.contrib.contenttypes.models import ContentType
 
 from .models import Category, Product
-from audit_log.models import AuditLog
 
 
 @admin.register(Category)
@@ -36,56 +34,24 @@ class ProductAdmin(admin.ModelAdmin):
         if not request.user.is_superuser:
             raise PermissionDenied
 
-    def _bulk_log(self, *, request, action, changes):
-        AuditLog.objects.create(
-            user=request.user,
-            action=action,
-            resource="Product",
-            content_type=ContentType.objects.get_for_model(Product),
-            object_id=None,
-            source="admin",
-            changes=changes,
-        )
-
     def bulk_deactivate_products(self, request, queryset):
         self._require_superuser(request)
 
-        queryset = queryset.all()
-        ids = list(queryset.values_list("id", flat=True))
-
-        before = list(queryset.values("id", "is_active"))
-
-        queryset.update(is_active=False, updated_by=request.user)
-
-        if ids:
-            self._bulk_log(
-                request=request,
-                action="bulk_update",
-                changes={
-                    "ids": ids,
-                    "before": before,
-                    "after": {"is_active": False},
-                },
-            )
+        # one bulk_update event with a columnar before-snapshot
+        queryset.all().audited(
+            user=request.user,
+            source="admin",
+        ).update(is_active=False, updated_by=request.user)
 
     def bulk_soft_delete_products(self, request, queryset):
         self._require_superuser(request)
 
-        queryset = queryset.all()
-        ids = list(queryset.values_list("id", flat=True))
-
-        queryset.update(deleted_at=timezone.now(), updated_by=request.user)
-
-        if ids:
-            self._bulk_log(
-                request=request,
-                action="bulk_delete",
-                changes={
-                    "ids": ids,
-                    "count": len(ids),
-                    "soft": True,
-                },
-            )
+        # one compact bulk_delete event (range/bitmap encoded ids)
+        queryset.all().audited(
+            user=request.user,
+            source="admin",
+            action="bulk_delete",
+        ).update(deleted_at=timezone.now(), updated_by=request.user)
 
     def delete_queryset(self, request, queryset):
         self.bulk_soft_delete_products(request, queryset)
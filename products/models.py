@@ -6,8 +6,11 @@ from django.apps import apps
 from django.db import connection
 
 from common.models import AuditModel
+from audit_log.metrics import audit_log_dropped_events_total
 from audit_log.models import AuditLog
-from audit_log.utils import get_current_user
+from audit_log.registry import content_type_id_for
+from audit_log.writer import write
+from audit_log.utils import get_current_user_id
 
 
 User = settings.AUTH_USER_MODEL
@@ -102,17 +105,17 @@ class Product(AuditModel):
             return
 
         try:
-            AuditLog.objects.create(
-                user=get_current_user(),
+            write(AuditLog(
+                user_id=get_current_user_id(),
                 action="delete",
                 resource="Product",
-                content_type=None,
+                content_type_id=content_type_id_for(type(self)),
                 object_id=str(self.pk),
                 source="model",
                 changes={"soft": True},
-            )
+            ), path="model")
         except Exception:
-            pass
+            audit_log_dropped_events_total.labels(reason="error").inc()
 
         self.deleted_at = timezone.now()
         self.save(update_fields=["deleted_at"])
@@ -0,0 +1,23 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from audit_log.context import clear_context, set_current_user
+from products.models import Category, Product
+
+
+@pytest.fixture
+def owner(db):
+    return get_user_model().objects.create_user(username="owner", password="pass1234")
+
+
+@pytest.fixture
+def product(owner):
+    """A product created by its owner (who is also on the create event)."""
+    category = Category.objects.create(name="Lamps", slug="lamps")
+    set_current_user(owner)
+    try:
+        return Product.objects.create(
+            category=category, name="Lamp", sku="L-1", price=10, stock=3, owner=owner
+        )
+    finally:
+        clear_context()
@@ -122,3 +122,23 @@ class AdminAuditLogTests(TestCase):
                 request=request,
                 queryset=queryset,
             )
+
+    # 5️⃣ Diff values are escaped on the audit log change page
+    def test_changes_with_markup_are_escaped(self):
+        product = self.products[0]
+        product.name = "</pre><script>alert(1)</script>"
+        product.save()
+
+        log = AuditLog.objects.filter(
+            action="update",
+            object_id=str(product.id),
+        ).last()
+
+        self.client.force_login(self.superuser)
+        response = self.client.get(
+            reverse("admin:audit_log_auditlog_change", args=[log.pk])
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "<script>alert(1)</script>", html=False)
+        self.assertContains(response, "&lt;script&gt;alert(1)&lt;/script&gt;")
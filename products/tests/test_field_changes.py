@@ -0,0 +1,98 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from audit_log.models import AuditLog
+from products.models import Product, Category
+
+
+User = get_user_model()
+
+
+class FieldChangesTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="pass1234")
+        self.category = Category.objects.create(name="Books", slug="books")
+
+        product = Product.objects.create(
+            category=self.category,
+            name="Old name",
+            sku="DIFF-SKU-1",
+            price=Decimal("10.00"),
+            stock=5,
+            owner=self.owner,
+        )
+        # reload so the instance carries a from_db() snapshot
+        self.product = Product.objects.get(pk=product.pk)
+
+    def last_update_log(self):
+        return AuditLog.objects.filter(
+            resource="Product",
+            action="update",
+        ).order_by("id").last()
+
+    # 1️⃣ Only changed fields, JSON-safe values
+    def test_update_stores_changed_fields_only(self):
+        self.product.name = "New name"
+        self.product.price = Decimal("12.50")
+        self.product.save()
+
+        self.assertEqual(
+            self.last_update_log().changes,
+            {
+                "name": {"before": "Old name", "after": "New name"},
+                "price": {"before": "10.00", "after": "12.50"},
+            },
+        )
+
+    # 2️⃣ No extra SELECT on the save path
+    def test_diff_needs_no_extra_query(self):
+        self.product.stock = 7
+
+        with self.assertNumQueries(3):  # UPDATE product + INSERT audit log + stats upsert
+            self.product.save()
+
+        self.assertEqual(
+            self.last_update_log().changes,
+            {"stock": {"before": 5, "after": 7}},
+        )
+
+    # 3️⃣ IGNORED_FIELDS never show up, unchanged saves store nothing
+    def test_ignored_fields_are_not_reported(self):
+        self.product.save()
+
+        self.assertIsNone(self.last_update_log().changes)
+
+    # 4️⃣ Baseline moves forward after each save
+    def test_consecutive_saves_diff_against_last_save(self):
+        self.product.stock = 6
+        self.product.save()
+        self.product.stock = 8
+        self.product.save(update_fields=["stock"])
+
+        self.assertEqual(
+            self.last_update_log().changes,
+            {"stock": {"before": 6, "after": 8}},
+        )
+
+    # 5️⃣ Soft delete goes through update_fields
+    def test_soft_delete_records_deleted_at(self):
+        self.product.delete()
+
+        changes = self.last_update_log().changes
+        self.assertEqual(list(changes), ["deleted_at"])
+        self.assertIsNone(changes["deleted_at"]["before"])
+
+    # 6️⃣ Deferred fields are not loaded one by one after the save
+    def test_deferred_instance_saves_without_extra_queries(self):
+        product = Product.objects.only("id", "stock").get(pk=self.product.pk)
+        product.stock = 9
+
+        with self.assertNumQueries(3):  # UPDATE product + INSERT audit log + stats upsert
+            product.save()
+
+        self.assertEqual(
+            self.last_update_log().changes,
+            {"stock": {"before": 5, "after": 9}},
+        )
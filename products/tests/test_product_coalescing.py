@@ -0,0 +1,146 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from audit_log.coalesce import merge_changes
+from audit_log.middleware import AuditLogContextMiddleware
+from audit_log.models import AuditLog
+from products.models import Product
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+def updates(product):
+    return list(
+        AuditLog.objects.filter(
+            resource="Product", object_id=str(product.pk), action="update", source="signal"
+        ).order_by("id")
+    )
+
+
+def in_request(view):
+    return AuditLogContextMiddleware(view)(RequestFactory().post("/"))
+
+
+def test_merge_keeps_first_before_and_last_after():
+    first = {"price": {"before": "10", "after": "11"}}
+    later = {"price": {"before": "11", "after": "12"}, "stock": {"before": 3, "after": 2}}
+
+    assert merge_changes(first, later) == {
+        "price": {"before": "10", "after": "12"},
+        "stock": {"before": 3, "after": 2},
+    }
+    assert merge_changes(None, None) is None
+
+
+def test_restore_writes_one_update_row(product):
+    product.delete()
+    admin = User.objects.create_user(
+        username="admin", password="pass1234", is_staff=True, role=User.Role.ADMIN
+    )
+    before = len(updates(product))
+
+    client = APIClient()
+    client.force_authenticate(admin)
+    response = client.post(f"/api/products/{product.pk}/restore/?deleted=true")
+
+    assert response.status_code == 200
+    rows = updates(product)[before:]
+    assert len(rows) == 1
+    assert rows[0].changes["deleted_at"]["after"] is None
+    assert rows[0].changes["deleted_at"]["before"] is not None
+
+
+def test_repeated_saves_in_a_request_become_one_row(product):
+    def view(request):
+        for price, stock in ((11, 3), (12, 2), (13, 2)):
+            product.price, product.stock = Decimal(price), stock
+            product.save()
+        return HttpResponse()
+
+    in_request(view)
+
+    [row] = updates(product)
+    assert row.changes == {
+        "price": {"before": "10.00", "after": "13.00"},
+        "stock": {"before": 3, "after": 2},
+    }
+
+
+def test_rolled_back_saves_leave_no_row(product):
+    def view(request):
+        product.price = Decimal(11)
+        product.save()
+        try:
+            with transaction.atomic():
+                product.price = Decimal(99)
+                product.save()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        return HttpResponse()
+
+    in_request(view)
+
+    [row] = updates(product)
+    assert row.changes["price"] == {"before": "10.00", "after": "11.00"}
+
+
+@override_settings(AUDIT_LOG_COALESCE_EVENTS=False)
+def test_coalescing_can_be_switched_off(product):
+    def view(request):
+        for price in (11, 12):
+            product.price = Decimal(price)
+            product.save()
+        return HttpResponse()
+
+    in_request(view)
+
+    assert len(updates(product)) == 2
+
+
+def test_rows_of_a_request_are_written_with_one_insert(product):
+    other = Product.objects.create(
+        category=product.category, name="Desk", sku="C-2", price=20, stock=1, owner=product.owner
+    )
+
+    def view(request):
+        for item in (product, other):
+            item.stock += 1
+            item.save()
+        return HttpResponse()
+
+    with CaptureQueriesContext(connection) as ctx:
+        in_request(view)
+
+    inserts = [
+        q["sql"] for q in ctx.captured_queries
+        if q["sql"].startswith('INSERT INTO "audit_log_auditlog"')
+    ]
+    assert len(inserts) == 1
+    assert len(updates(product)) == len(updates(other)) == 1
+
+
+@override_settings(AUDIT_LOG_COALESCE_MAX_EVENTS=2)
+def test_a_full_coalescer_writes_early(product):
+    def view(request):
+        for stock in (4, 5, 6, 7, 8):
+            product.stock = stock
+            product.save()
+        return HttpResponse()
+
+    in_request(view)
+
+    assert [row.changes["stock"] for row in updates(product)] == [
+        {"before": 3, "after": 5},
+        {"before": 5, "after": 7},
+        {"before": 7, "after": 8},
+    ]
@@ -0,0 +1,111 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from audit_log.context import set_current_user, clear_context
+from audit_log.models import AuditLog
+from products.models import Product
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def product(product, owner):
+    """The shared product, repriced three times by its owner."""
+    set_current_user(owner)
+    try:
+        for price in (11, 12, 13):
+            product.price = price
+            product.save()
+    finally:
+        clear_context()
+    return product
+
+
+def history(client, product, **params):
+    return client.get(f"/api/products/{product.pk}/history/", params)
+
+
+def test_owner_reads_history_newest_first_with_cursor(owner, product):
+    client = APIClient()
+    client.force_authenticate(owner)
+
+    first = history(client, product, page_size=3).json()
+    second = APIClient()
+    second.force_authenticate(owner)
+    rest = second.get(first["next"]).json()
+
+    actions = [row["action"] for row in first["results"] + rest["results"]]
+    assert actions == ["update", "update", "update", "create"]
+    assert first["results"][0]["changes"]["price"]["after"] == "13.00"
+    assert first["count"] is None
+    assert rest["next"] is None
+
+
+def test_other_users_cannot_read_it(product):
+    stranger = User.objects.create_user(username="stranger", password="pass1234")
+    client = APIClient()
+    client.force_authenticate(stranger)
+
+    assert history(client, product).status_code == 404
+
+
+def test_history_includes_soft_delete(owner, product):
+    admin = User.objects.create_superuser(
+        username="root", password="pass1234", role=User.Role.ADMIN
+    )
+    product.delete()
+    client = APIClient()
+    client.force_authenticate(admin)
+
+    rows = history(client, product, deleted="true").json()["results"]
+
+    deleted = [row for row in rows if row["action"] == "delete"]
+    assert len(deleted) == 1
+    assert deleted[0]["content_type"]["model"] == "product"
+    assert deleted[0]["changes"] == {"soft": True}
+
+
+def test_history_is_one_index_range_scan(owner, product):
+    client = APIClient()
+    client.force_authenticate(owner)
+    ContentType.objects.get_for_model(Product)  # warm the cache
+
+    with CaptureQueriesContext(connection) as ctx:
+        history(client, product)
+
+    audit_queries = [q["sql"] for q in ctx.captured_queries if '"audit_log_auditlog"' in q["sql"]]
+    assert len(audit_queries) == 1
+    assert "django_content_type" not in audit_queries[0].split("WHERE")[1]
+
+    plan = (
+        AuditLog.objects.filter(
+            content_type_id=ContentType.objects.get_for_model(Product).id,
+            object_id=str(product.pk),
+        )
+        .order_by("-timestamp", "-id")
+        .explain()
+    )
+    assert "auditlog_object_ts_idx" in plan
+
+
+def test_content_type_filter_resolves_ids_without_join(owner, product):
+    admin = User.objects.create_superuser(username="root", password="pass1234")
+    client = APIClient()
+    client.force_authenticate(admin)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/audit-logs/", {"content_type": "Product"})
+
+    assert response.status_code == 200
+    assert {row["resource"] for row in response.json()["results"]} == {"Product"}
+    audit_sql = [q["sql"] for q in ctx.captured_queries if '"audit_log_auditlog"' in q["sql"]]
+    assert all('"django_content_type"."model"' not in sql.split("WHERE")[1] for sql in audit_sql)
+
+    assert client.get("/api/audit-logs/", {"content_type": "nothing"}).json()["results"] == []
+
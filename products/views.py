@@ -1,3 +1,4 @@
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import viewsets, permissions, status
@@ -12,6 +13,8 @@ from .serializers import ProductSerializer, CategorySerializer
 
 from accounts.permissions.object_permissions import IsOwnerOrAdmin
 from common.views import OwnedModelViewSet
+from audit_log.api.history import AuditHistoryMixin
+from audit_log.history import removal_changes
 from audit_log.services import log_action
 
 
@@ -32,13 +35,14 @@ class CategoryViewSet(viewsets.ModelViewSet):
 # ==========================
 # Product
 # ==========================
-class ProductViewSet(OwnedModelViewSet):
+class ProductViewSet(AuditHistoryMixin, OwnedModelViewSet):
     """
     Product API
     - CRUD: Owner or Admin
     - Soft Delete: Owner or Admin
     - Restore: Admin / Superuser only
     - Hard Delete: Admin / Superuser only
+    - History: audit events of one product (Owner or Admin)
     - Default: hides deleted items
     """
 
@@ -88,7 +92,10 @@ class ProductViewSet(OwnedModelViewSet):
     # ==========================
     # Soft Delete
     # ==========================
+    # atomic: product + audit rows commit (or roll back) together,
+    # audit rows are written in one batch on commit
     @action(detail=True, methods=["post"])
+    @transaction.atomic
     def soft_delete(self, request, pk=None):
         product = self.get_object()
         product.delete()
@@ -113,6 +120,7 @@ class ProductViewSet(OwnedModelViewSet):
         methods=["post"],
         permission_classes=[IsAdminUser],
     )
+    @transaction.atomic
     def restore(self, request, pk=None):
         product = self.get_object()
 
@@ -143,6 +151,7 @@ class ProductViewSet(OwnedModelViewSet):
         permission_classes=[IsAdminUser],
         url_path="hard-delete",
     )
+    @transaction.atomic
     def hard_delete(self, request, pk=None):
         product = self.get_object()
 
@@ -151,15 +160,18 @@ class ProductViewSet(OwnedModelViewSet):
                 "Cannot hard delete an active product. Soft delete it first."
             )
 
-        product.hard_delete()
-
+        # logged first: the instance still has its pk and field values,
+        # and the snapshot is what history replays once the row is gone
         log_action(
             user=request.user,
             action="hard_delete",
             instance=product,
             source="api",
+            changes=removal_changes(product),
         )
 
+        product.hard_delete()
+
         return Response(
             {"detail": f"Product (ID: {pk}) permanently deleted."},
             status=status.HTTP_204_NO_CONTENT,